@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the toolkit's scanning hot paths.
+
+Each benchmark builds a synthetic corpus in a temporary directory, times the
+current implementation against the implementation it replaced, and prints
+per-operation timings and the speedup.
+
+Usage:
+    python benchmark.py frontmatter                # Frontmatter parsing
+    python benchmark.py frontmatter --files 500 --body-kb 64
+    python benchmark.py deprecations               # Deprecation scan, 10k files
+    python benchmark.py deprecations --files 2000 --hit-rate 0.2
+    python benchmark.py reads                      # Syscalls/bytes for extension_report
+    python benchmark.py reads --skills 1000 --refs 3
+    python benchmark.py tokenizer                  # BPE cache and batching vs cheap estimators
+    python benchmark.py links                      # Syscalls for lint_references, 5k links
+    python benchmark.py links --files 1000 --links-per-file 20
+    python benchmark.py urls                       # URL checker against local servers
+
+Exit codes:
+    0 - Success
+    2 - Usage error
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag
+
+import extension_report
+import lint_references
+import url_checker
+from frontmatter_parser import find_frontmatter, parse_frontmatter, read_frontmatter
+from inventory import build_inventory
+from pattern_detector import SHELL_VARIABLE, DeprecationScanner, check_file, load_deprecations
+from tokenizer import TOOLKIT_ROOT, BPETokenizer, calibrated_estimate, chars_estimate, load_merges
+
+SAMPLE_FRONTMATTER = """---
+name: sample-skill-{i}
+description: |
+  Use when the user asks about sample topic {i}. Covers setup,
+  configuration and troubleshooting.
+allowed-tools: [Read, Grep, "Bash(git:*)"]
+hooks:
+  PreToolUse:
+    - matcher: "Bash"
+      hooks:
+        - type: command
+          command: "./check.sh"
+---
+"""
+
+FLAT_FRONTMATTER = """---
+name: flat-skill-{i}
+description: "Use when the user asks about flat topic {i}."
+allowed-tools: [Read, Grep]
+user-invocable: true
+---
+"""
+
+BODY_PARAGRAPH = (
+    "## Section\n\nThis paragraph stands in for skill instructions. It mentions "
+    "references/guide.md and a few `inline` code spans.\n\n"
+)
+
+
+# Implementations replaced by frontmatter_parser, kept verbatim for comparison
+
+def legacy_validate_parse(content: str) -> Tuple[Optional[dict], str]:
+    """validate_extension.parse_frontmatter before the shared parser."""
+    if not content.startswith("---"):
+        return None, content
+
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return None, content
+
+    frontmatter_text = parts[1].strip()
+    body = parts[2]
+
+    frontmatter = {}
+    current_key = None
+    current_list = None
+
+    for line in frontmatter_text.split("\n"):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and current_key:
+            if current_list is None:
+                current_list = []
+                frontmatter[current_key] = current_list
+            current_list.append(stripped[2:].strip())
+            continue
+        if ":" in stripped:
+            key, _, value = stripped.partition(":")
+            key = key.strip()
+            value = value.strip()
+            current_key = key
+            current_list = None
+            if value:
+                if value.startswith('"') and value.endswith('"'):
+                    value = value[1:-1]
+                elif value.startswith("'") and value.endswith("'"):
+                    value = value[1:-1]
+                elif value.lower() == "true":
+                    value = True
+                elif value.lower() == "false":
+                    value = False
+                frontmatter[key] = value
+
+    return frontmatter, body
+
+
+def legacy_token_split(content: str) -> Tuple[str, str]:
+    """token_counter.parse_frontmatter before the shared parser."""
+    if not content.startswith("---"):
+        return "", content
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return "", content
+    return parts[1], parts[2]
+
+
+def legacy_frontmatter_name(path: Path) -> Optional[str]:
+    """extension_report.parse_frontmatter_name before the shared parser."""
+    try:
+        content = path.read_text()
+        if content.startswith("---"):
+            parts = content.split("---", 2)
+            if len(parts) >= 2:
+                for line in parts[1].split("\n"):
+                    if line.startswith("name:"):
+                        return line.split(":", 1)[1].strip().strip("\"'")
+    except Exception:
+        pass
+    return None
+
+
+def shared_frontmatter_name(path: Path) -> Optional[str]:
+    frontmatter = read_frontmatter(path)
+    return frontmatter.scalar("name") if frontmatter else None
+
+
+def shared_full_parse(content: str) -> Optional[dict]:
+    frontmatter = parse_frontmatter(content)
+    return frontmatter.fields if frontmatter else None
+
+
+def time_per_call(func: Callable, args_list: List, repeat: int) -> float:
+    """Best-of-repeat wall time per call, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            func(args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(args_list) * 1e6
+
+
+def print_comparison(label: str, legacy_us: float, current_us: float):
+    speedup = legacy_us / current_us if current_us else float("inf")
+    print(f"  {label:<34} {legacy_us:>10.1f} {current_us:>10.1f} {speedup:>8.1f}x")
+
+
+def bench_frontmatter(files: int, body_kb: int, repeat: int):
+    """Compare the legacy split-based parsers with frontmatter_parser."""
+    body = BODY_PARAGRAPH * max(1, body_kb * 1024 // len(BODY_PARAGRAPH))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(files):
+            path = Path(tmp) / f"skill-{i}" / "SKILL.md"
+            path.parent.mkdir()
+            path.write_text(SAMPLE_FRONTMATTER.format(i=i) + body)
+            paths.append(path)
+        contents = [p.read_text() for p in paths]
+        flat_contents = [FLAT_FRONTMATTER.format(i=i) + body for i in range(files)]
+
+        print(f"Frontmatter: {files} files, ~{body_kb} KB body each, best of {repeat}")
+        print(f"  {'operation':<34} {'legacy us':>10} {'shared us':>10} {'speedup':>9}")
+        print_comparison(
+            "name lookup from disk",
+            time_per_call(legacy_frontmatter_name, paths, repeat),
+            time_per_call(shared_frontmatter_name, paths, repeat),
+        )
+        print_comparison(
+            "full parse (validate_extension)",
+            time_per_call(legacy_validate_parse, contents, repeat),
+            time_per_call(shared_full_parse, contents, repeat),
+        )
+        print_comparison(
+            "full parse, flat header",
+            time_per_call(legacy_validate_parse, flat_contents, repeat),
+            time_per_call(shared_full_parse, flat_contents, repeat),
+        )
+        print_comparison(
+            "header/body split (token_counter)",
+            time_per_call(legacy_token_split, contents, repeat),
+            time_per_call(find_frontmatter, contents, repeat),
+        )
+
+
+DEPRECATED_LINES = [
+    "Read the command from $TOOL_INPUT in the hook script.",
+    "Check hook_type before deciding.",
+    'Return {"decision": "block", "reason": "..."} to stop the tool.',
+    "See https://docs.anthropic.com/en/docs/claude-code for details.",
+    "Use the Task tool to delegate research.",
+]
+
+
+def legacy_check_file(path: Path, deprecations: List[dict]) -> List[Tuple[str, int]]:
+    """pattern_detector.check_file before the combined scanner, reduced to (pattern, line)."""
+    matches = []
+    lines = path.read_text().split("\n")
+    for deprecation in deprecations:
+        pattern = deprecation["pattern"]
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            regex = re.compile(re.escape(pattern), re.IGNORECASE)
+        for line_num, line in enumerate(lines, 1):
+            if regex.search(line):
+                matches.append((pattern, line_num))
+    return matches
+
+
+def bench_deprecations(files: int, body_kb: int, hit_rate: float):
+    """Compare per-file, per-pattern regex loops with the combined scanner."""
+    deprecations = load_deprecations()
+    body = BODY_PARAGRAPH * max(1, body_kb * 1024 // len(BODY_PARAGRAPH))
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(files):
+            path = Path(tmp) / f"ext-{i}.md"
+            extra = ""
+            if rng.random() < hit_rate:
+                extra = "\n".join(rng.sample(DEPRECATED_LINES, 2)) + "\n"
+            path.write_text(FLAT_FRONTMATTER.format(i=i) + body + extra)
+            paths.append(path)
+        # Warm the page cache so both runs measure scanning, not disk
+        for path in paths:
+            path.read_bytes()
+
+        start = time.perf_counter()
+        legacy = [legacy_check_file(p, deprecations) for p in paths]
+        legacy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanner = DeprecationScanner(deprecations)
+        current = [check_file(p, scanner) for p in paths]
+        current_s = time.perf_counter() - start
+
+    # The legacy loop compiled `$NAME` patterns as end anchors, so they never matched
+    shell_patterns = {d["pattern"] for d in deprecations if SHELL_VARIABLE.search(d["pattern"])}
+    comparable = [
+        [(m.pattern, m.line_number) for m in r.matches if m.pattern not in shell_patterns]
+        for r in current
+    ]
+    legacy_hits = sum(len(m) for m in legacy)
+    current_hits = sum(len(r.matches) for r in current)
+
+    print(f"Deprecations: {files} files, ~{body_kb} KB each, {len(deprecations)} patterns, "
+          f"{hit_rate:.0%} with hits")
+    print(f"  {'operation':<34} {'legacy ms':>10} {'shared ms':>10} {'speedup':>9}")
+    print_comparison("scan all files", legacy_s * 1000, current_s * 1000)
+    print(f"  matches: legacy {legacy_hits}, combined {current_hits} "
+          f"({current_hits - sum(len(c) for c in comparable)} from $NAME patterns)")
+    print(f"  other matches identical: {'yes' if comparable == legacy else 'NO'}")
+
+
+def legacy_report_tokens(base_dir: Path) -> Dict[str, Tuple[Optional[str], int, str]]:
+    """extension_report skill/agent/plugin scanning before the record pipeline,
+    reduced to {path: (name, tokens, modified)}."""
+    def get_mtime(path: Path) -> str:
+        try:
+            mtime = path.stat().st_mtime
+            return datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
+        except Exception:
+            return "unknown"
+
+    def count_tokens(path: Path) -> int:
+        try:
+            return len(path.read_text()) // 4
+        except Exception:
+            return 0
+
+    inventory = build_inventory(base_dir)
+    result = {}
+    for skill_md in inventory.skills:
+        name = shared_frontmatter_name(skill_md) or skill_md.parent.name
+        content = skill_md.read_text()
+        tokens = len(content) // 4
+        extension_report.classify_skill_subtype(content)
+        for ref in inventory.references_for(skill_md):
+            tokens += count_tokens(ref)
+        result[str(skill_md)] = (name, tokens, get_mtime(skill_md))
+    for agent_md in inventory.agents:
+        name = shared_frontmatter_name(agent_md) or agent_md.stem
+        result[str(agent_md)] = (name, count_tokens(agent_md), get_mtime(agent_md))
+    for item in inventory.plugins:
+        plugin_json = item / ".claude-plugin" / "plugin.json"
+        with open(plugin_json) as f:
+            name = json.load(f).get("name", item.name)
+        tokens = sum(count_tokens(p) for p in inventory.files_under(item, ".md"))
+        tokens += sum(count_tokens(p) for p in inventory.files_under(item, ".json"))
+        result[str(item)] = (name, tokens, get_mtime(plugin_json))
+    return result
+
+
+def pipeline_report_tokens(base_dir: Path) -> Dict[str, Tuple[Optional[str], int, str]]:
+    """The same reduction over extension_report's one-read pipeline, using
+    the chars/4 estimator so token counts compare with the legacy scan."""
+    inventory = build_inventory(base_dir)
+    extension_report._RECORDS.clear()
+    extension_report.set_estimator("chars")
+    result = {}
+    for scan in (extension_report.scan_skills, extension_report.scan_agents,
+                 extension_report.scan_plugins):
+        for ext in scan(base_dir, "claude", inventory):
+            result[ext.path] = (ext.name, ext.tokens, ext.modified)
+    return result
+
+
+class IOCounter:
+    """Counts file opens (audit hook), Python-level os.stat calls, and read
+    syscalls and bytes from /proc/self/io while active."""
+
+    def __init__(self):
+        self.opens = 0
+        self.stats = 0
+        self.active = False
+        sys.addaudithook(self._audit)
+
+    def _audit(self, event, args):
+        if self.active and event == "open":
+            self.opens += 1
+
+    @staticmethod
+    def _proc_io() -> Dict[str, int]:
+        with open("/proc/self/io") as f:
+            return {k: int(v) for k, v in (line.split(": ") for line in f)}
+
+    def measure(self, func: Callable, *args):
+        """Run func(*args); return (result, {opens, stats, read_syscalls, bytes_read})."""
+        real_stat = os.stat
+
+        def counting_stat(*a, **kw):
+            self.stats += 1
+            return real_stat(*a, **kw)
+
+        self.opens = self.stats = 0
+        before = self._proc_io()
+        os.stat = counting_stat
+        self.active = True
+        try:
+            result = func(*args)
+        finally:
+            self.active = False
+            os.stat = real_stat
+        after = self._proc_io()
+        # The two /proc/self/io reads themselves are excluded
+        return result, {
+            "opens": self.opens,
+            "stats": self.stats,
+            "read_syscalls": after["syscr"] - before["syscr"] - 1,
+            "bytes_read": after["rchar"] - before["rchar"],
+        }
+
+
+def bench_reads(skills: int, refs: int, body_kb: int):
+    """Count file opens, stats and read syscalls for extension_report scanning."""
+    if not os.path.exists("/proc/self/io"):
+        print("Error: the reads benchmark needs /proc/self/io (Linux)", file=sys.stderr)
+        sys.exit(2)
+    body = BODY_PARAGRAPH * max(1, body_kb * 1024 // len(BODY_PARAGRAPH))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        for i in range(skills):
+            skill_dir = base / "skills" / f"skill-{i}"
+            (skill_dir / "references").mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_text(SAMPLE_FRONTMATTER.format(i=i) + body)
+            for r in range(refs):
+                (skill_dir / "references" / f"ref-{r}.md").write_text(body)
+        (base / "agents").mkdir()
+        for i in range(max(1, skills // 10)):
+            (base / "agents" / f"agent-{i}.md").write_text(FLAT_FRONTMATTER.format(i=i) + body)
+        for i in range(max(1, skills // 20)):
+            plugin = base / "plugins" / f"plugin-{i}"
+            (plugin / ".claude-plugin").mkdir(parents=True)
+            (plugin / ".claude-plugin" / "plugin.json").write_text(json.dumps({"name": f"p{i}"}))
+            (plugin / "skills" / "s").mkdir(parents=True)
+            (plugin / "skills" / "s" / "SKILL.md").write_text(FLAT_FRONTMATTER.format(i=i) + body)
+
+        counter = IOCounter()
+        legacy, legacy_io = counter.measure(legacy_report_tokens, base)
+        current, current_io = counter.measure(pipeline_report_tokens, base)
+
+    files = skills * (1 + refs) + max(1, skills // 10) + 2 * max(1, skills // 20)
+    print(f"extension_report reads: {files} files, ~{body_kb} KB body each "
+          f"(tree walk included in both)")
+    print(f"  {'metric':<34} {'legacy':>12} {'pipeline':>12} {'ratio':>8}")
+    for key, label in (("opens", "file opens"), ("stats", "extra os.stat calls"),
+                       ("read_syscalls", "read syscalls"), ("bytes_read", "bytes read")):
+        a, b = legacy_io[key], current_io[key]
+        ratio = f"{a / b:.1f}x" if b else "-"
+        print(f"  {label:<34} {a:>12,} {b:>12,} {ratio:>8}")
+    print(f"  results identical: {'yes' if legacy == current else 'NO'}")
+
+
+def legacy_resolve_link(source_file: Path, target: str) -> Tuple[bool, str, str]:
+    """lint_references.resolve_link before LinkResolver, kept verbatim."""
+    if lint_references.is_url(target):
+        return True, "", ""
+    if target.startswith("#"):
+        return True, "", ""
+    if "#" in target:
+        target = target.split("#")[0]
+    if not target:
+        return True, "", ""
+
+    source_dir = source_file.parent
+    target_path = (source_dir / target).resolve()
+
+    if target_path.exists():
+        return True, "", ""
+
+    suggestion = ""
+    if not target_path.suffix:
+        md_path = target_path.with_suffix(".md")
+        if md_path.exists():
+            suggestion = f"Try: {target}.md"
+    if "references" not in target:
+        ref_path = source_dir / "references" / target
+        if ref_path.exists():
+            suggestion = f"Try: references/{target}"
+        ref_md_path = source_dir / "references" / (target + ".md")
+        if ref_md_path.exists():
+            suggestion = f"Try: references/{target}.md"
+
+    return False, f"File not found: {target_path}", suggestion
+
+
+def count_os_calls(func: Callable, *args):
+    """Run func(*args); return (result, calls) counting filesystem os functions."""
+    names = ("stat", "lstat", "scandir", "listdir", "readlink")
+    real = {name: getattr(os, name) for name in names}
+    calls = dict.fromkeys(names, 0)
+
+    def counting(name):
+        def wrapper(*a, **kw):
+            calls[name] += 1
+            return real[name](*a, **kw)
+        return wrapper
+
+    for name in names:
+        setattr(os, name, counting(name))
+    try:
+        result = func(*args)
+    finally:
+        for name in names:
+            setattr(os, name, real[name])
+    return result, calls
+
+
+def bench_links(files: int, links_per_file: int):
+    """Count filesystem calls resolving a plugin's links, legacy vs LinkResolver."""
+    with tempfile.TemporaryDirectory() as tmp:
+        plugin = Path(tmp) / "plugin"
+        shared = plugin / "shared" / "references"
+        shared.mkdir(parents=True)
+        for r in range(10):
+            (shared / f"topic-{r}.md").write_text(BODY_PARAGRAPH)
+
+        # Most links point at shared references; some at the skill's own
+        # references, a few are broken with and without a suggested fix
+        skills = max(1, files // 5)
+        sources = []
+        for i in range(files):
+            skill_dir = plugin / "skills" / f"skill-{i % skills}"
+            (skill_dir / "references").mkdir(parents=True, exist_ok=True)
+            (skill_dir / "references" / "local.md").write_text(BODY_PARAGRAPH)
+            name = "SKILL.md" if i < skills else f"references/page-{i}.md"
+            source = skill_dir / name
+            depth = "../../.." if "/" in name else "../.."
+            links = []
+            for j in range(links_per_file):
+                kind = j % 10
+                if kind < 6:
+                    target = f"{depth}/shared/references/topic-{j % 10}.md#section"
+                elif kind < 8:
+                    target = "references/local.md" if "/" not in name else "local.md"
+                elif kind == 8:
+                    target = "local"
+                else:
+                    target = f"missing-{j}.md"
+                links.append(f"- [link {j}]({target})")
+                sources.append((source, target))
+            source.write_text("# Page\n\n" + "\n".join(links) + "\n")
+
+        def run_legacy():
+            return [legacy_resolve_link(s, t) for s, t in sources]
+
+        def run_resolver():
+            resolver = lint_references.LinkResolver()
+            return [resolver.resolve(s, t) for s, t in sources]
+
+        legacy, legacy_calls = count_os_calls(run_legacy)
+        current, current_calls = count_os_calls(run_resolver)
+        started = time.perf_counter()
+        run_legacy()
+        legacy_s = time.perf_counter() - started
+        started = time.perf_counter()
+        run_resolver()
+        current_s = time.perf_counter() - started
+
+    broken = sum(1 for valid, _, _ in legacy if not valid)
+    print(f"lint_references links: {len(sources):,} links in {files} files "
+          f"({broken:,} broken)")
+    print(f"  {'filesystem call':<34} {'legacy':>12} {'resolver':>12} {'ratio':>8}")
+    for name in legacy_calls:
+        a, b = legacy_calls[name], current_calls[name]
+        if a or b:
+            ratio = f"{a / b:.1f}x" if a and b else "-"
+            print(f"  {'os.' + name:<34} {a:>12,} {b:>12,} {ratio:>8}")
+    a, b = sum(legacy_calls.values()), sum(current_calls.values())
+    print(f"  {'total':<34} {a:>12,} {b:>12,} {a / max(1, b):>7.1f}x")
+    print(f"  {'wall time (ms)':<34} {legacy_s * 1000:>12.1f} {current_s * 1000:>12.1f} "
+          f"{legacy_s / current_s:>7.1f}x")
+    print(f"  results identical: {'yes' if legacy == current else 'NO'}")
+
+
+class StandInServer:
+    """Local HTTP/1.1 server standing in for a docs host.
+
+    /ok/* answers 200, /get-only/* rejects HEAD with 405, /old/* redirects
+    to /ok/*, anything else is 404. Each response waits delay seconds.
+    Counts requests, TCP connections and peak concurrent requests.
+    """
+
+    def __init__(self, delay: float):
+        self.requests = 0
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def respond(self, with_body: bool):
+                with lock:
+                    server.requests += 1
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                time.sleep(delay)
+                if self.path.startswith("/old/"):
+                    status, headers = 301, {"Location": "/ok/" + self.path[5:]}
+                elif self.path.startswith("/get-only/") and not with_body:
+                    status, headers = 405, {}
+                elif self.path.startswith(("/ok/", "/get-only/")):
+                    status, headers = 200, {}
+                else:
+                    status, headers = 404, {}
+                body = b"stand-in page\n"
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if with_body:
+                    self.wfile.write(body)
+                with lock:
+                    server.active -= 1
+
+            def do_HEAD(self):
+                self.respond(with_body=False)
+
+            def do_GET(self):
+                self.respond(with_body=True)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def reset(self):
+        self.requests = self.connections = self.peak = 0
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def bench_urls(hosts: int, urls_per_host: int, copies: int, delay_ms: float, jobs: int):
+    """Check links against local stand-in servers: dedup, per-host limits, keep-alive, cache."""
+    servers = [StandInServer(delay_ms / 1000) for _ in range(hosts)]
+    try:
+        urls = []
+        for server in servers:
+            for i in range(urls_per_host):
+                kind = ("ok", "ok", "ok", "ok", "get-only", "old", "ok", "ok", "ok", "dead")[i % 10]
+                urls.append(f"{server.url}/{kind}/page-{i}")
+        # The same URLs linked from many files, some with #fragments
+        links = [f"{u}#s{c}" if c % 2 else u for c in range(copies) for u in urls]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "url-cache.json"
+            runs = []
+            for label, per_host in (("per link, no keep-alive", None),
+                                    ("concurrent, cold cache", url_checker.PER_HOST_LIMIT),
+                                    ("concurrent, warm cache", url_checker.PER_HOST_LIMIT)):
+                for server in servers:
+                    server.reset()
+                started = time.perf_counter()
+                if per_host is None:
+                    # Every link checked in turn on its own connection
+                    results = {}
+                    for url in links:
+                        conn = url_checker.HostConnection(*url_checker.host_key(url))
+                        results[url] = url_checker.check_url(urldefrag(url)[0], conn)
+                        conn.close()
+                else:
+                    cache = url_checker.UrlCache.load(cache_path)
+                    results = url_checker.check_urls(links, cache, jobs, per_host)
+                    cache.save()
+                seconds = time.perf_counter() - started
+                broken = len({urldefrag(u)[0] for u, r in results.items() if not r.ok})
+                runs.append((label, seconds, sum(s.requests for s in servers),
+                             sum(s.connections for s in servers), max(s.peak for s in servers), broken))
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    print(f"URL checker: {len(links):,} links, {len(urls)} distinct URLs on {hosts} local hosts, "
+          f"{delay_ms:g} ms per response")
+    print(f"  {'run':<28} {'ms':>9} {'requests':>9} {'conns':>7} {'peak/host':>10} {'broken':>7}")
+    for label, seconds, requests, connections, peak, broken in runs:
+        print(f"  {label:<28} {seconds * 1000:>9.1f} {requests:>9,} {connections:>7,} "
+              f"{peak:>10} {broken:>7}")
+    print(f"  broken = distinct URLs; per-host limit {url_checker.PER_HOST_LIMIT}, {jobs} jobs")
+
+
+def bench_tokenizer(copies: int, repeat: int):
+    """Time the BPE tokenizer without and with its pre-token cache, and batched."""
+    sources = sorted((TOOLKIT_ROOT / "skills").rglob("*.md")) + sorted(
+        (TOOLKIT_ROOT / "references").rglob("*.md"))
+    texts = [p.read_text() for p in sources] * copies
+    megabytes = sum(len(t) for t in texts) / 1e6
+    merges = load_merges()
+
+    def best_of(fn: Callable[[], List[int]]) -> Tuple[float, List[int]]:
+        best, counts = float("inf"), []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            counts = fn()
+            best = min(best, time.perf_counter() - started)
+        return best, counts
+
+    uncached = BPETokenizer(merges, cache_size=0)
+    cached = BPETokenizer(merges)
+    batched = BPETokenizer(merges)
+    runs = [
+        ("chars/4", best_of(lambda: [chars_estimate(t) for t in texts])),
+        ("calibrated", best_of(lambda: [calibrated_estimate(t) for t in texts])),
+        ("bpe, no cache", best_of(lambda: [uncached.count(t) for t in texts])),
+        ("bpe, LRU cache", best_of(lambda: [cached.count(t) for t in texts])),
+        ("bpe, count_many", best_of(lambda: batched.count_many(texts))),
+    ]
+
+    print(f"Tokenizer: {len(texts)} texts, {megabytes:.1f} MB, {len(merges)} merges")
+    print(f"  {'estimator':<20} {'ms':>10} {'MB/s':>8} {'tokens':>10}")
+    for label, (seconds, counts) in runs:
+        rate = megabytes / seconds if seconds else float("inf")
+        print(f"  {label:<20} {seconds * 1000:>10.1f} {rate:>8.1f} {sum(counts):>10,}")
+    bpe_counts = [counts for label, (_, counts) in runs[2:]]
+    print(f"  BPE counts identical: {'yes' if all(c == bpe_counts[0] for c in bpe_counts) else 'NO'}")
+    info = cached.cache_info()
+    print(f"  cache: {info.currsize} pre-tokens, {info.hits / max(1, info.hits + info.misses):.1%} hits")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark toolkit scanning hot paths")
+    subparsers = parser.add_subparsers(dest="benchmark")
+
+    fm_parser = subparsers.add_parser("frontmatter", help="Frontmatter parsing")
+    fm_parser.add_argument("--files", type=int, default=200, help="Synthetic files")
+    fm_parser.add_argument("--body-kb", type=int, default=32, help="Body size per file in KB")
+    fm_parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+
+    dep_parser = subparsers.add_parser("deprecations", help="Deprecation pattern scan")
+    dep_parser.add_argument("--files", type=int, default=10000, help="Synthetic files")
+    dep_parser.add_argument("--body-kb", type=int, default=4, help="Body size per file in KB")
+    dep_parser.add_argument("--hit-rate", type=float, default=0.05,
+                            help="Fraction of files containing deprecated patterns")
+
+    reads_parser = subparsers.add_parser("reads", help="File reads in extension_report")
+    reads_parser.add_argument("--skills", type=int, default=500, help="Synthetic skills")
+    reads_parser.add_argument("--refs", type=int, default=2, help="References per skill")
+    reads_parser.add_argument("--body-kb", type=int, default=8, help="Body size per file in KB")
+
+    tok_parser = subparsers.add_parser("tokenizer", help="BPE tokenizer throughput")
+    tok_parser.add_argument("--copies", type=int, default=20,
+                            help="Copies of the toolkit's markdown in the corpus")
+    tok_parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+
+    links_parser = subparsers.add_parser("links", help="Link resolution in lint_references")
+    links_parser.add_argument("--files", type=int, default=250, help="Synthetic markdown files")
+    links_parser.add_argument("--links-per-file", type=int, default=20, help="Links in each file")
+
+    urls_parser = subparsers.add_parser("urls", help="URL checker against local stand-in servers")
+    urls_parser.add_argument("--hosts", type=int, default=4, help="Local servers")
+    urls_parser.add_argument("--urls-per-host", type=int, default=25, help="Distinct URLs per server")
+    urls_parser.add_argument("--copies", type=int, default=4, help="Times each URL is linked")
+    urls_parser.add_argument("--delay-ms", type=float, default=10, help="Server response delay")
+    urls_parser.add_argument("--jobs", type=int, default=url_checker.DEFAULT_JOBS,
+                             help="Checker threads")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "frontmatter":
+        bench_frontmatter(args.files, args.body_kb, args.repeat)
+    elif args.benchmark == "deprecations":
+        bench_deprecations(args.files, args.body_kb, args.hit_rate)
+    elif args.benchmark == "reads":
+        bench_reads(args.skills, args.refs, args.body_kb)
+    elif args.benchmark == "tokenizer":
+        bench_tokenizer(args.copies, args.repeat)
+    elif args.benchmark == "links":
+        bench_links(args.files, args.links_per_file)
+    elif args.benchmark == "urls":
+        bench_urls(args.hosts, args.urls_per_host, args.copies, args.delay_ms, args.jobs)
+    else:
+        parser.print_help()
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Model what installed extensions cost in the context window, by load tier.
+
+Extensions do not load all at once:
+
+    always      every session: skill, agent and command listings (name and
+                description) and the top-level CLAUDE.md of each root
+    invocation  when used: a skill or command body; an agent body becomes
+                the subagent's system prompt
+    on demand   only when read: skill references and nested CLAUDE.md files
+
+The per-session baseline is the sum of the "always" tier. It is paid on
+every turn of every session whether or not anything is used, so it is the
+number to keep small. Skills and commands with disable-model-invocation
+are not listed, and extensions shadowed by a higher-priority scope with the
+same name are not loaded; neither adds to the baseline. Plugin components
+are invoked as plugin:name, so a user or project extension never shadows
+them.
+
+Usage:
+    python context_budget.py                  # Installed roots for the current project
+    python context_budget.py --project ~/repo # Another project
+    python context_budget.py <path>           # One directory (e.g. a plugin)
+    python context_budget.py --top 20 --estimator calibrated
+    python context_budget.py --json
+
+Exit codes:
+    0 - Success
+    2 - Usage error
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from frontmatter_parser import parse_frontmatter
+from inventory import Inventory, get_inventory
+from roots import Root, discover_roots, plugin_name
+from tokenizer import DEFAULT_ESTIMATOR, ESTIMATORS, count_tokens
+
+# Scopes whose extensions are loaded into sessions (marketplace plugins are
+# only available, not installed)
+LOADED_SCOPES = ("enterprise", "user", "project", "plugin", "plugin-dir")
+
+DEFAULT_TOP = 10
+
+
+@dataclass
+class BudgetItem:
+    """One extension's token cost in each load tier."""
+    name: str
+    path: str
+    extension_type: str
+    scope: str
+    owner: str = ""          # Plugin the extension ships in, if any
+    always: int = 0
+    invocation: int = 0
+    on_demand: int = 0
+    model_invocable: bool = True
+    shadowed_by: str = ""
+
+    @property
+    def loaded(self) -> bool:
+        return not self.shadowed_by
+
+    @property
+    def worst_case(self) -> int:
+        """Tokens in context after invoking this item and reading all its references."""
+        return self.always + self.invocation + self.on_demand
+
+
+@dataclass
+class ContextBudget:
+    """Budget items for every scanned root."""
+    roots: List[Root]
+    estimator: str
+    items: List[BudgetItem] = field(default_factory=list)
+
+    @property
+    def baseline(self) -> int:
+        return sum(i.always for i in self.items if i.loaded)
+
+    def baseline_by_type(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for item in self.items:
+            if item.loaded:
+                totals[item.extension_type] = totals.get(item.extension_type, 0) + item.always
+        return totals
+
+    def always_on(self) -> List[BudgetItem]:
+        """Loaded items with an always-on cost, largest first."""
+        return sorted((i for i in self.items if i.loaded and i.always),
+                      key=lambda i: (-i.always, i.name))
+
+    def invocable(self) -> List[BudgetItem]:
+        """Loaded skills and commands, largest worst case first."""
+        return sorted((i for i in self.items if i.loaded and i.extension_type in ("skill", "command")),
+                      key=lambda i: (-i.worst_case, i.name))
+
+
+def listing_text(name: str, description: str) -> str:
+    """How an extension appears in the always-loaded listing."""
+    return f"- {name}: {description}\n"
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(errors="replace")
+    except OSError:
+        return None
+
+
+def _owner(path: Path, inventory: Inventory) -> str:
+    """Name of the plugin below the scanned root that path ships in."""
+    for plugin in inventory.plugin_roots:
+        if plugin != inventory.base_dir and plugin in path.parents:
+            return plugin_name(plugin)
+    return ""
+
+
+def _root_plugin(root: Root, inventory: Inventory) -> str:
+    """Name of the plugin the scanned root itself is, if it is one."""
+    if root.namespace or inventory.base_dir in inventory.plugin_roots:
+        return plugin_name(root.path)
+    return ""
+
+
+def definition_item(path: Path, extension_type: str, default_name: str, root: Root,
+                    inventory: Inventory, estimator: str) -> Optional[BudgetItem]:
+    """Budget for a skill, agent or command definition file."""
+    content = _read(path)
+    if content is None:
+        return None
+
+    frontmatter = parse_frontmatter(content)
+    name = (frontmatter.scalar("name") if frontmatter else None) or default_name
+    description = (frontmatter.scalar("description") if frontmatter else None) or ""
+    body = frontmatter.body(content) if frontmatter else content
+
+    owner = _owner(path, inventory) or _root_plugin(root, inventory)
+    item = BudgetItem(name, str(path), extension_type, root.scope, owner)
+    if frontmatter is not None and extension_type != "agent":
+        item.model_invocable = frontmatter.fields.get("disable-model-invocation") is not True
+    if item.model_invocable and (description or extension_type != "command"):
+        item.always = count_tokens(listing_text(name, description), estimator)
+    item.invocation = count_tokens(body, estimator)
+
+    if extension_type == "skill":
+        for ref in inventory.references_for(path):
+            ref_content = _read(ref)
+            if ref_content is not None:
+                item.on_demand += count_tokens(ref_content, estimator)
+    return item
+
+
+def claude_md_items(root: Root, inventory: Inventory, estimator: str) -> List[BudgetItem]:
+    """CLAUDE.md files: a root's own (and a project's top-level one) always load."""
+    always_loaded = {root.path / "CLAUDE.md"}
+    if root.scope == "project":
+        always_loaded.add(root.path.parent / "CLAUDE.md")
+
+    paths = [p for p in inventory.claude_md if not _owner(p, inventory)]
+    project_md = root.path.parent / "CLAUDE.md"
+    if root.scope == "project" and project_md.is_file() and project_md not in paths:
+        paths.append(project_md)
+
+    items = []
+    for path in paths:
+        content = _read(path)
+        if content is None:
+            continue
+        tokens = count_tokens(content, estimator)
+        try:
+            name = str(path.relative_to(root.path))
+        except ValueError:
+            name = str(path.relative_to(root.path.parent))
+        item = BudgetItem(name, str(path), "claude_md", root.scope)
+        if path in always_loaded:
+            item.always = tokens
+        else:
+            item.on_demand = tokens
+        items.append(item)
+    return items
+
+
+def scan_root(root: Root, estimator: str = DEFAULT_ESTIMATOR) -> List[BudgetItem]:
+    """Budget items for one root, including components of plugins inside it."""
+    inventory = get_inventory(root.path)
+    items = []
+
+    for skill_md in inventory.skills:
+        item = definition_item(skill_md, "skill", skill_md.parent.name, root, inventory, estimator)
+        if item:
+            items.append(item)
+
+    for extension_type, dirname in (("agent", "agents"), ("command", "commands")):
+        paths = set(inventory.files_in(root.path / dirname))
+        for plugin in inventory.plugin_roots:
+            paths.update(inventory.files_in(plugin / dirname))
+        for path in sorted(paths):
+            item = definition_item(path, extension_type, path.stem, root, inventory, estimator)
+            if item:
+                items.append(item)
+
+    items.extend(claude_md_items(root, inventory, estimator))
+    return items
+
+
+def mark_shadowed(items: List[BudgetItem]) -> None:
+    """Mark items whose type and name a higher-priority scope already defines.
+
+    items are in root precedence order. Plugin components are invoked as
+    plugin:name, so they are matched by owner too. Duplicates within one
+    scope both load.
+    """
+    winners: Dict[tuple, BudgetItem] = {}
+    for item in items:
+        if item.extension_type == "claude_md":
+            continue
+        key = (item.extension_type, item.owner, item.name)
+        winner = winners.get(key)
+        if winner is None:
+            winners[key] = item
+        elif winner.scope != item.scope:
+            item.shadowed_by = winner.path
+
+
+def build_budget(roots: List[Root], estimator: str = DEFAULT_ESTIMATOR) -> ContextBudget:
+    """Budget across roots, given in precedence order."""
+    budget = ContextBudget(roots, estimator)
+    for root in roots:
+        budget.items.extend(scan_root(root, estimator))
+    mark_shadowed(budget.items)
+    return budget
+
+
+def _label(item: BudgetItem) -> str:
+    return f"{item.owner}:{item.name}" if item.owner else item.name
+
+
+def print_budget(budget: ContextBudget, top: int = DEFAULT_TOP) -> None:
+    print("=" * 70)
+    print(f"CONTEXT BUDGET (estimator: {budget.estimator})")
+    print("=" * 70)
+    for root in budget.roots:
+        print(f"  {root.scope:<12} {root.path}")
+
+    baseline = budget.baseline
+    print(f"\nPer-session baseline: {baseline:,} tokens")
+    labels = {"skill": "Skill listings", "agent": "Agent listings",
+              "command": "Command listings", "claude_md": "CLAUDE.md"}
+    for extension_type, tokens in sorted(budget.baseline_by_type().items(), key=lambda x: -x[1]):
+        count = sum(1 for i in budget.items
+                    if i.loaded and i.always and i.extension_type == extension_type)
+        print(f"  {labels.get(extension_type, extension_type):<18} {tokens:>8,}  ({count} items)")
+
+    always_on = budget.always_on()
+    if always_on:
+        print(f"\n## Largest always-on items (top {min(top, len(always_on))} of {len(always_on)})")
+        print(f"{'Tokens':>8} {'Share':>6}  {'Type':<9} {'Scope':<11} Name")
+        print("-" * 70)
+        for item in always_on[:top]:
+            share = item.always / baseline if baseline else 0.0
+            print(f"{item.always:>8,} {share:>6.1%}  {item.extension_type:<9} {item.scope:<11} "
+                  f"{_label(item)[:40]}")
+
+    invocable = budget.invocable()
+    if invocable:
+        print(f"\n## Worst-case invocation cost (top {min(top, len(invocable))} of {len(invocable)})")
+        print(f"{'Listing':>8} {'Body':>8} {'Refs':>8} {'Worst':>8}  Name")
+        print("-" * 70)
+        for item in invocable[:top]:
+            manual = "" if item.model_invocable else "  [manual only]"
+            print(f"{item.always:>8,} {item.invocation:>8,} {item.on_demand:>8,} "
+                  f"{item.worst_case:>8,}  {_label(item)[:36]}{manual}")
+
+    shadowed = [i for i in budget.items if not i.loaded]
+    manual = [i for i in budget.items if i.loaded and not i.model_invocable]
+    if shadowed or manual:
+        print(f"\nNot in baseline: {len(shadowed)} shadowed, "
+              f"{len(manual)} with model invocation disabled")
+
+
+def budget_to_dict(budget: ContextBudget) -> dict:
+    return {
+        "estimator": budget.estimator,
+        "roots": [{"scope": r.scope, "path": str(r.path)} for r in budget.roots],
+        "baseline": budget.baseline,
+        "baseline_by_type": budget.baseline_by_type(),
+        "items": [
+            {
+                "name": i.name,
+                "path": i.path,
+                "type": i.extension_type,
+                "scope": i.scope,
+                "owner": i.owner,
+                "always": i.always,
+                "invocation": i.invocation,
+                "on_demand": i.on_demand,
+                "worst_case": i.worst_case,
+                "model_invocable": i.model_invocable,
+                "shadowed_by": i.shadowed_by,
+            }
+            for i in budget.items
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context window cost of installed extensions by load tier")
+    parser.add_argument("path", nargs="?", help="Scan only this directory instead of discovered roots")
+    parser.add_argument("--project", help="Project directory for root discovery (default: cwd)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help=f"Items per table (default: {DEFAULT_TOP})")
+    parser.add_argument("--estimator", choices=ESTIMATORS, default=DEFAULT_ESTIMATOR,
+                        help=f"Token estimator (default: {DEFAULT_ESTIMATOR})")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if args.path:
+        path = Path(args.path).expanduser()
+        if not path.is_dir():
+            print(f"Error: Not a directory: {path}", file=sys.stderr)
+            sys.exit(2)
+        roots = [Root(path, "user")]
+    else:
+        project = Path(args.project) if args.project else None
+        if project is not None and not project.is_dir():
+            print(f"Error: Not a directory: {project}", file=sys.stderr)
+            sys.exit(2)
+        roots = [r for r in discover_roots(project) if r.scope in LOADED_SCOPES]
+
+    budget = build_budget(roots, args.estimator)
+    if args.json:
+        print(json.dumps(budget_to_dict(budget), indent=2))
+    else:
+        print_budget(budget, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate sections across skills and their references.
+
+Boilerplate copied between SKILL.md and references/*.md files costs tokens
+in every copy. This splits each file at the same section boundaries as
+token_counter.py, shingles each section into overlapping word k-grams and
+reduces the shingle set to a MinHash signature. Signatures are grouped by
+LSH banding, so only sections sharing a band are compared rather than every
+pair; candidates are kept when their estimated Jaccard similarity reaches
+--threshold, and connected into clusters.
+
+Clusters are single-linkage: a section joins a cluster when it matches any
+one member, so sections at opposite ends of a chain of edits can be less
+similar than --threshold to each other.
+
+Signatures use one-permutation MinHash: each shingle is hashed once and
+binned, keeping the minimum per bin, with empty bins filled by rotation
+from their neighbour. This estimates Jaccard similarity like k independent
+hash functions at the cost of one.
+
+For each cluster the report suggests a canonical copy: the section closest
+to the cluster's consensus signature, preferring one already in
+references/. Copies within --threshold of it count as wasted tokens; the
+rest are listed as related (marked ~) but not counted, since replacing
+them with a link would lose content.
+
+Usage:
+    python duplicate_detector.py <path>         # Scan a directory
+    python duplicate_detector.py --all          # Scan ~/.claude
+    python duplicate_detector.py --all --threshold 0.6 --top 20
+    python duplicate_detector.py --all --json
+
+Exit codes:
+    0 - Success
+    1 - Error
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from inventory import get_inventory
+from token_counter import parse_frontmatter, split_sections
+from tokenizer import DEFAULT_ESTIMATOR, ESTIMATORS, count_tokens_many
+
+CLAUDE_DIR = Path.home() / ".claude"
+
+NUM_HASHES = 128
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8
+# Sections shorter than this are headings, links and one-liners, where
+# overlap is coincidence rather than copied boilerplate
+MIN_WORDS = 40
+# Chance that LSH banding makes a pair at exactly the threshold a candidate
+MIN_RECALL = 0.9
+
+# Copies listed per cluster in text output (--json lists all)
+MAX_LISTED = 10
+
+HASH_RANGE = 1 << 64
+WORD_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class Section:
+    """One section of one file, with its MinHash signature."""
+    path: Path
+    heading: str
+    text: str
+    signature: Tuple[int, ...]
+    tokens: int = 0
+
+    @property
+    def is_reference(self) -> bool:
+        return self.path.parent.name == "references"
+
+    def label(self, base_dir: Path) -> str:
+        try:
+            path = self.path.relative_to(base_dir)
+        except ValueError:
+            path = self.path
+        return f"{path} § {self.heading}"
+
+
+@dataclass
+class Cluster:
+    """Sections linked by near-duplicate pairs (single linkage)."""
+    sections: List[Section]
+    canonical: Section
+    threshold: float = DEFAULT_THRESHOLD
+    similarity: Dict[int, float] = field(default_factory=dict)  # id(section) -> vs canonical
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(s.tokens for s in self.sections)
+
+    def is_duplicate(self, section: Section) -> bool:
+        """Whether section is a near-duplicate of the canonical copy itself."""
+        return section is not self.canonical and self.similarity[id(section)] >= self.threshold
+
+    @property
+    def duplicates(self) -> List[Section]:
+        return [s for s in self.sections if self.is_duplicate(s)]
+
+    @property
+    def related(self) -> List[Section]:
+        """Copies in the cluster only through other copies, below threshold vs canonical."""
+        return [s for s in self.sections if s is not self.canonical and not self.is_duplicate(s)]
+
+    @property
+    def wasted_tokens(self) -> int:
+        """Tokens saved if every near-duplicate of the canonical copy became a link."""
+        return sum(s.tokens for s in self.duplicates)
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> set:
+    """Hashed word k-grams of text, case-folded so formatting changes don't matter."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < k:
+        words_k = [" ".join(words)] if words else []
+    else:
+        words_k = [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+    return {
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+        for s in words_k
+    }
+
+
+def minhash(hashes: set, num_hashes: int = NUM_HASHES) -> Tuple[int, ...]:
+    """One-permutation MinHash signature with rotation densification."""
+    bins: List[Optional[int]] = [None] * num_hashes
+    for h in hashes:
+        b, value = h % num_hashes, h // num_hashes
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+    if not hashes:
+        return tuple([0] * num_hashes)
+
+    # An empty bin takes the next non-empty bin's value, offset by the
+    # distance so borrowed values only match the same borrowing elsewhere
+    offset = HASH_RANGE // num_hashes
+    signature = list(bins)
+    for i in range(num_hashes):
+        if signature[i] is not None:
+            continue
+        distance = 1
+        while bins[(i + distance) % num_hashes] is None:
+            distance += 1
+        signature[i] = bins[(i + distance) % num_hashes] + distance * offset
+    return tuple(signature)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: the fraction of matching signature positions."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def choose_bands(threshold: float, num_hashes: int = NUM_HASHES) -> Tuple[int, int]:
+    """(bands, rows) for LSH banding at threshold.
+
+    A pair with similarity s shares at least one band with probability
+    1 - (1 - s^rows)^bands. More rows per band means fewer false candidates;
+    use the most rows that still catch a pair at the threshold with
+    probability MIN_RECALL.
+    """
+    best = (num_hashes, 1)
+    for rows in range(1, num_hashes + 1):
+        if num_hashes % rows:
+            continue
+        bands = num_hashes // rows
+        if 1 - (1 - threshold ** rows) ** bands >= MIN_RECALL:
+            best = (bands, rows)
+    return best
+
+
+def collect_sections(base_dir: Path, min_words: int = MIN_WORDS) -> Tuple[List[Section], int]:
+    """Sections of every SKILL.md and reference under base_dir, and the file count."""
+    inventory = get_inventory(base_dir)
+    files = []
+    seen = set()
+    for skill_md in inventory.skills:
+        for path in [skill_md, *inventory.references_for(skill_md)]:
+            if path not in seen:
+                seen.add(path)
+                files.append(path)
+
+    sections = []
+    for path in files:
+        try:
+            content = path.read_text(errors="replace")
+        except OSError:
+            continue
+        _, body = parse_frontmatter(content)
+        for heading, text in split_sections(body):
+            if len(WORD_PATTERN.findall(text)) < min_words:
+                continue
+            sections.append(Section(path, heading, text, minhash(shingles(text))))
+    return sections, len(files)
+
+
+def find_clusters(sections: List[Section], threshold: float = DEFAULT_THRESHOLD) -> List[List[Section]]:
+    """Group sections by LSH banding and verify candidates against threshold."""
+    num_hashes = len(sections[0].signature) if sections else NUM_HASHES
+    bands, rows = choose_bands(threshold, num_hashes)
+
+    buckets: Dict[Tuple, List[int]] = defaultdict(list)
+    for index, section in enumerate(sections):
+        sig = section.signature
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(index)
+
+    parent = list(range(len(sections)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        # Compare each member with the bucket's representatives rather than
+        # every pair, so one widely copied section stays linear; a match
+        # with any of them joins the two clusters (single linkage)
+        reps = [members[0]]
+        for index in members[1:]:
+            for rep in reps:
+                if find(rep) == find(index):
+                    break
+                pair = (rep, index)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if similarity(sections[rep].signature, sections[index].signature) >= threshold:
+                    parent[find(index)] = find(rep)
+                    break
+            else:
+                reps.append(index)
+
+    groups: Dict[int, List[Section]] = defaultdict(list)
+    for index, section in enumerate(sections):
+        groups[find(index)].append(section)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def build_cluster(sections: List[Section], threshold: float = DEFAULT_THRESHOLD) -> Cluster:
+    """Pick the canonical copy: closest to the consensus signature, references first."""
+    positions = zip(*(s.signature for s in sections))
+    consensus = tuple(Counter(values).most_common(1)[0][0] for values in positions)
+    canonical = max(sections, key=lambda s: (
+        similarity(s.signature, consensus), s.is_reference, s.tokens, -len(str(s.path)),
+    ))
+    cluster = Cluster(sections, canonical, threshold)
+    cluster.similarity = {id(s): similarity(s.signature, canonical.signature) for s in sections}
+    cluster.sections.sort(key=lambda s: (s is not canonical, not cluster.is_duplicate(s),
+                                         str(s.path), s.heading))
+    return cluster
+
+
+def detect_duplicates(
+    base_dir: Path,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_words: int = MIN_WORDS,
+    estimator: str = DEFAULT_ESTIMATOR,
+) -> Tuple[List[Cluster], int, int]:
+    """Clusters sorted by wasted tokens, with the file and section counts scanned."""
+    sections, file_count = collect_sections(base_dir, min_words)
+    groups = find_clusters(sections, threshold)
+
+    # Only sections in a cluster need counting
+    members = [s for group in groups for s in group]
+    for section, tokens in zip(members, count_tokens_many([s.text for s in members], estimator)):
+        section.tokens = tokens
+
+    clusters = [build_cluster(group, threshold) for group in groups]
+    clusters.sort(key=lambda c: (-c.wasted_tokens, c.canonical.label(base_dir)))
+    return clusters, file_count, len(sections)
+
+
+def suggestion(cluster: Cluster, base_dir: Path) -> str:
+    others = len(cluster.duplicates)
+    canonical = cluster.canonical.label(base_dir)
+    if not others:
+        advice = f"No copy is within the threshold of {canonical}; compare the related copies by hand"
+    elif cluster.canonical.is_reference:
+        advice = f"Link the other {others} copies to {canonical}"
+    else:
+        advice = f"Move {canonical} into a shared references/ file and link the other {others} copies to it"
+    related = len(cluster.related)
+    if others and related:
+        advice += f" ({related} related, less similar copies need a manual look)"
+    return advice
+
+
+def print_clusters(clusters: List[Cluster], base_dir: Path, file_count: int, section_count: int,
+                   threshold: float, top: Optional[int] = None) -> None:
+    bands, rows = choose_bands(threshold)
+    print("=" * 70)
+    print(f"NEAR-DUPLICATE SECTIONS (threshold {threshold:.2f}, "
+          f"{NUM_HASHES} hashes, {bands} bands x {rows} rows)")
+    print("=" * 70)
+    wasted = sum(c.wasted_tokens for c in clusters)
+    print(f"Scanned {section_count:,} sections in {file_count:,} files: "
+          f"{len(clusters)} clusters, {wasted:,} tokens duplicated")
+
+    shown = clusters[:top] if top else clusters
+    for number, cluster in enumerate(shown, 1):
+        related = len(cluster.related)
+        print(f"\n## Cluster {number}: {len(cluster.sections)} copies"
+              f"{f' ({related} related)' if related else ''}, "
+              f"{cluster.wasted_tokens:,} tokens wasted")
+        for section in cluster.sections[:MAX_LISTED]:
+            if section is cluster.canonical:
+                print(f"  * {section.tokens:>6,} tok         {section.label(base_dir)}")
+            else:
+                marker = " " if cluster.is_duplicate(section) else "~"
+                print(f"  {marker} {section.tokens:>6,} tok  {cluster.similarity[id(section)]:>4.0%}   "
+                      f"{section.label(base_dir)}")
+        if len(cluster.sections) > MAX_LISTED:
+            print(f"    ... {len(cluster.sections) - MAX_LISTED} more copies")
+        print(f"  -> {suggestion(cluster, base_dir)}")
+
+    if top and len(clusters) > top:
+        print(f"\n... {len(clusters) - top} more clusters")
+
+
+def cluster_to_dict(cluster: Cluster, base_dir: Path) -> dict:
+    return {
+        "copies": len(cluster.sections),
+        "related": len(cluster.related),
+        "total_tokens": cluster.total_tokens,
+        "wasted_tokens": cluster.wasted_tokens,
+        "canonical": cluster.canonical.label(base_dir),
+        "suggestion": suggestion(cluster, base_dir),
+        "sections": [
+            {
+                "path": str(s.path),
+                "section": s.heading,
+                "tokens": s.tokens,
+                "similarity": round(cluster.similarity[id(s)], 3),
+                "duplicate": cluster.is_duplicate(s),
+            }
+            for s in cluster.sections
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate sections across skills and references")
+    parser.add_argument("path", nargs="?", help="Directory to scan")
+    parser.add_argument("--all", action="store_true", help="Scan ~/.claude")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Minimum estimated Jaccard similarity (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-words", type=int, default=MIN_WORDS,
+                        help=f"Ignore sections with fewer words (default: {MIN_WORDS})")
+    parser.add_argument("--top", type=int, help="Show only the N most wasteful clusters")
+    parser.add_argument("--estimator", choices=ESTIMATORS, default=DEFAULT_ESTIMATOR,
+                        help=f"Token estimator (default: {DEFAULT_ESTIMATOR})")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if args.all:
+        base_dir = CLAUDE_DIR
+    elif args.path:
+        base_dir = Path(args.path)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    if not base_dir.is_dir():
+        print(f"Error: Not a directory: {base_dir}", file=sys.stderr)
+        sys.exit(1)
+    base_dir = base_dir.resolve()
+    if not 0 < args.threshold <= 1:
+        print("Error: --threshold must be between 0 and 1", file=sys.stderr)
+        sys.exit(1)
+
+    clusters, file_count, section_count = detect_duplicates(
+        base_dir, args.threshold, args.min_words, args.estimator)
+
+    if args.json:
+        shown = clusters[:args.top] if args.top else clusters
+        print(json.dumps({
+            "files": file_count,
+            "sections": section_count,
+            "threshold": args.threshold,
+            "wasted_tokens": sum(c.wasted_tokens for c in clusters),
+            "clusters": [cluster_to_dict(c, base_dir) for c in shown],
+        }, indent=2))
+    else:
+        print_clusters(clusters, base_dir, file_count, section_count, args.threshold, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ Generate a comprehensive report of all installed Claude Code extensions.
 
 Provides an overview of:
 - All skills, agents, commands, plugins, hooks
-- Token counts and size analysis
+- Token counts (offline BPE tokenizer by default, with chars/4 alongside)
 - Modification dates
 - Structural issues
 
@@ -13,23 +13,69 @@ Usage:
     python extension_report.py --summary    # Summary only
     python extension_report.py --type skills  # Specific type
     python extension_report.py --json       # JSON output
+    python extension_report.py --index      # Report from the incremental index
+    python extension_report.py --discover   # User, project, plugin and marketplace roots
+    python extension_report.py --root user=~/.claude --root project=./.claude
+    python extension_report.py --workspace ~/src --jobs 8  # One row per project
+    python extension_report.py --estimator chars  # chars/4 instead of the BPE tokenizer
+    python extension_report.py query --type skill --min-tokens 2000 --modified-within 7d
+    python extension_report.py query --has-issues --json
+    python extension_report.py query --sql "SELECT type, SUM(tokens) FROM extensions GROUP BY type"
+
+The index (data/cache/extension-index.sqlite) stores every extension and the
+files it is built from, with content hashes, frontmatter fields, token
+estimates and validation findings. Each refresh re-reads only files whose
+mtime or size changed and rebuilds only the extensions that own them.
+
+With several roots (--discover or --root), roots are scanned concurrently,
+each extension's source is its scope, and a skill, agent or command whose
+name is already defined by a higher-priority scope is marked shadowed.
+Plugin components are compared as plugin:name.
+
+--workspace finds every project under a directory (stopping at repository
+boundaries, skipping vendored trees) and prints one row per project with its
+extension counts, token total and validation errors.
 
 Exit codes:
     0 - Success
+    2 - Usage error
 """
 
 import argparse
+import fnmatch
+import hashlib
 import json
 import os
+import re
+import sqlite3
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from frontmatter_parser import Frontmatter, parse_frontmatter
+from inventory import Inventory, get_inventory
+from roots import Root, discover_roots, parse_root
+from tokenizer import CHARS_PER_TOKEN, DEFAULT_ESTIMATOR, ESTIMATORS, count_tokens
+from validate_extension import VALIDATORS, load_cache, tally_validation, validate_roots
+from workspace import (
+    Project, ProjectRollup, find_projects, print_rollup, rollup_projects, rollup_to_dict,
+    workspace_from_args,
+)
+
+SCRIPT_DIR = Path(__file__).parent
+TOOLKIT_ROOT = SCRIPT_DIR.parent
 CLAUDE_DIR = Path.home() / ".claude"
+INDEX_PATH = TOOLKIT_ROOT / "data" / "cache" / "extension-index.sqlite"
+
+# Bump when the index schema or the way rows are derived changes
+INDEX_VERSION = 2
 
-CHARS_PER_TOKEN = 4
+# Token estimator for report entries (see tokenizer.ESTIMATORS); see set_estimator()
+ESTIMATOR = DEFAULT_ESTIMATOR
 
 
 @dataclass
@@ -43,8 +89,11 @@ class Extension:
     chars: int = 0
     files: int = 1
     modified: str = ""
-    source: str = ""  # "claude" or "ai"
+    source: str = ""  # "claude", or the root's scope in multi-root reports
     issues: List[str] = field(default_factory=list)
+    shadowed_by: str = ""  # Path of the higher-priority extension with the same name
+    namespace: str = ""  # Plugin name for components of plugin roots (plugin:name)
+    chars_tokens: int = 0  # chars/4 estimate of the same files, for comparison
 
 
 @dataclass
@@ -57,6 +106,7 @@ class Report:
     plugins: List[Extension] = field(default_factory=list)
     hooks: List[Extension] = field(default_factory=list)
     claude_md: List[Extension] = field(default_factory=list)
+    roots: List[Root] = field(default_factory=list)
 
     @property
     def total_extensions(self) -> int:
@@ -66,39 +116,17 @@ class Report:
     @property
     def total_tokens(self) -> int:
         all_ext = self.skills + self.agents + self.commands + self.plugins
-        return sum(e.tokens for e in all_ext)
-
-
-def get_mtime(path: Path) -> str:
-    """Get modification time as ISO string."""
-    try:
-        mtime = path.stat().st_mtime
-        return datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
-    except Exception:
-        return "unknown"
-
-
-def count_tokens(path: Path) -> int:
-    """Count tokens in a file."""
-    try:
-        return len(path.read_text()) // CHARS_PER_TOKEN
-    except Exception:
-        return 0
+        # Shadowed extensions are never loaded
+        return sum(e.tokens for e in all_ext if not e.shadowed_by)
 
+    @property
+    def total_chars_tokens(self) -> int:
+        all_ext = self.skills + self.agents + self.commands + self.plugins
+        return sum(e.chars_tokens for e in all_ext if not e.shadowed_by)
 
-def parse_frontmatter_name(path: Path) -> Optional[str]:
-    """Extract name from frontmatter."""
-    try:
-        content = path.read_text()
-        if content.startswith("---"):
-            parts = content.split("---", 2)
-            if len(parts) >= 2:
-                for line in parts[1].split("\n"):
-                    if line.startswith("name:"):
-                        return line.split(":", 1)[1].strip().strip("\"'")
-    except Exception:
-        pass
-    return None
+    @property
+    def shadowed(self) -> List[Extension]:
+        return [e for e in self.skills + self.agents + self.commands if e.shadowed_by]
 
 
 def classify_skill_subtype(content: str) -> str:
@@ -115,259 +143,908 @@ def classify_skill_subtype(content: str) -> str:
         return "utility"
 
 
-def scan_skills(base_dir: Path, source: str) -> List[Extension]:
-    """Scan for skills."""
-    skills = []
+@dataclass
+class FileRecord:
+    """Everything the report needs from one file, from a single read.
+
+    The stat comes from the inventory walk; the content is read once, and
+    only the derived fields are kept.
+    """
+    path: Path
+    stat_key: Tuple[int, int]
+    mtime: float
+    chars: int
+    sha256: str
+    tokens: int
+    estimator: str
+    frontmatter: Optional[Frontmatter] = None
+    json_data: Any = None
+    subtype: str = ""
 
-    for skill_md in base_dir.rglob("SKILL.md"):
-        skill_dir = skill_md.parent
-        name = parse_frontmatter_name(skill_md) or skill_dir.name
+    @property
+    def chars_tokens(self) -> int:
+        return self.chars // CHARS_PER_TOKEN
+
+    @property
+    def modified(self) -> str:
+        return datetime.fromtimestamp(self.mtime).strftime("%Y-%m-%d %H:%M")
+
+    @property
+    def name(self) -> Optional[str]:
+        """Frontmatter name for markdown, the "name" key for JSON manifests."""
+        if self.frontmatter is not None:
+            return self.frontmatter.scalar("name") or None
+        if isinstance(self.json_data, dict):
+            return self.json_data.get("name")
+        return None
 
+
+_RECORDS: Dict[Path, FileRecord] = {}
+
+
+def set_estimator(estimator: str) -> None:
+    """Choose the token estimator for report entries built after this call."""
+    global ESTIMATOR
+    ESTIMATOR = estimator
+
+
+def load_record(path: Path, inventory: Inventory, data: Optional[bytes] = None) -> Optional[FileRecord]:
+    """Read path once per process (again only if its stat changes); None if unreadable.
+
+    data is the file's content when the caller has already read it.
+    """
+    st = inventory.stat(path)
+    if st is None:
+        return None
+    stat_key = (st.st_mtime_ns, st.st_size)
+    record = _RECORDS.get(path)
+    if record is not None and record.stat_key == stat_key and record.estimator == ESTIMATOR:
+        return record
+
+    try:
+        if data is None:
+            data = path.read_bytes()
+        content = data.decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    record = FileRecord(
+        path=path,
+        stat_key=stat_key,
+        mtime=st.st_mtime,
+        chars=len(content),
+        sha256=hashlib.sha256(data).hexdigest(),
+        tokens=count_tokens(content, ESTIMATOR),
+        estimator=ESTIMATOR,
+    )
+    if path.suffix == ".md":
+        record.frontmatter = parse_frontmatter(content)
+        if path.name == "SKILL.md":
+            record.subtype = classify_skill_subtype(content)
+    elif path.suffix == ".json":
         try:
-            content = skill_md.read_text()
-            chars = len(content)
-            tokens = chars // CHARS_PER_TOKEN
-            subtype = classify_skill_subtype(content)
-        except Exception:
-            chars = tokens = 0
-            subtype = "unknown"
-
-        # Count references
-        file_count = 1
-        refs_dir = skill_dir / "references"
-        if refs_dir.exists():
-            ref_files = list(refs_dir.glob("*.md"))
-            file_count += len(ref_files)
-            for ref in ref_files:
-                tokens += count_tokens(ref)
-
-        ext = Extension(
-            name=name,
-            path=str(skill_md),
-            extension_type="skill",
-            subtype=subtype,
-            tokens=tokens,
-            chars=chars,
-            files=file_count,
-            modified=get_mtime(skill_md),
-            source=source,
-        )
-        skills.append(ext)
+            record.json_data = json.loads(content)
+        except json.JSONDecodeError:
+            pass
+    _RECORDS[path] = record
+    return record
 
-    return skills
 
+def _tokens(path: Path, inventory: Inventory) -> int:
+    record = load_record(path, inventory)
+    return record.tokens if record else 0
 
-def scan_agents(base_dir: Path, source: str) -> List[Extension]:
-    """Scan for agents."""
-    agents = []
-    agents_dir = base_dir / "agents"
-
-    if not agents_dir.exists():
-        return agents
-
-    for agent_md in agents_dir.glob("*.md"):
-        name = parse_frontmatter_name(agent_md) or agent_md.stem
-        tokens = count_tokens(agent_md)
-
-        ext = Extension(
-            name=name,
-            path=str(agent_md),
-            extension_type="agent",
-            tokens=tokens,
-            modified=get_mtime(agent_md),
-            source=source,
-        )
-        agents.append(ext)
 
-    return agents
+def _chars_tokens(path: Path, inventory: Inventory) -> int:
+    record = load_record(path, inventory)
+    return record.chars_tokens if record else 0
 
 
-def scan_commands(base_dir: Path, source: str) -> List[Extension]:
-    """Scan for commands."""
-    commands = []
-    commands_dir = base_dir / "commands"
-
-    if not commands_dir.exists():
-        return commands
-
-    for cmd_md in commands_dir.glob("*.md"):
-        name = cmd_md.stem
-        tokens = count_tokens(cmd_md)
-
-        ext = Extension(
-            name=name,
-            path=str(cmd_md),
-            extension_type="command",
-            tokens=tokens,
-            modified=get_mtime(cmd_md),
-            source=source,
-        )
-        commands.append(ext)
+def _modified(path: Path, inventory: Inventory) -> str:
+    st = inventory.stat(path)
+    if st is None:
+        return "unknown"
+    return datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
 
-    return commands
 
+def build_skill(skill_md: Path, base_dir: Path, source: str,
+                inventory: Inventory) -> Optional[Extension]:
+    """Build the report entry for one skill."""
+    record = load_record(skill_md, inventory)
+    name = (record.name if record else None) or skill_md.parent.name
 
-def scan_plugins(base_dir: Path, source: str) -> List[Extension]:
-    """Scan for plugins."""
-    plugins = []
-    plugins_dir = base_dir / "plugins"
+    if record:
+        chars = record.chars
+        tokens = record.tokens
+        chars_tokens = record.chars_tokens
+        subtype = record.subtype
+    else:
+        chars = tokens = chars_tokens = 0
+        subtype = "unknown"
+
+    # Count references
+    ref_files = inventory.references_for(skill_md)
+    file_count = 1 + len(ref_files)
+    for ref in ref_files:
+        tokens += _tokens(ref, inventory)
+        chars_tokens += _chars_tokens(ref, inventory)
+
+    return Extension(
+        name=name,
+        path=str(skill_md),
+        extension_type="skill",
+        subtype=subtype,
+        tokens=tokens,
+        chars=chars,
+        files=file_count,
+        modified=_modified(skill_md, inventory),
+        source=source,
+        chars_tokens=chars_tokens,
+    )
 
-    if not plugins_dir.exists():
-        return plugins
 
-    for item in plugins_dir.iterdir():
-        if not item.is_dir():
-            continue
+def build_agent(agent_md: Path, base_dir: Path, source: str,
+                inventory: Inventory) -> Optional[Extension]:
+    """Build the report entry for one agent."""
+    record = load_record(agent_md, inventory)
+    return Extension(
+        name=(record.name if record else None) or agent_md.stem,
+        path=str(agent_md),
+        extension_type="agent",
+        tokens=record.tokens if record else 0,
+        modified=_modified(agent_md, inventory),
+        source=source,
+        chars_tokens=record.chars_tokens if record else 0,
+    )
 
-        plugin_json = item / ".claude-plugin" / "plugin.json"
-        if not plugin_json.exists():
-            continue
 
-        try:
-            with open(plugin_json) as f:
-                manifest = json.load(f)
-            name = manifest.get("name", item.name)
-        except Exception:
-            name = item.name
-
-        # Count all files and tokens
-        total_tokens = 0
-        file_count = 0
-
-        for md_file in item.rglob("*.md"):
-            total_tokens += count_tokens(md_file)
-            file_count += 1
-
-        for json_file in item.rglob("*.json"):
-            total_tokens += count_tokens(json_file)
-            file_count += 1
-
-        ext = Extension(
-            name=name,
-            path=str(item),
-            extension_type="plugin",
-            tokens=total_tokens,
-            files=file_count,
-            modified=get_mtime(plugin_json),
-            source=source,
-        )
-        plugins.append(ext)
+def build_command(cmd_md: Path, base_dir: Path, source: str,
+                  inventory: Inventory) -> Optional[Extension]:
+    """Build the report entry for one command."""
+    return Extension(
+        name=cmd_md.stem,
+        path=str(cmd_md),
+        extension_type="command",
+        tokens=_tokens(cmd_md, inventory),
+        modified=_modified(cmd_md, inventory),
+        source=source,
+        chars_tokens=_chars_tokens(cmd_md, inventory),
+    )
+
+
+def build_plugin(item: Path, base_dir: Path, source: str,
+                 inventory: Inventory) -> Optional[Extension]:
+    """Build the report entry for one plugin root; None without a manifest."""
+    plugin_json = item / ".claude-plugin" / "plugin.json"
+    if plugin_json not in inventory.files_in(plugin_json.parent, ".json"):
+        return None
+
+    manifest = load_record(plugin_json, inventory)
+    name = (manifest.name if manifest else None) or item.name
+
+    # Count all files and tokens
+    files = inventory.files_under(item, ".md") + inventory.files_under(item, ".json")
+    total_tokens = sum(_tokens(f, inventory) for f in files)
+
+    return Extension(
+        name=name,
+        path=str(item),
+        extension_type="plugin",
+        tokens=total_tokens,
+        files=len(files),
+        modified=_modified(plugin_json, inventory),
+        source=source,
+        chars_tokens=sum(_chars_tokens(f, inventory) for f in files),
+    )
+
+
+def build_settings_hooks(settings_json: Path, base_dir: Path, source: str,
+                         inventory: Inventory) -> Optional[Extension]:
+    """Build the report entry for hooks in settings.json; None if it has none."""
+    record = load_record(settings_json, inventory)
+    settings = record.json_data if record else None
+    if not isinstance(settings, dict) or "hooks" not in settings:
+        return None
+
+    try:
+        hook_count = sum(len(v) if isinstance(v, list) else 1
+                         for v in settings["hooks"].values())
+    except AttributeError:
+        return None
+    return Extension(
+        name="settings.json hooks",
+        path=str(settings_json),
+        extension_type="hooks",
+        subtype=f"{hook_count} hooks",
+        modified=_modified(settings_json, inventory),
+        source=source,
+    )
+
+
+def build_hookify_rule(rule: Path, base_dir: Path, source: str,
+                       inventory: Inventory) -> Optional[Extension]:
+    """Build the report entry for one hookify rule file."""
+    return Extension(
+        name=rule.stem,
+        path=str(rule),
+        extension_type="hooks",
+        subtype="hookify",
+        tokens=_tokens(rule, inventory),
+        modified=_modified(rule, inventory),
+        source=source,
+        chars_tokens=_chars_tokens(rule, inventory),
+    )
+
+
+def build_claude_md(claude_md: Path, base_dir: Path, source: str,
+                    inventory: Inventory) -> Optional[Extension]:
+    """Build the report entry for one CLAUDE.md file."""
+    # Determine scope
+    if claude_md.parent == base_dir:
+        scope = "global" if base_dir == CLAUDE_DIR else "source"
+    else:
+        scope = "nested"
+
+    return Extension(
+        name=str(claude_md.relative_to(base_dir)),
+        path=str(claude_md),
+        extension_type="claude_md",
+        subtype=scope,
+        tokens=_tokens(claude_md, inventory),
+        modified=_modified(claude_md, inventory),
+        source=source,
+        chars_tokens=_chars_tokens(claude_md, inventory),
+    )
 
-    return plugins
 
+def hookify_rules(base_dir: Path, inventory: Inventory) -> List[Path]:
+    return [p for p in inventory.files_in(base_dir, ".md")
+            if p.name.startswith("hookify.") and p.name.endswith(".local.md")]
 
-def scan_hooks(base_dir: Path, source: str) -> List[Extension]:
+
+def _build_all(targets: List[Path], builder, base_dir: Path, source: str,
+               inventory: Inventory) -> List[Extension]:
+    extensions = []
+    for target in targets:
+        ext = builder(target, base_dir, source, inventory)
+        if ext is not None:
+            extensions.append(ext)
+    return extensions
+
+
+def scan_skills(base_dir: Path, source: str,
+                inventory: Optional[Inventory] = None) -> List[Extension]:
+    """Scan for skills."""
+    if inventory is None:
+        inventory = get_inventory(base_dir)
+    return _build_all(inventory.skills, build_skill, base_dir, source, inventory)
+
+
+def scan_agents(base_dir: Path, source: str,
+                inventory: Optional[Inventory] = None) -> List[Extension]:
+    """Scan for agents."""
+    if inventory is None:
+        inventory = get_inventory(base_dir)
+    return _build_all(inventory.agents, build_agent, base_dir, source, inventory)
+
+
+def scan_commands(base_dir: Path, source: str,
+                  inventory: Optional[Inventory] = None) -> List[Extension]:
+    """Scan for commands."""
+    if inventory is None:
+        inventory = get_inventory(base_dir)
+    return _build_all(inventory.commands, build_command, base_dir, source, inventory)
+
+
+def scan_plugins(base_dir: Path, source: str,
+                 inventory: Optional[Inventory] = None) -> List[Extension]:
+    """Scan for plugins."""
+    if inventory is None:
+        inventory = get_inventory(base_dir)
+    return _build_all(inventory.plugins, build_plugin, base_dir, source, inventory)
+
+
+def scan_hooks(base_dir: Path, source: str,
+               inventory: Optional[Inventory] = None) -> List[Extension]:
     """Scan for hooks configuration."""
-    hooks = []
+    if inventory is None:
+        inventory = get_inventory(base_dir)
 
-    settings_json = base_dir / "settings.json"
-    if settings_json.exists():
-        try:
-            with open(settings_json) as f:
-                settings = json.load(f)
-
-            if "hooks" in settings:
-                hook_count = sum(len(v) if isinstance(v, list) else 1
-                                 for v in settings["hooks"].values())
-                ext = Extension(
-                    name="settings.json hooks",
-                    path=str(settings_json),
-                    extension_type="hooks",
-                    subtype=f"{hook_count} hooks",
-                    modified=get_mtime(settings_json),
-                    source=source,
-                )
-                hooks.append(ext)
-        except Exception:
-            pass
+    hooks = []
+    if inventory.settings:
+        hooks.extend(_build_all([inventory.settings], build_settings_hooks,
+                                base_dir, source, inventory))
 
     # Check for hookify rules
-    hookify_rules = list(base_dir.glob("hookify.*.local.md"))
-    for rule in hookify_rules:
-        ext = Extension(
-            name=rule.stem,
-            path=str(rule),
-            extension_type="hooks",
-            subtype="hookify",
-            tokens=count_tokens(rule),
-            modified=get_mtime(rule),
-            source=source,
-        )
-        hooks.append(ext)
-
+    hooks.extend(_build_all(hookify_rules(base_dir, inventory), build_hookify_rule,
+                            base_dir, source, inventory))
     return hooks
 
 
-def scan_claude_md(base_dir: Path, source: str) -> List[Extension]:
+def scan_claude_md(base_dir: Path, source: str,
+                   inventory: Optional[Inventory] = None) -> List[Extension]:
     """Scan for CLAUDE.md files."""
-    claude_mds = []
+    if inventory is None:
+        inventory = get_inventory(base_dir)
+    # Skip if in plugins
+    targets = [p for p in inventory.claude_md if "plugins" not in str(p)]
+    return _build_all(targets, build_claude_md, base_dir, source, inventory)
+
+
+# Persistent index
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    chars INTEGER NOT NULL,
+    tokens INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS extensions (
+    path TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    subtype TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    chars_tokens INTEGER NOT NULL,
+    chars INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    modified TEXT NOT NULL,
+    source TEXT NOT NULL,
+    frontmatter TEXT NOT NULL,
+    issues TEXT NOT NULL,
+    error_count INTEGER NOT NULL,
+    warning_count INTEGER NOT NULL,
+    deps TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS extension_files (
+    extension TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (extension, file)
+);
+CREATE INDEX IF NOT EXISTS extensions_type ON extensions(type);
+CREATE INDEX IF NOT EXISTS extension_files_file ON extension_files(file);
+"""
 
-    for claude_md in base_dir.rglob("CLAUDE.md"):
-        # Skip if in plugins
-        if "plugins" in str(claude_md):
-            continue
+# Report type -> validate_extension.VALIDATORS key; hookify rules are not validated
+VALIDATOR_KEYS = {
+    "skill": "skills",
+    "agent": "agents",
+    "command": "commands",
+    "plugin": "plugins",
+}
 
-        tokens = count_tokens(claude_md)
+TYPE_ALIASES = {
+    "skills": "skill", "agents": "agent", "commands": "command",
+    "plugins": "plugin", "hook": "hooks",
+}
 
-        # Determine scope
-        if claude_md.parent == base_dir:
-            scope = "global" if base_dir == CLAUDE_DIR else "source"
-        else:
-            scope = "nested"
-
-        ext = Extension(
-            name=str(claude_md.relative_to(base_dir)),
-            path=str(claude_md),
-            extension_type="claude_md",
-            subtype=scope,
-            tokens=tokens,
-            modified=get_mtime(claude_md),
-            source=source,
+DURATION_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)([smhdw]?)$")
+DURATION_SECONDS = {"": 86400, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+Builder = Callable[[Path, Path, str, Inventory], Optional[Extension]]
+
+
+@dataclass
+class IndexTarget:
+    """An extension to index: how to build it and which files it is built from."""
+    path: Path
+    builder: Builder
+    deps: List[Path]
+    validator: Optional[str] = None
+
+
+@dataclass
+class RefreshStats:
+    """What an index refresh did."""
+    extensions: int = 0
+    files: int = 0
+    files_read: int = 0
+    files_touched: int = 0  # Stat changed but content hash did not
+    rebuilt: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+
+def index_targets(base_dir: Path, inventory: Inventory) -> List[IndexTarget]:
+    """Every extension under base_dir with the files its report entry depends on."""
+    targets = []
+    for skill_md in inventory.skills:
+        deps = [skill_md] + inventory.references_for(skill_md)
+        targets.append(IndexTarget(skill_md, build_skill, deps, "skills"))
+    for agent_md in inventory.agents:
+        targets.append(IndexTarget(agent_md, build_agent, [agent_md], "agents"))
+    for cmd_md in inventory.commands:
+        targets.append(IndexTarget(cmd_md, build_command, [cmd_md], "commands"))
+    for item in inventory.plugins:
+        deps = inventory.files_under(item, ".md") + inventory.files_under(item, ".json")
+        targets.append(IndexTarget(item, build_plugin, deps, "plugins"))
+    if inventory.settings:
+        targets.append(IndexTarget(inventory.settings, build_settings_hooks,
+                                   [inventory.settings], "hooks"))
+    for rule in hookify_rules(base_dir, inventory):
+        targets.append(IndexTarget(rule, build_hookify_rule, [rule]))
+    for claude_md in inventory.claude_md:
+        if "plugins" not in str(claude_md):
+            targets.append(IndexTarget(claude_md, build_claude_md, [claude_md]))
+    return targets
+
+
+def open_index(path: Path = INDEX_PATH) -> sqlite3.Connection:
+    """Open (creating or resetting as needed) the extension index."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(INDEX_SCHEMA)
+    # Token columns depend on the estimator, so switching it rebuilds the index too
+    version = f"{INDEX_VERSION}:{ESTIMATOR}"
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if row is None or row["value"] != version:
+        conn.executescript(
+            "DELETE FROM files; DELETE FROM extensions; DELETE FROM extension_files;"
+        )
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+        conn.commit()
+    return conn
+
+
+def _frontmatter_fields(record: Optional[FileRecord]) -> Dict[str, Any]:
+    if record is None or record.frontmatter is None:
+        return {}
+    return record.frontmatter.fields
+
+
+def _findings(target: IndexTarget) -> Tuple[List[str], int, int]:
+    if target.validator is None:
+        return [], 0, 0
+    result = VALIDATORS[target.validator](target.path)
+    issues = [f"ERROR: {e}" for e in result.errors] + [f"WARN: {w}" for w in result.warnings]
+    return issues, len(result.errors), len(result.warnings)
+
+
+def refresh_index(conn: sqlite3.Connection, base_dir: Path, source: str = "claude") -> RefreshStats:
+    """Bring the index up to date with base_dir, re-reading only changed files.
+
+    A file whose stat changed but whose content hash did not (touched, or
+    rewritten unchanged) only has its stat updated; extensions built from it
+    are not rebuilt.
+    """
+    started = time.perf_counter()
+    stats = RefreshStats()
+    inventory = get_inventory(base_dir, refresh=True)
+    targets = index_targets(base_dir, inventory)
+
+    known_files = {
+        row["path"]: ((row["mtime_ns"], row["size"]), row["sha256"])
+        for row in conn.execute("SELECT path, mtime_ns, size, sha256 FROM files")
+    }
+    known_deps = {
+        row["path"]: row["deps"]
+        for row in conn.execute("SELECT path, deps FROM extensions")
+    }
+
+    # Stat every dependency; re-read and re-hash only those whose stat
+    # changed, and re-derive only those whose hash changed too
+    changed = set()
+    touched = set()
+    seen = set()
+    for target in targets:
+        for dep in target.deps:
+            key = str(dep)
+            if key in seen:
+                continue
+            seen.add(key)
+            st = inventory.stat(dep)
+            if st is None:
+                changed.add(key)
+                conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                continue
+            known = known_files.get(key)
+            if known is not None and known[0] == (st.st_mtime_ns, st.st_size):
+                continue
+            try:
+                data = dep.read_bytes()
+            except OSError:
+                changed.add(key)
+                conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                continue
+            stats.files_read += 1
+            if known is not None and known[1] == hashlib.sha256(data).hexdigest():
+                conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                             (st.st_mtime_ns, st.st_size, key))
+                touched.add(key)
+                stats.files_touched += 1
+                continue
+            changed.add(key)
+            record = load_record(dep, inventory, data)
+            if record is None:
+                # Not UTF-8: drop the old row's hash, but remember this stat so
+                # the file is not re-read until it changes again
+                conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, 0, 0)",
+                    (key, st.st_mtime_ns, st.st_size, hashlib.sha256(data).hexdigest()),
+                )
+                continue
+            conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (key, st.st_mtime_ns, st.st_size, record.sha256, record.chars, record.tokens),
+            )
+
+    now = time.time()
+    live = set()
+    for target in targets:
+        key = str(target.path)
+        deps = json.dumps(sorted(str(d) for d in target.deps))
+        if key in known_deps and known_deps[key] == deps and not any(
+            str(d) in changed for d in target.deps
+        ):
+            live.add(key)
+            mtime_path = target.path / ".claude-plugin" / "plugin.json" \
+                if target.builder is build_plugin else target.path
+            if str(mtime_path) in touched:
+                # Content unchanged, but keep the modification time current
+                st = inventory.stat(mtime_path)
+                conn.execute("UPDATE extensions SET mtime = ?, modified = ? WHERE path = ?",
+                             (st.st_mtime if st else 0.0, _modified(mtime_path, inventory), key))
+            continue
+
+        ext = target.builder(target.path, base_dir, source, inventory)
+        conn.execute("DELETE FROM extension_files WHERE extension = ?", (key,))
+        if ext is None:
+            conn.execute("DELETE FROM extensions WHERE path = ?", (key,))
+            continue
+        live.add(key)
+        issues, error_count, warning_count = _findings(target)
+        mtime_path = target.path / ".claude-plugin" / "plugin.json" \
+            if ext.extension_type == "plugin" else target.path
+        st = inventory.stat(mtime_path)
+        mtime = st.st_mtime if st else 0.0
+        conn.execute(
+            "INSERT OR REPLACE INTO extensions VALUES "
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, ext.extension_type, ext.name, ext.subtype, ext.tokens, ext.chars_tokens, ext.chars,
+             ext.files, mtime, ext.modified, ext.source,
+             json.dumps(_frontmatter_fields(load_record(target.path, inventory)), default=str),
+             json.dumps(issues),
+             error_count, warning_count, deps, now),
         )
-        claude_mds.append(ext)
+        conn.executemany("INSERT OR IGNORE INTO extension_files VALUES (?, ?)",
+                         [(key, str(d)) for d in target.deps])
+        stats.rebuilt += 1
+
+    for key in set(known_deps) - live:
+        conn.execute("DELETE FROM extensions WHERE path = ?", (key,))
+        conn.execute("DELETE FROM extension_files WHERE extension = ?", (key,))
+        stats.removed += 1
+    for key in set(known_files) - seen:
+        conn.execute("DELETE FROM files WHERE path = ?", (key,))
+
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('base_dir', ?)", (str(base_dir),))
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)",
+                 (datetime.now().isoformat(),))
+    conn.commit()
+
+    stats.extensions = len(live)
+    stats.files = len(seen)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def row_to_extension(row: sqlite3.Row) -> Extension:
+    return Extension(
+        name=row["name"],
+        path=row["path"],
+        extension_type=row["type"],
+        subtype=row["subtype"],
+        tokens=row["tokens"],
+        chars=row["chars"],
+        files=row["files"],
+        modified=row["modified"],
+        source=row["source"],
+        issues=json.loads(row["issues"]),
+        chars_tokens=row["chars_tokens"],
+    )
+
+
+def parse_duration(text: str) -> float:
+    """Seconds in a duration like 7d, 12h, 30m or 2w; a bare number means days."""
+    match = DURATION_PATTERN.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid duration '{text}' (expected e.g. 7d, 12h, 2w)")
+    return float(match.group(1)) * DURATION_SECONDS[match.group(2)]
+
+
+def query_index(
+    conn: sqlite3.Connection,
+    ext_type: Optional[str] = None,
+    name: Optional[str] = None,
+    min_tokens: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    modified_within: Optional[float] = None,
+    has_issues: bool = False,
+    fields: Optional[Dict[str, str]] = None,
+    sort: str = "tokens",
+    limit: Optional[int] = None,
+) -> List[sqlite3.Row]:
+    """Filter indexed extensions; fields match frontmatter values case-insensitively."""
+    clauses = []
+    params: List[Any] = []
+    if ext_type:
+        clauses.append("type = ?")
+        params.append(TYPE_ALIASES.get(ext_type, ext_type))
+    if min_tokens is not None:
+        clauses.append("tokens >= ?")
+        params.append(min_tokens)
+    if max_tokens is not None:
+        clauses.append("tokens <= ?")
+        params.append(max_tokens)
+    if modified_within is not None:
+        clauses.append("mtime >= ?")
+        params.append(time.time() - modified_within)
+    if has_issues:
+        clauses.append("error_count + warning_count > 0")
+
+    order = {"tokens": "tokens DESC", "modified": "mtime DESC", "name": "name"}[sort]
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(f"SELECT * FROM extensions {where} ORDER BY {order}, path", params)
+
+    result = []
+    for row in rows:
+        if name and not fnmatch.fnmatch(row["name"].lower(), name.lower()):
+            continue
+        if fields:
+            frontmatter = json.loads(row["frontmatter"])
+            if any(str(frontmatter.get(k, "")).lower() != v.lower() for k, v in fields.items()):
+                continue
+        result.append(row)
+        if limit and len(result) >= limit:
+            break
+    return result
+
+
+def print_query_rows(rows: List[sqlite3.Row]):
+    print(f"{'Type':<10} {'Name':<30} {'Tokens':>8} {'Issues':>6} {'Modified':<16}")
+    print("-" * 74)
+    for row in rows:
+        issues = row["error_count"] + row["warning_count"]
+        print(f"{row['type']:<10} {row['name'][:30]:<30} {row['tokens']:>8} "
+              f"{issues:>6} {row['modified']:<16}")
+    print(f"\n{len(rows)} extensions")
+
+
+def query_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "name": row["name"],
+        "path": row["path"],
+        "type": row["type"],
+        "subtype": row["subtype"],
+        "tokens": row["tokens"],
+        "chars_tokens": row["chars_tokens"],
+        "chars": row["chars"],
+        "files": row["files"],
+        "modified": row["modified"],
+        "source": row["source"],
+        "frontmatter": json.loads(row["frontmatter"]),
+        "issues": json.loads(row["issues"]),
+    }
+
+
+def run_sql(path: Path, sql: str, as_json: bool):
+    """Run ad-hoc read-only SQL against the index."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(sql).fetchall()
+    except sqlite3.Error as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        conn.close()
+    if as_json:
+        print(json.dumps([dict(r) for r in rows], indent=2))
+        return
+    if rows:
+        print("\t".join(rows[0].keys()))
+    for row in rows:
+        print("\t".join(str(v) for v in row))
+
+
+def query_main(args):
+    """The `query` subcommand: refresh the index, then filter it."""
+    try:
+        modified_within = parse_duration(args.modified_within) if args.modified_within else None
+        fields = {}
+        for item in args.field:
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"Expected KEY=VALUE, got '{item}'")
+            fields[key] = value
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    conn = open_index()
+    if not args.no_refresh:
+        refresh_index(conn, CLAUDE_DIR)
+
+    if args.sql:
+        conn.close()
+        run_sql(INDEX_PATH, args.sql, args.json)
+        return
+
+    rows = query_index(
+        conn, args.type, args.name, args.min_tokens, args.max_tokens,
+        modified_within, args.has_issues, fields, args.sort, args.limit,
+    )
+    if args.json:
+        print(json.dumps([query_row_to_dict(r) for r in rows], indent=2))
+    else:
+        print_query_rows(rows)
+    conn.close()
+
+
+def report_from_index(conn: sqlite3.Connection) -> Report:
+    """Build a Report from indexed rows, in the same order a full scan produces."""
+    report = Report(generated_at=datetime.now().isoformat())
+    sections = {
+        "skill": report.skills, "agent": report.agents, "command": report.commands,
+        "plugin": report.plugins, "hooks": report.hooks, "claude_md": report.claude_md,
+    }
+    rows = {row["path"]: row for row in conn.execute("SELECT * FROM extensions")}
+    order = index_targets(CLAUDE_DIR, get_inventory(CLAUDE_DIR))
+    for target in order:
+        row = rows.get(str(target.path))
+        if row is not None:
+            sections[row["type"]].append(row_to_extension(row))
+    return report
+
+
+# Extension types where a same-named definition in a lower scope is hidden
+SHADOWING_SECTIONS = ("skills", "agents", "commands")
+
+REPORT_SECTIONS = ("skills", "agents", "commands", "plugins", "hooks", "claude_md")
+
+
+def scan_root(base_dir: Path, source: str) -> Dict[str, List[Extension]]:
+    """Scan one root with a single shared tree walk; returns extensions by section."""
+    inventory = get_inventory(base_dir)
+    return {
+        "skills": scan_skills(base_dir, source, inventory),
+        "agents": scan_agents(base_dir, source, inventory),
+        "commands": scan_commands(base_dir, source, inventory),
+        "plugins": scan_plugins(base_dir, source, inventory),
+        "hooks": scan_hooks(base_dir, source, inventory),
+        "claude_md": scan_claude_md(base_dir, source, inventory),
+    }
+
+
+def mark_shadowed(extensions: List[Extension], ranks: Dict[str, int]) -> None:
+    """Mark extensions whose name a higher-priority scope already defines.
+
+    extensions are in root precedence order; ranks maps source to priority.
+    Plugin components are matched as plugin:name. Duplicates within one
+    scope are left alone.
+    """
+    winners: Dict[str, Extension] = {}
+    for ext in extensions:
+        key = f"{ext.namespace}:{ext.name}" if ext.namespace else ext.name
+        winner = winners.get(key)
+        if winner is None:
+            winners[key] = ext
+        elif ranks[ext.source] > ranks[winner.source]:
+            ext.shadowed_by = winner.path
 
-    return claude_mds
 
+def generate_report(roots: Optional[List[Root]] = None, jobs: int = 4) -> Report:
+    """Generate a full extension report for ~/.claude, or for several roots.
 
-def generate_report() -> Report:
-    """Generate a full extension report."""
+    Roots are scanned concurrently in a thread pool (scanning is I/O bound)
+    and merged in precedence order, so output does not depend on which
+    scan finishes first.
+    """
     report = Report(
         generated_at=datetime.now().isoformat(),
     )
 
-    # Scan ~/.claude
-    report.skills.extend(scan_skills(CLAUDE_DIR, "claude"))
-    report.agents.extend(scan_agents(CLAUDE_DIR, "claude"))
-    report.commands.extend(scan_commands(CLAUDE_DIR, "claude"))
-    report.plugins.extend(scan_plugins(CLAUDE_DIR, "claude"))
-    report.hooks.extend(scan_hooks(CLAUDE_DIR, "claude"))
-    report.claude_md.extend(scan_claude_md(CLAUDE_DIR, "claude"))
+    if not roots:
+        # Scan ~/.claude (one tree walk shared by every scanner)
+        sections = scan_root(CLAUDE_DIR, "claude")
+        for name in REPORT_SECTIONS:
+            getattr(report, name).extend(sections[name])
+        return report
+
+    report.roots = sorted(roots, key=lambda r: r.rank)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        scanned = list(pool.map(lambda r: scan_root(r.path, r.scope), report.roots))
+
+    for root, sections in zip(report.roots, scanned):
+        namespace = root.namespace
+        for name in REPORT_SECTIONS:
+            for ext in sections[name]:
+                ext.namespace = namespace
+            getattr(report, name).extend(sections[name])
+
+    ranks = {r.scope: r.rank for r in report.roots}
+    for name in SHADOWING_SECTIONS:
+        mark_shadowed(getattr(report, name), ranks)
 
     return report
 
 
-def print_table(title: str, extensions: List[Extension], show_tokens: bool = True):
+def project_rollup(project: Project) -> ProjectRollup:
+    """Extension counts and token total for one workspace project."""
+    rollup = ProjectRollup(str(project.root))
+    if project.claude_dir is not None:
+        sections = scan_root(project.claude_dir, "project")
+        rollup.counts = {name: len(sections[name]) for name in REPORT_SECTIONS}
+        # Same sections as Report.total_tokens
+        rollup.tokens = sum(e.tokens for name in ("skills", "agents", "commands", "plugins")
+                            for e in sections[name])
+    if project.claude_md is not None:
+        rollup.counts["claude_md"] = rollup.counts.get("claude_md", 0) + 1
+    return rollup
+
+
+def workspace_report(workspace: Path, jobs: int = 4, use_cache: bool = True) -> List[ProjectRollup]:
+    """Roll up every project under workspace.
+
+    Projects are scanned in a thread pool; validation of all projects runs
+    as one batch through the validation cache and a process pool.
+    """
+    projects = find_projects(workspace, jobs)
+    rollups = rollup_projects(projects, project_rollup, jobs)
+
+    validated = [(r, p.claude_dir) for r, p in zip(rollups, projects) if p.claude_dir is not None]
+    cache = load_cache() if use_cache else None
+    results = validate_roots([d for _, d in validated], cache=cache, jobs=jobs)
+    for (rollup, _), project_results in zip(validated, results):
+        tally_validation(rollup, project_results)
+    if cache and cache.misses:
+        cache.save()
+    return rollups
+
+
+def print_table(title: str, extensions: List[Extension], show_tokens: bool = True,
+                show_source: bool = False):
     """Print a formatted table of extensions."""
     if not extensions:
         return
 
+    width = 74 if show_source else 60
     print(f"\n## {title} ({len(extensions)})")
-    print("-" * 60)
+    print("-" * width)
+
+    source_header = f"{'Source':<13} " if show_source else ""
+
+    def source_column(ext: Extension) -> str:
+        return f"{ext.source[:13]:<13} " if show_source else ""
+
+    def display_name(ext: Extension, limit: int) -> str:
+        subtype = f" [{ext.subtype}]" if ext.subtype else ""
+        shadowed = " (shadowed)" if ext.shadowed_by else ""
+        name = f"{ext.name}{subtype}"[:limit - len(shadowed)]
+        return name + shadowed
 
     if show_tokens:
-        print(f"{'Name':<30} {'Tokens':>8} {'Files':>6} {'Modified':<16}")
-        print("-" * 60)
+        print(f"{source_header}{'Name':<30} {'Tokens':>8} {'Files':>6} {'Modified':<16}")
+        print("-" * width)
         for ext in sorted(extensions, key=lambda x: -x.tokens):
-            subtype = f" [{ext.subtype}]" if ext.subtype else ""
-            name = f"{ext.name}{subtype}"[:30]
-            print(f"{name:<30} {ext.tokens:>8} {ext.files:>6} {ext.modified:<16}")
+            name = display_name(ext, 30)
+            print(f"{source_column(ext)}{name:<30} {ext.tokens:>8} {ext.files:>6} {ext.modified:<16}")
     else:
-        print(f"{'Name':<40} {'Modified':<16}")
-        print("-" * 60)
+        print(f"{source_header}{'Name':<40} {'Modified':<16}")
+        print("-" * width)
         for ext in extensions:
-            subtype = f" [{ext.subtype}]" if ext.subtype else ""
-            name = f"{ext.name}{subtype}"[:40]
-            print(f"{name:<40} {ext.modified:<16}")
+            name = display_name(ext, 40)
+            print(f"{source_column(ext)}{name:<40} {ext.modified:<16}")
 
 
 def print_report(report: Report, summary_only: bool = False):
@@ -377,8 +1054,16 @@ def print_report(report: Report, summary_only: bool = False):
     print(f"Generated: {report.generated_at}")
     print("=" * 60)
 
+    if report.roots:
+        print("\nRoots (highest priority first):")
+        for root in report.roots:
+            print(f"  {root.scope:<12} {root.path}")
+
     print(f"\nTotal Extensions: {report.total_extensions}")
-    print(f"Total Tokens: {report.total_tokens:,}")
+    if ESTIMATOR == "chars":
+        print(f"Total Tokens: {report.total_tokens:,}")
+    else:
+        print(f"Total Tokens: {report.total_tokens:,} (chars/4: {report.total_chars_tokens:,})")
 
     print(f"\n  Skills:   {len(report.skills):>3}")
     print(f"  Agents:   {len(report.agents):>3}")
@@ -386,16 +1071,26 @@ def print_report(report: Report, summary_only: bool = False):
     print(f"  Plugins:  {len(report.plugins):>3}")
     print(f"  Hooks:    {len(report.hooks):>3}")
     print(f"  CLAUDE.md:{len(report.claude_md):>3}")
+    if report.roots:
+        print(f"  Shadowed: {len(report.shadowed):>3}")
 
     if summary_only:
         return
 
-    print_table("Skills", report.skills)
-    print_table("Agents", report.agents)
-    print_table("Commands", report.commands)
-    print_table("Plugins", report.plugins)
-    print_table("Hooks", report.hooks, show_tokens=False)
-    print_table("CLAUDE.md Files", report.claude_md)
+    multi = bool(report.roots)
+    print_table("Skills", report.skills, show_source=multi)
+    print_table("Agents", report.agents, show_source=multi)
+    print_table("Commands", report.commands, show_source=multi)
+    print_table("Plugins", report.plugins, show_source=multi)
+    print_table("Hooks", report.hooks, show_tokens=False, show_source=multi)
+    print_table("CLAUDE.md Files", report.claude_md, show_source=multi)
+
+    if report.shadowed:
+        print(f"\n## Shadowed ({len(report.shadowed)})")
+        print("-" * 60)
+        for ext in report.shadowed:
+            print(f"  {ext.extension_type} {ext.name} ({ext.source}): {ext.path}")
+            print(f"    overridden by {ext.shadowed_by}")
 
     print("\n" + "=" * 60)
 
@@ -414,13 +1109,18 @@ def report_to_dict(report: Report) -> Dict[str, Any]:
             "modified": e.modified,
             "source": e.source,
             "issues": e.issues,
+            "shadowed_by": e.shadowed_by,
+            "namespace": e.namespace,
+            "chars_tokens": e.chars_tokens,
         }
 
-    return {
+    result = {
         "generated_at": report.generated_at,
         "summary": {
             "total_extensions": report.total_extensions,
             "total_tokens": report.total_tokens,
+            "total_chars_tokens": report.total_chars_tokens,
+            "estimator": ESTIMATOR,
             "skills": len(report.skills),
             "agents": len(report.agents),
             "commands": len(report.commands),
@@ -435,6 +1135,10 @@ def report_to_dict(report: Report) -> Dict[str, Any]:
         "hooks": [ext_to_dict(e) for e in report.hooks],
         "claude_md": [ext_to_dict(e) for e in report.claude_md],
     }
+    if report.roots:
+        result["roots"] = [{"scope": r.scope, "path": str(r.path)} for r in report.roots]
+        result["summary"]["shadowed"] = len(report.shadowed)
+    return result
 
 
 def main():
@@ -444,10 +1148,86 @@ def main():
                         help="Report on specific type only")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--markdown", action="store_true", help="Output as Markdown")
+    parser.add_argument("--index", action="store_true",
+                        help="Refresh the extension index incrementally and report from it")
+    parser.add_argument("--discover", action="store_true",
+                        help="Scan every discovered root: enterprise, user, project, plugins, marketplaces")
+    parser.add_argument("--root", action="append", default=[], metavar="SCOPE=PATH",
+                        help="Scan this root (repeatable); SCOPE is user, project, plugin, ...")
+    parser.add_argument("--project", help="Project directory for --discover (default: cwd)")
+    parser.add_argument("--jobs", "-j", type=int, default=4,
+                        help="Roots or projects scanned concurrently (default: 4)")
+    parser.add_argument("--workspace", metavar="DIR",
+                        help="Roll up every project .claude directory under DIR")
+    parser.add_argument("--estimator", choices=ESTIMATORS, default=DEFAULT_ESTIMATOR,
+                        help="Token estimator: the offline BPE tokenizer, calibrated ratios "
+                             f"or chars/4 (default: {DEFAULT_ESTIMATOR})")
+
+    subparsers = parser.add_subparsers(dest="command")
+    query_parser = subparsers.add_parser("query", help="Filter the extension index")
+    query_parser.add_argument("--type", help="Extension type (skill, agent, command, plugin, hooks, claude_md)")
+    query_parser.add_argument("--name", help="Name glob, e.g. 'git-*'")
+    query_parser.add_argument("--min-tokens", type=int, help="At least this many tokens")
+    query_parser.add_argument("--max-tokens", type=int, help="At most this many tokens")
+    query_parser.add_argument("--modified-within", metavar="DURATION",
+                              help="Modified within e.g. 7d, 12h, 2w")
+    query_parser.add_argument("--has-issues", action="store_true",
+                              help="Only extensions with validation errors or warnings")
+    query_parser.add_argument("--field", action="append", default=[], metavar="KEY=VALUE",
+                              help="Frontmatter field equals value (repeatable)")
+    query_parser.add_argument("--sort", choices=["tokens", "modified", "name"], default="tokens")
+    query_parser.add_argument("--limit", type=int, help="Maximum rows")
+    query_parser.add_argument("--sql", help="Run read-only SQL against the index instead")
+    query_parser.add_argument("--no-refresh", action="store_true",
+                              help="Query the index as it is, without rescanning")
+    query_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    query_parser.add_argument("--estimator", choices=ESTIMATORS, default=argparse.SUPPRESS,
+                              help=f"Token estimator (default: {DEFAULT_ESTIMATOR})")
 
     args = parser.parse_args()
+    set_estimator(args.estimator)
+
+    if args.command == "query":
+        query_main(args)
+        return
 
-    report = generate_report()
+    if args.workspace:
+        if args.index or args.root or args.discover:
+            print("Error: --workspace cannot be combined with --index, --root or --discover",
+                  file=sys.stderr)
+            sys.exit(2)
+        workspace = workspace_from_args(args.workspace)
+        rollups = workspace_report(workspace, args.jobs)
+        if args.json:
+            print(json.dumps({
+                "generated_at": datetime.now().isoformat(),
+                "workspace": str(workspace),
+                "projects": [rollup_to_dict(r) for r in rollups],
+            }, indent=2))
+        else:
+            print_rollup(workspace, rollups)
+        return
+
+    try:
+        roots = [parse_root(spec) for spec in args.root]
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    if args.discover:
+        project = Path(args.project) if args.project else None
+        known = {r.path.resolve() for r in roots}
+        roots.extend(r for r in discover_roots(project) if r.path.resolve() not in known)
+    if args.index and roots:
+        print("Error: --index covers ~/.claude only; drop --discover/--root", file=sys.stderr)
+        sys.exit(2)
+
+    if args.index:
+        conn = open_index()
+        refresh_index(conn, CLAUDE_DIR)
+        report = report_from_index(conn)
+        conn.close()
+    else:
+        report = generate_report(roots, args.jobs)
 
     if args.json:
         print(json.dumps(report_to_dict(report), indent=2))
@@ -461,7 +1241,7 @@ def main():
             "hooks": report.hooks,
             "claude_md": report.claude_md,
         }
-        print_table(args.type.title(), type_map[args.type])
+        print_table(args.type.title(), type_map[args.type], show_source=bool(report.roots))
     else:
         print_report(report, args.summary)
 
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Shared YAML frontmatter parser for Claude Code extension files.
+
+Locates the frontmatter block by offsets instead of splitting the whole file,
+so callers that only need header fields never copy the body. read_frontmatter()
+stops reading at the closing "---" line, so looking up a skill's name costs a
+few hundred bytes of I/O however long the skill is.
+
+Handles the YAML subset used in extension frontmatter:
+- key: value scalars, quoted strings, true/false
+- inline lists: allowed-tools: [Read, Grep, "Bash(git:*)"]
+- block lists: "- item" lines under a key
+- block scalars: description: | (literal) and description: > (folded)
+- plain scalars continued on more-indented lines
+- nested maps such as hooks: -> PreToolUse: -> list of matcher groups
+
+Keys with empty values and no nested block are treated as absent. Fields are
+parsed lazily on first access; Frontmatter.scalar() answers single top-level
+lookups such as "name" with a line scan instead.
+
+Usage:
+    python frontmatter_parser.py <file>        # Print parsed frontmatter as JSON
+    python frontmatter_parser.py <file> --spans  # Also print header/body offsets
+
+Exit codes:
+    0 - Frontmatter found
+    1 - No frontmatter
+    2 - Usage error
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DELIMITER = "---"
+
+# Refuse to scan further than this for a closing delimiter
+MAX_HEADER_CHARS = 64 * 1024
+READ_CHUNK = 4096
+
+BLOCK_SCALAR_INDICATORS = ("|", "|-", "|+", ">", ">-", ">+")
+
+
+@dataclass
+class Frontmatter:
+    """Frontmatter located in a source text, parsed on first use.
+
+    header_start/header_end delimit the YAML text between the delimiter lines;
+    body_start is the offset just past the closing delimiter line. Only the
+    header text is held; the body is never copied.
+    """
+    header: str
+    header_start: int = 0
+    header_end: int = 0
+    body_start: int = 0
+    _fields: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    @property
+    def fields(self) -> Dict[str, Any]:
+        if self._fields is None:
+            self._fields = parse_yaml_subset(self.header)
+        return self._fields
+
+    def scalar(self, key: str) -> Optional[str]:
+        """Look up a top-level one-line scalar without parsing the whole header.
+
+        Top-level keys are the only lines starting in column 0, so a line scan
+        is exact. Block scalars, nested values and plain scalars continued on
+        indented lines fall back to a full parse.
+        """
+        if self._fields is None:
+            prefix = key + ":"
+            lines = self.header.split("\n")
+            for i, line in enumerate(lines):
+                if line.startswith(prefix):
+                    value = line[len(prefix):].strip()
+                    following = lines[i + 1] if i + 1 < len(lines) else ""
+                    continued = following[:1] in (" ", "\t") and following.strip()
+                    if (value and not continued and value not in BLOCK_SCALAR_INDICATORS
+                            and value[0] not in "[{#"):
+                        parsed = _parse_scalar(value)
+                        return parsed if isinstance(parsed, str) else None
+                    break
+            else:
+                return None
+        value = self.fields.get(key)
+        return value if isinstance(value, str) else None
+
+    def body(self, content: str) -> str:
+        return content[self.body_start:]
+
+
+def find_frontmatter(content: str) -> Optional[Tuple[int, int, int]]:
+    """Return (header_start, header_end, body_start) offsets, or None.
+
+    The opening delimiter must be the first line and the closing delimiter
+    a line of its own, so "---" inside a value does not end the block.
+    """
+    if not content.startswith(DELIMITER):
+        return None
+
+    first_nl = content.find("\n")
+    if first_nl == -1 or content[len(DELIMITER):first_nl].strip():
+        return None
+
+    header_start = first_nl + 1
+    # Search from the newline before the header so an empty header matches
+    pos = first_nl
+    while True:
+        pos = content.find("\n" + DELIMITER, pos)
+        if pos == -1:
+            return None
+        line_start = pos + 1
+        nl = content.find("\n", line_start)
+        line_end = len(content) if nl == -1 else nl
+        if not content[line_start + len(DELIMITER):line_end].strip():
+            return header_start, line_start, line_end if nl == -1 else nl + 1
+        pos = line_start
+
+
+def parse_frontmatter(content: str) -> Optional[Frontmatter]:
+    """Locate frontmatter in already-loaded content without copying the body."""
+    spans = find_frontmatter(content)
+    if spans is None:
+        return None
+    header_start, header_end, body_start = spans
+    return Frontmatter(content[header_start:header_end], header_start, header_end, body_start)
+
+
+def read_frontmatter(path: Path, max_chars: int = MAX_HEADER_CHARS) -> Optional[Frontmatter]:
+    """Read only the frontmatter block of a file.
+
+    Reads READ_CHUNK characters at a time until the closing delimiter is in
+    view. Offsets are character offsets into the decoded file, so they can be
+    used against a later full read_text() of the same file.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read(READ_CHUNK)
+        if not text.startswith(DELIMITER):
+            return None
+        while True:
+            spans = find_frontmatter(text)
+            if spans is not None:
+                break
+            if len(text) >= max_chars:
+                return None
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return None
+            text += chunk
+
+    header_start, header_end, body_start = spans
+    return Frontmatter(text[header_start:header_end], header_start, header_end, body_start)
+
+
+# Parsed line table entries are (indent, stripped text); blank and comment
+# lines have indent -1 so structural scans skip them in one comparison.
+_Line = Tuple[int, str]
+
+
+def parse_yaml_subset(text: str) -> Dict[str, Any]:
+    """Parse the frontmatter YAML subset into a dict."""
+    raw = text.split("\n")
+    table: List[_Line] = []
+    flat = True
+    for line in raw:
+        stripped = line.strip()
+        if not stripped or stripped[0] == "#":
+            table.append((-1, stripped))
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        table.append((indent, stripped))
+        if indent or stripped[-1] in "|>:-+" or _is_list_item(stripped):
+            flat = False
+
+    if flat:
+        # Common case: one "key: value" per line, nothing nested
+        result: Dict[str, Any] = {}
+        for indent, stripped in table:
+            if indent == 0 and ":" in stripped:
+                key, _, rest = stripped.partition(":")
+                rest = rest.strip()
+                if rest and rest[0] != "#":
+                    result[_unquote(key.strip())] = _parse_scalar(rest)
+        return result
+
+    value, _ = _parse_mapping(raw, table, 0, 0)
+    return value
+
+
+def _next_content(table: List[_Line], i: int) -> int:
+    """Index of the next non-blank, non-comment line at or after i."""
+    n = len(table)
+    while i < n and table[i][0] < 0:
+        i += 1
+    return i
+
+
+def _is_list_item(text: str) -> bool:
+    return text[0] == "-" and (len(text) == 1 or text[1] == " ")
+
+
+def _parse_mapping(raw: List[str], table: List[_Line], i: int, indent: int) -> Tuple[Dict[str, Any], int]:
+    result: Dict[str, Any] = {}
+    n = len(table)
+    while True:
+        i = _next_content(table, i)
+        if i >= n:
+            break
+        line_indent, text = table[i]
+        if line_indent < indent:
+            break
+        if line_indent > indent or _is_list_item(text) or ":" not in text:
+            # Stray continuation line; nothing sensible to attach it to
+            i += 1
+            continue
+
+        key, _, rest = text.partition(":")
+        key = _unquote(key.strip())
+        rest = rest.strip()
+        i += 1
+
+        if rest in BLOCK_SCALAR_INDICATORS:
+            result[key], i = _parse_block_scalar(raw, table, i, line_indent, rest)
+        elif rest and rest[0] != "#":
+            result[key], i = _parse_plain_continuation(table, i, line_indent, rest)
+        else:
+            j = _next_content(table, i)
+            if j < n:
+                child_indent, child = table[j]
+                is_list = _is_list_item(child)
+                if child_indent > line_indent or (is_list and child_indent == line_indent):
+                    if is_list:
+                        result[key], i = _parse_list(raw, table, j, child_indent)
+                    else:
+                        result[key], i = _parse_mapping(raw, table, j, child_indent)
+    return result, i
+
+
+def _parse_list(raw: List[str], table: List[_Line], i: int, indent: int) -> Tuple[List[Any], int]:
+    items: List[Any] = []
+    n = len(table)
+    while True:
+        i = _next_content(table, i)
+        if i >= n:
+            break
+        line_indent, text = table[i]
+        if line_indent != indent or not _is_list_item(text):
+            break
+
+        item = text[1:].strip()
+        if item and _is_mapping_entry(item):
+            # "- key: value" starts a map; re-parse the line at the item's indent
+            table[i] = (indent + len(text) - len(item), item)
+            value, i = _parse_mapping(raw, table, i, table[i][0])
+            items.append(value)
+        elif item:
+            items.append(_parse_scalar(item))
+            i += 1
+        else:
+            j = _next_content(table, i + 1)
+            if j < n and table[j][0] > indent:
+                value, i = _parse_mapping(raw, table, j, table[j][0])
+            else:
+                value, i = None, i + 1
+            items.append(value)
+    return items, i
+
+
+def _parse_block_scalar(
+    raw: List[str], table: List[_Line], i: int, parent_indent: int, indicator: str
+) -> Tuple[str, int]:
+    block: List[str] = []
+    block_indent = None
+    n = len(table)
+    while i < n:
+        line = raw[i]
+        if not table[i][1]:
+            block.append("")
+            i += 1
+            continue
+        # Comment-looking lines are content inside a block scalar
+        line_indent = len(line) - len(line.lstrip(" "))
+        if line_indent <= parent_indent:
+            break
+        if block_indent is None:
+            block_indent = line_indent
+        block.append(line[min(block_indent, line_indent):].rstrip())
+        i += 1
+
+    while block and block[-1] == "":
+        block.pop()
+
+    if indicator[0] == ">":
+        text = _fold(block)
+    else:
+        text = "\n".join(block)
+    if not indicator.endswith("-"):
+        text += "\n"
+    return text, i
+
+
+def _fold(block: List[str]) -> str:
+    """Fold lines as YAML '>' does: single newlines become spaces."""
+    out = []
+    after_break = True
+    for line in block:
+        if line == "":
+            out.append("\n")
+            after_break = True
+            continue
+        if not after_break:
+            out.append(" ")
+        out.append(line)
+        after_break = False
+    return "".join(out)
+
+
+def _parse_plain_continuation(
+    table: List[_Line], i: int, parent_indent: int, first: str
+) -> Tuple[Any, int]:
+    if first[0] in "[{\"'":
+        return _parse_scalar(first), i
+
+    n = len(table)
+    if i >= n or table[i][0] <= parent_indent:
+        return _parse_scalar(first), i
+
+    parts = [first]
+    while i < n and table[i][0] > parent_indent:
+        parts.append(table[i][1])
+        i += 1
+    return _parse_scalar(" ".join(parts)), i
+
+
+def _is_mapping_entry(text: str) -> bool:
+    if text[0] in "\"'[{":
+        return False
+    key, sep, rest = text.partition(":")
+    return bool(sep) and (not rest or rest[0] == " ") and " " not in key.strip()
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _split_inline_list(inner: str) -> List[str]:
+    """Split an inline list on commas that are not inside quotes or brackets."""
+    if not any(ch in inner for ch in "\"'([{"):
+        return [item.strip() for item in inner.split(",") if item.strip()]
+
+    items = []
+    depth = 0
+    quote = None
+    current = []
+    for ch in inner:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            items.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    if "".join(current).strip():
+        items.append("".join(current).strip())
+    return items
+
+
+def _parse_scalar(value: str) -> Any:
+    first = value[0] if value else ""
+    if first == "[" and value.endswith("]"):
+        return [_parse_scalar(item) for item in _split_inline_list(value[1:-1])]
+    if first and first in "\"'":
+        end = value.find(first, 1)
+        if end != -1 and (end == len(value) - 1 or value[end + 1:].lstrip().startswith("#")):
+            return value[1:end]
+    if " #" in value:
+        value = value.split(" #", 1)[0].rstrip()
+    lowered = value.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse frontmatter from an extension file")
+    parser.add_argument("path", help="Markdown file to parse")
+    parser.add_argument("--spans", action="store_true", help="Include header/body offsets")
+
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not path.is_file():
+        print(f"Error: File not found: {path}", file=sys.stderr)
+        sys.exit(2)
+
+    fm = read_frontmatter(path)
+    if fm is None:
+        print("No frontmatter found", file=sys.stderr)
+        sys.exit(1)
+
+    output: Dict[str, Any] = {"fields": fm.fields}
+    if args.spans:
+        output["header_start"] = fm.header_start
+        output["header_end"] = fm.header_end
+        output["body_start"] = fm.body_start
+    print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
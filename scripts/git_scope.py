@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Restrict scans to extensions touched since a git revision.
+
+Runs `git diff --name-only <rev>` in the repository that contains the scan
+root, adds untracked files, and maps each changed path onto the extensions
+it belongs to: a file inside a skill directory (references/, scripts/,
+examples/) maps to that skill's SKILL.md, and any file inside a plugin maps
+to the plugin root. Deleted files are included, so removing a reference
+re-checks its skill.
+
+Usage:
+    python git_scope.py <rev> [path]   # List changed files and owning extensions
+
+Exit codes:
+    0 - Success
+    2 - Usage error or git failure
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Set
+
+from inventory import Inventory, get_inventory
+
+CLAUDE_DIR = Path.home() / ".claude"
+
+
+class GitScopeError(Exception):
+    """git is unavailable, the root is not in a repository, or rev is unknown."""
+
+
+@dataclass
+class ChangedScope:
+    """Changed files under a scan root and the extensions that own them."""
+    rev: str
+    files: Set[Path] = field(default_factory=set)
+    skills: Set[Path] = field(default_factory=set)
+    plugins: Set[Path] = field(default_factory=set)
+
+    def includes(self, path: Path) -> bool:
+        """True if path is a changed file or an extension owning one."""
+        return path in self.files or path in self.skills or path in self.plugins
+
+
+def _git(repo_dir: Path, *args: str) -> str:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(repo_dir), *args],
+            capture_output=True, text=True, check=False,
+        )
+    except OSError as e:
+        raise GitScopeError(f"Cannot run git: {e}")
+    if proc.returncode != 0:
+        raise GitScopeError(proc.stderr.strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def git_changed_files(base_dir: Path, rev: str) -> List[Path]:
+    """Paths changed between rev and the working tree, plus untracked files,
+    expressed under base_dir.
+
+    git reports paths relative to the real repository root; they are mapped
+    back through base_dir so they compare equal to inventory paths even when
+    base_dir is reached through a symlink. Paths outside base_dir are dropped.
+    """
+    toplevel = Path(_git(base_dir, "rev-parse", "--show-toplevel").strip())
+    output = _git(base_dir, "diff", "--name-only", "--no-renames", "-z", rev, "--")
+    # New files that have not been added yet are changes too
+    untracked = _git(toplevel, "ls-files", "--others", "--exclude-standard", "-z")
+
+    base_real = base_dir.resolve()
+    changed = []
+    for name in sorted(set(output.split("\0")) | set(untracked.split("\0"))):
+        if not name:
+            continue
+        real = Path(os.path.normpath(toplevel / name))
+        try:
+            rel = real.relative_to(base_real)
+        except ValueError:
+            continue
+        changed.append(base_dir / rel)
+    return changed
+
+
+def map_changed_files(
+    base_dir: Path, rev: str, changed: List[Path], inventory: Inventory
+) -> ChangedScope:
+    """Map changed files onto the skills and plugins that contain them."""
+    scope = ChangedScope(rev, set(changed))
+    skill_dirs = {p.parent for p in inventory.skills}
+    plugin_roots = set(inventory.plugin_roots)
+
+    for path in changed:
+        for ancestor in path.parents:
+            if ancestor in skill_dirs:
+                scope.skills.add(ancestor / "SKILL.md")
+            if ancestor in plugin_roots:
+                scope.plugins.add(ancestor)
+            if ancestor == base_dir:
+                break
+
+    return scope
+
+
+def changed_scope(base_dir: Path, rev: str) -> ChangedScope:
+    """Build the changed-since scope for base_dir, raising GitScopeError on git failure."""
+    changed = git_changed_files(base_dir, rev)
+    return map_changed_files(base_dir, rev, changed, get_inventory(base_dir))
+
+
+def scope_from_args(base_dir: Path, rev: str, exit_code: int = 2) -> ChangedScope:
+    """changed_scope() for CLI use: report git failures and exit with exit_code."""
+    try:
+        return changed_scope(base_dir, rev)
+    except GitScopeError as e:
+        print(f"Error: --changed-since {rev}: {e}", file=sys.stderr)
+        sys.exit(exit_code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show extensions changed since a git revision")
+    parser.add_argument("rev", help="Git revision to diff against (e.g. origin/main)")
+    parser.add_argument("path", nargs="?", help="Scan root (default: ~/.claude)")
+
+    args = parser.parse_args()
+
+    base_dir = Path(args.path) if args.path else CLAUDE_DIR
+    if not base_dir.is_dir():
+        print(f"Error: Not a directory: {base_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    scope = scope_from_args(base_dir, args.rev)
+
+    print(f"Changed since {args.rev}: {len(scope.files)} files")
+    for path in sorted(scope.files):
+        print(f"  {path}")
+    for label, paths in (("Skills", scope.skills), ("Plugins", scope.plugins)):
+        if paths:
+            print(f"{label}:")
+            for path in sorted(paths):
+                print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Benchmark the latency of configured command hooks.
+
+Finds every `type: command` hook in settings.json, settings.local.json and
+plugin hooks/hooks.json files, runs each one repeatedly with a synthetic
+stdin payload, and reports wall time, CPU time and peak RSS per hook and per
+event. Hooks whose p95 wall time exceeds the budget are flagged.
+
+Payloads are built from the JSON input schemas in references/hooks.md, with
+tool inputs replaced by harmless values (an `echo` command, a scratch file
+path) and the matcher's tool or source filled in, so the hook takes its
+real code path without acting on real data. Hooks still run for real:
+use --list first to see what would be executed.
+
+Usage:
+    python hook_bench.py                      # Benchmark hooks in ~/.claude
+    python hook_bench.py <path>               # Hooks under a directory or one hooks file
+    python hook_bench.py --list               # Show hooks and payloads, run nothing
+    python hook_bench.py --runs 20 --budget-ms 100
+    python hook_bench.py --event-budget PreToolUse=50 --event-budget Stop=500
+    python hook_bench.py --json
+
+Exit codes:
+    0 - All hooks within budget
+    1 - One or more hooks over budget
+    2 - Usage error
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from inventory import get_inventory
+from validate_extension import hook_matches, iter_hook_handlers, load_hook_events
+
+SCRIPT_DIR = Path(__file__).parent
+TOOLKIT_ROOT = SCRIPT_DIR.parent
+CLAUDE_DIR = Path.home() / ".claude"
+HOOKS_REFERENCE = TOOLKIT_ROOT / "references" / "hooks.md"
+
+DEFAULT_RUNS = 10
+DEFAULT_BUDGET_MS = 200.0
+DEFAULT_TIMEOUT_S = 60
+
+# Runs one hook and reports its own resource usage as JSON on stdout. Linux
+# carries ru_maxrss across fork and exec, so a hook forked from this (large)
+# process would report at least our peak RSS; forked from the small
+# launcher it inherits at most the launcher's, which is reported as the floor.
+# Wall time is also taken here, so the launcher's startup is not counted.
+LAUNCHER = r"""
+import json, os, resource, signal, sys, time
+command, timeout = sys.argv[1], float(sys.argv[2])
+try:
+    # Our own memory's high-water mark; ru_maxrss would include our parent's
+    with open("/proc/self/status") as f:
+        floor = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    floor = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+pid = os.fork()
+if pid == 0:
+    os.setpgid(0, 0)
+    null = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(null, 1)
+    os.dup2(null, 2)
+    os.execv("/bin/sh", ["sh", "-c", command])
+timed_out = []
+def kill(*_):
+    timed_out.append(True)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+signal.signal(signal.SIGALRM, kill)
+signal.setitimer(signal.ITIMER_REAL, timeout)
+_, status, usage = os.wait4(pid, 0)
+signal.setitimer(signal.ITIMER_REAL, 0)
+print(json.dumps({
+    "wall_ms": (time.perf_counter() - start) * 1000,
+    "cpu_ms": (usage.ru_utime + usage.ru_stime) * 1000,
+    "maxrss": usage.ru_maxrss,
+    "floor": floor,
+    "status": None if timed_out else os.waitstatus_to_exitcode(status),
+}))
+"""
+
+INPUT_SCHEMA_PATTERN = re.compile(r"^### (\w+) Input\s*\n+```json\n(.*?)```", re.M | re.S)
+COMMON_SCHEMA_PATTERN = re.compile(r"^### Common Fields.*?```json\n(.*?)```", re.M | re.S)
+
+# Harmless tool inputs used in place of the examples in hooks.md
+SAFE_TOOL_INPUTS = {
+    "Bash": {"command": "echo hook-bench", "description": "hook-bench probe"},
+    "Write": {"file_path": "{scratch}/hook-bench.txt", "content": "hook-bench\n"},
+    "Edit": {"file_path": "{scratch}/hook-bench.txt", "old_string": "a", "new_string": "b"},
+    "Read": {"file_path": "{scratch}/hook-bench.txt"},
+    "Glob": {"pattern": "*.md"},
+    "Grep": {"pattern": "hook-bench"},
+    "WebFetch": {"url": "https://example.com", "prompt": "hook-bench"},
+    "Agent": {"description": "hook-bench", "prompt": "hook-bench"},
+}
+
+# Payload field that carries the matcher value for non-tool events
+MATCHER_FIELDS = {
+    "SessionStart": "source",
+    "SessionEnd": "reason",
+    "PreCompact": "trigger",
+    "PostCompact": "trigger",
+    "Notification": "notification_type",
+    "SubagentStart": "agent_type",
+    "SubagentStop": "agent_type",
+    "ConfigChange": "config_type",
+    "Setup": "trigger",
+}
+
+TOOL_EVENTS = ("PreToolUse", "PostToolUse", "PostToolUseFailure", "PermissionRequest")
+
+
+@dataclass
+class CommandHook:
+    """A command hook found in a hooks configuration file."""
+    source: str
+    event: str
+    matcher: Optional[str]
+    command: str
+    timeout: int = DEFAULT_TIMEOUT_S
+    is_async: bool = False
+    plugin_root: Optional[str] = None
+
+
+@dataclass
+class HookTiming:
+    """Measurements for one hook across all runs."""
+    hook: CommandHook
+    wall_ms: List[float] = field(default_factory=list)
+    cpu_ms: List[float] = field(default_factory=list)
+    peak_rss_kb: int = 0
+    rss_floor_kb: int = 0  # Launcher's own peak RSS; hook values up to it are upper bounds
+    failures: int = 0
+    timeouts: int = 0
+    over_budget: bool = False
+    budget_ms: float = DEFAULT_BUDGET_MS
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # pct * n first, so exact ranks (p50 of 10 runs) are not nudged up by float error
+    rank = max(1, math.ceil(pct * len(ordered) / 100.0))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def load_input_schemas(path: Path = HOOKS_REFERENCE) -> Tuple[dict, Dict[str, dict]]:
+    """Parse the common and per-event stdin schemas from references/hooks.md."""
+    try:
+        text = path.read_text()
+    except OSError:
+        return {}, {}
+
+    common = {}
+    match = COMMON_SCHEMA_PATTERN.search(text)
+    if match:
+        try:
+            common = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            pass
+
+    schemas = {}
+    for event, block in INPUT_SCHEMA_PATTERN.findall(text):
+        try:
+            schemas[event] = json.loads(block)
+        except json.JSONDecodeError:
+            continue
+    return common, schemas
+
+
+def _matcher_value(matcher: Optional[str], candidates: List[str]) -> Optional[str]:
+    """Pick a value the matcher accepts, preferring known candidates."""
+    if not matcher or matcher == "*":
+        return candidates[0] if candidates else None
+    for candidate in candidates:
+        if hook_matches(matcher, candidate):
+            return candidate
+    # Fall back to the first literal alternative, e.g. "mcp__github__create_issue|Bash"
+    first = matcher.split("|")[0]
+    return first if re.fullmatch(r"[\w.-]+", first) else None
+
+
+def build_payload(hook: CommandHook, common: dict, schemas: Dict[str, dict], scratch: str) -> dict:
+    """Build a synthetic stdin payload for a hook's event and matcher."""
+    payload = {}
+    for key, value in {**common, **schemas.get(hook.event, {})}.items():
+        if key in ("agent_id", "agent_type") and key not in schemas.get(hook.event, {}):
+            continue  # Optional common fields
+        payload[key] = "hook-bench" if value == "..." else value
+
+    payload.update({
+        "hook_event_name": hook.event,
+        "session_id": "hook-bench-session",
+        "transcript_path": os.path.join(scratch, "transcript.jsonl"),
+        "cwd": scratch,
+    })
+
+    if hook.event in TOOL_EVENTS:
+        tool = _matcher_value(hook.matcher, list(SAFE_TOOL_INPUTS)) or "Bash"
+        tool_input = SAFE_TOOL_INPUTS.get(tool, {})
+        payload["tool_name"] = tool
+        payload["tool_input"] = {
+            k: v.format(scratch=scratch) if isinstance(v, str) else v
+            for k, v in tool_input.items()
+        }
+    elif hook.event in MATCHER_FIELDS and hook.matcher:
+        value = _matcher_value(hook.matcher, [])
+        if value:
+            payload[MATCHER_FIELDS[hook.event]] = value
+
+    return payload
+
+
+def find_hook_files(base_dir: Path) -> List[Path]:
+    """settings.json, settings.local.json and every hooks.json under base_dir."""
+    if base_dir.is_file():
+        return [base_dir]
+
+    inventory = get_inventory(base_dir)
+    files = []
+    if inventory.settings:
+        files.append(inventory.settings)
+    local = base_dir / "settings.local.json"
+    if local in inventory.by_dir.get(base_dir, []):
+        files.append(local)
+    files.extend(inventory.hooks_json)
+    return files
+
+
+def hook_timeout(value) -> int:
+    """A handler's timeout in seconds, or the default if missing or not a positive number."""
+    try:
+        timeout = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_TIMEOUT_S
+    return timeout if timeout > 0 else DEFAULT_TIMEOUT_S
+
+
+def find_command_hooks(base_dir: Path) -> List[CommandHook]:
+    """Collect every command hook from the hooks files under base_dir."""
+    hooks = []
+    for path in find_hook_files(base_dir):
+        # Plugin hooks live in <plugin>/hooks/hooks.json
+        plugin_root = str(path.parent.parent) if path.name == "hooks.json" else None
+        for event, matcher, handler in iter_hook_handlers(load_hook_events(path)):
+            if handler.get("type", "command") != "command" or "command" not in handler:
+                continue
+            hooks.append(CommandHook(
+                source=str(path),
+                event=event,
+                matcher=matcher,
+                command=handler["command"],
+                timeout=hook_timeout(handler.get("timeout")),
+                is_async=bool(handler.get("async", False)),
+                plugin_root=plugin_root,
+            ))
+    return hooks
+
+
+def run_once(hook: CommandHook, payload: bytes, cwd: str,
+             env: Dict[str, str]) -> Tuple[float, float, int, int, Optional[int]]:
+    """Run a hook once through LAUNCHER.
+
+    Returns (wall_ms, cpu_ms, peak_rss_kb, rss_floor_kb, exit status or None
+    on timeout).
+    """
+    proc = subprocess.Popen(
+        [sys.executable, "-I", "-S", "-c", LAUNCHER, hook.command, str(hook.timeout)],
+        cwd=cwd, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        # The hook reads the payload straight from the launcher's stdin
+        out, _ = proc.communicate(payload, timeout=hook.timeout + 10)
+        result = json.loads(out)
+    except (subprocess.TimeoutExpired, ValueError):
+        proc.kill()
+        proc.wait()
+        return hook.timeout * 1000.0, 0.0, 0, 0, None
+
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    scale = 1024 if sys.platform == "darwin" else 1
+    return (result["wall_ms"], result["cpu_ms"], result["maxrss"] // scale,
+            result["floor"] // scale, result["status"])
+
+
+def bench_hook(
+    hook: CommandHook, payload: dict, runs: int, scratch: str, budget_ms: float
+) -> HookTiming:
+    """Run a hook `runs` times and collect its timings."""
+    timing = HookTiming(hook, budget_ms=budget_ms)
+    env = dict(os.environ, CLAUDE_PROJECT_DIR=scratch)
+    if hook.plugin_root:
+        env["CLAUDE_PLUGIN_ROOT"] = hook.plugin_root
+    data = json.dumps(payload).encode()
+
+    for _ in range(runs):
+        wall_ms, cpu_ms, peak_kb, floor_kb, status = run_once(hook, data, scratch, env)
+        timing.wall_ms.append(wall_ms)
+        timing.cpu_ms.append(cpu_ms)
+        timing.peak_rss_kb = max(timing.peak_rss_kb, peak_kb)
+        timing.rss_floor_kb = max(timing.rss_floor_kb, floor_kb)
+        if status is None:
+            timing.timeouts += 1
+        elif status not in (0, 2):
+            # Exit 2 is a deliberate block, not a failure
+            timing.failures += 1
+
+    # Async hooks do not block the session, so they never count against the budget
+    timing.over_budget = not hook.is_async and percentile(timing.wall_ms, 95) > budget_ms
+    return timing
+
+
+def parse_event_budgets(values: List[str]) -> Dict[str, float]:
+    """Parse repeated EVENT=MS options."""
+    budgets = {}
+    for value in values:
+        event, sep, ms = value.partition("=")
+        if not sep:
+            raise ValueError(f"Expected EVENT=MS, got '{value}'")
+        budgets[event] = float(ms)
+    return budgets
+
+
+def timing_to_dict(t: HookTiming) -> dict:
+    return {
+        "source": t.hook.source,
+        "event": t.hook.event,
+        "matcher": t.hook.matcher,
+        "command": t.hook.command,
+        "async": t.hook.is_async,
+        "runs": len(t.wall_ms),
+        "wall_ms": {
+            "p50": round(percentile(t.wall_ms, 50), 2),
+            "p95": round(percentile(t.wall_ms, 95), 2),
+            "p99": round(percentile(t.wall_ms, 99), 2),
+        },
+        "cpu_ms": {
+            "p50": round(percentile(t.cpu_ms, 50), 2),
+            "p95": round(percentile(t.cpu_ms, 95), 2),
+        },
+        "peak_rss_kb": t.peak_rss_kb,
+        "rss_floor_kb": t.rss_floor_kb,
+        "failures": t.failures,
+        "timeouts": t.timeouts,
+        "budget_ms": t.budget_ms,
+        "over_budget": t.over_budget,
+    }
+
+
+def summarize_events(timings: List[HookTiming]) -> Dict[str, dict]:
+    """Aggregate per event: matching hooks run in parallel, so the slowest
+    hook bounds the added latency and the sum bounds total work."""
+    events: Dict[str, dict] = {}
+    for t in timings:
+        entry = events.setdefault(t.hook.event, {
+            "hooks": 0, "max_p50_ms": 0.0, "max_p95_ms": 0.0, "sum_p50_ms": 0.0,
+            "sum_cpu_p50_ms": 0.0, "peak_rss_kb": 0, "over_budget": 0,
+        })
+        entry["hooks"] += 1
+        entry["max_p50_ms"] = max(entry["max_p50_ms"], round(percentile(t.wall_ms, 50), 2))
+        entry["max_p95_ms"] = max(entry["max_p95_ms"], round(percentile(t.wall_ms, 95), 2))
+        entry["sum_p50_ms"] = round(entry["sum_p50_ms"] + percentile(t.wall_ms, 50), 2)
+        entry["sum_cpu_p50_ms"] = round(entry["sum_cpu_p50_ms"] + percentile(t.cpu_ms, 50), 2)
+        entry["peak_rss_kb"] = max(entry["peak_rss_kb"], t.peak_rss_kb)
+        entry["over_budget"] += int(t.over_budget)
+    return events
+
+
+def print_results(timings: List[HookTiming], runs: int) -> int:
+    """Print per-hook and per-event tables; return exit code."""
+    print(f"Hook latency ({runs} runs each)")
+    print("-" * 96)
+    print(f"{'Event':<18} {'Command':<34} {'p50':>7} {'p95':>7} {'p99':>7} "
+          f"{'CPU p50':>8} {'RSS MB':>7}  Status")
+    print("-" * 96)
+    for t in timings:
+        status = []
+        if t.over_budget:
+            status.append(f"OVER {t.budget_ms:.0f}ms")
+        if t.hook.is_async:
+            status.append("async")
+        if t.failures:
+            status.append(f"{t.failures} failed")
+        if t.timeouts:
+            status.append(f"{t.timeouts} timed out")
+        command = t.hook.command if len(t.hook.command) <= 34 else t.hook.command[:31] + "..."
+        print(f"{t.hook.event:<18} {command:<34} "
+              f"{percentile(t.wall_ms, 50):>7.1f} {percentile(t.wall_ms, 95):>7.1f} "
+              f"{percentile(t.wall_ms, 99):>7.1f} {percentile(t.cpu_ms, 50):>8.1f} "
+              f"{t.peak_rss_kb / 1024:>7.1f}  {', '.join(status) or 'ok'}")
+
+    print(f"\n{'Event':<18} {'Hooks':>5} {'max p50':>8} {'max p95':>8} {'sum p50':>8}")
+    print("-" * 52)
+    for event, entry in sorted(summarize_events(timings).items()):
+        print(f"{event:<18} {entry['hooks']:>5} {entry['max_p50_ms']:>8.1f} "
+              f"{entry['max_p95_ms']:>8.1f} {entry['sum_p50_ms']:>8.1f}")
+
+    floor = max((t.rss_floor_kb for t in timings), default=0)
+    if floor:
+        print(f"\nRSS is measured through a launcher; values up to {floor / 1024:.1f} MB are upper bounds.")
+
+    over = [t for t in timings if t.over_budget]
+    print(f"\n{'='*50}")
+    print(f"Benchmarked {len(timings)} hooks: {len(over)} over budget (times in ms)")
+    return 1 if over else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Claude Code command hook latency")
+    parser.add_argument("path", nargs="?", help="Directory or hooks file (default: ~/.claude)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Runs per hook")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="p95 wall-time budget per hook in milliseconds")
+    parser.add_argument("--event-budget", action="append", default=[], metavar="EVENT=MS",
+                        help="Per-event budget override (repeatable)")
+    parser.add_argument("--event", help="Only benchmark hooks for this event")
+    parser.add_argument("--list", action="store_true",
+                        help="List hooks and their payloads without running them")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    base = Path(args.path) if args.path else CLAUDE_DIR
+    if not base.exists():
+        print(f"Error: Path not found: {base}", file=sys.stderr)
+        sys.exit(2)
+    if args.runs < 1:
+        print("Error: --runs must be at least 1", file=sys.stderr)
+        sys.exit(2)
+    try:
+        event_budgets = parse_event_budgets(args.event_budget)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    hooks = find_command_hooks(base)
+    if args.event:
+        hooks = [h for h in hooks if h.event == args.event]
+    if not hooks:
+        print("No command hooks found.")
+        sys.exit(0)
+
+    common, schemas = load_input_schemas()
+
+    with tempfile.TemporaryDirectory(prefix="hook-bench-") as scratch:
+        payloads = [build_payload(h, common, schemas, scratch) for h in hooks]
+
+        if args.list:
+            for hook, payload in zip(hooks, payloads):
+                matcher = f" [{hook.matcher}]" if hook.matcher else ""
+                print(f"{hook.event}{matcher}: {hook.command}")
+                print(f"  from:  {hook.source}")
+                print(f"  stdin: {json.dumps(payload)}")
+            sys.exit(0)
+
+        timings = [
+            bench_hook(hook, payload, args.runs, scratch,
+                       event_budgets.get(hook.event, args.budget_ms))
+            for hook, payload in zip(hooks, payloads)
+        ]
+
+    if args.json:
+        print(json.dumps({
+            "runs": args.runs,
+            "hooks": [timing_to_dict(t) for t in timings],
+            "events": summarize_events(timings),
+        }, indent=2))
+        sys.exit(1 if any(t.over_budget for t in timings) else 0)
+    else:
+        sys.exit(print_results(timings, args.runs))
+
+
+if __name__ == "__main__":
+    main()
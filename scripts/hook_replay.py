@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Estimate the latency configured hooks add to real sessions.
+
+Streams the JSONL transcripts under ~/.claude/projects/, recovers the event
+sequence of each session (prompts, tool calls and results, subagent runs,
+compactions), and replays it against the command hooks found by
+hook_bench.py, using the same matcher rules as validate_extension.py. Each
+firing is charged the hook's latency: measured p50/p95 from a
+`hook_bench.py --json` report where available, otherwise a declared
+per-event or default estimate.
+
+Hooks matching the same event run in parallel, so one firing adds the
+slowest matching blocking hook's latency; async hooks are counted but add
+nothing.
+
+Transcripts are read one line at a time and only per-session totals are
+kept, so memory stays flat however large the transcript directory is. Lines
+longer than MAX_LINE_BYTES (typically huge tool results) are not parsed;
+their tool results are still recovered from the line's leading bytes.
+
+Approximations: Stop is charged once per user prompt, SessionStart and
+SessionEnd once per session, and PermissionRequest and Notification are not
+recorded in transcripts so they are not replayed.
+
+Usage:
+    python hook_replay.py                         # Hooks and transcripts in ~/.claude
+    python hook_replay.py --latency bench.json    # Use hook_bench.py --json timings
+    python hook_replay.py --assume-ms 50 --event-ms Stop=800
+    python hook_replay.py --transcripts ~/.claude/projects/-home-me-repo
+    python hook_replay.py --top 20 --json
+
+Exit codes:
+    0 - Success
+    2 - Usage error
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from hook_bench import CommandHook, find_command_hooks, parse_event_budgets
+from validate_extension import hook_matches
+
+CLAUDE_DIR = Path.home() / ".claude"
+
+DEFAULT_ASSUME_MS = 100.0
+DEFAULT_TOP = 10
+
+# Longer lines are skipped; only their first chunk is inspected
+MAX_LINE_BYTES = 8 * 1024 * 1024
+READ_CHUNK = 1024 * 1024
+
+# Tool calls whose result never appears are forgotten beyond this many
+MAX_PENDING_CALLS = 4096
+
+# Cheap byte-level filter: only these record types can produce events
+RELEVANT_LINE = re.compile(rb'"type":\s*"(?:user|tool_use|system)"')
+TOOL_USE_ID = re.compile(rb'"tool_use_id":\s*"([^"]+)"')
+
+SUBAGENT_TOOLS = ("Agent", "Task")
+
+
+@dataclass
+class HookLatency:
+    """A command hook and the latency charged each time it fires."""
+    hook: CommandHook
+    ms: float
+    measured: bool
+
+
+@dataclass
+class SessionStats:
+    """Replay totals for one session."""
+    session_id: str
+    project: str
+    prompts: int = 0
+    tool_calls: int = 0
+    firings: int = 0
+    added_ms: float = 0.0
+    by_event: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class ReplayTotals:
+    """Totals across all sessions; per-session detail is kept only for the top N."""
+    sessions: int = 0
+    files: int = 0
+    lines: int = 0
+    oversized_lines: int = 0
+    prompts: int = 0
+    tool_calls: int = 0
+    firings: Dict[str, int] = field(default_factory=dict)
+    added_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def load_latencies(path: Path, stat: str) -> Dict[Tuple[str, str, Optional[str], str], float]:
+    """Read a hook_bench.py --json report as {(source, event, matcher, command): ms}."""
+    with open(path) as f:
+        report = json.load(f)
+    latencies = {}
+    for entry in report.get("hooks", []):
+        key = (entry["source"], entry["event"], entry.get("matcher"), entry["command"])
+        latencies[key] = float(entry["wall_ms"][stat])
+    return latencies
+
+
+def assign_latencies(
+    hooks: List[CommandHook],
+    measured: Dict[Tuple[str, str, Optional[str], str], float],
+    event_ms: Dict[str, float],
+    assume_ms: float,
+) -> List[HookLatency]:
+    """Pair each hook with its measured, per-event or default latency."""
+    result = []
+    for hook in hooks:
+        key = (hook.source, hook.event, hook.matcher, hook.command)
+        if key in measured:
+            result.append(HookLatency(hook, measured[key], True))
+        else:
+            result.append(HookLatency(hook, event_ms.get(hook.event, assume_ms), False))
+    return result
+
+
+class HookTable:
+    """Resolves (event, matcher value) to the hooks that fire, memoized."""
+
+    def __init__(self, hooks: List[HookLatency]):
+        self.by_event: Dict[str, List[HookLatency]] = {}
+        for h in hooks:
+            self.by_event.setdefault(h.hook.event, []).append(h)
+        self._memo: Dict[Tuple[str, Optional[str]], Tuple[int, float]] = {}
+
+    def fire(self, event: str, value: Optional[str]) -> Tuple[int, float]:
+        """(hooks fired, added ms) for one occurrence of event."""
+        key = (event, value)
+        cached = self._memo.get(key)
+        if cached is None:
+            matched = [h for h in self.by_event.get(event, ())
+                       if hook_matches(h.hook.matcher, value)]
+            blocking = [h.ms for h in matched if not h.hook.is_async]
+            cached = (len(matched), max(blocking, default=0.0))
+            self._memo[key] = cached
+        return cached
+
+
+def iter_lines(path: Path, totals: ReplayTotals) -> Iterator[bytes]:
+    """Yield transcript lines that may carry events, reading in bounded chunks.
+
+    Oversized lines are yielded truncated to their first chunk so tool_use_id
+    references at the start of a huge tool result can still be recovered.
+    """
+    with open(path, "rb") as f:
+        while True:
+            line = f.readline(MAX_LINE_BYTES)
+            if not line:
+                return
+            totals.lines += 1
+            if not line.endswith(b"\n") and len(line) == MAX_LINE_BYTES:
+                totals.oversized_lines += 1
+                head = line[:READ_CHUNK]
+                # Discard the rest of the line without holding it
+                while line and not line.endswith(b"\n"):
+                    line = f.readline(READ_CHUNK)
+                yield head
+                continue
+            if RELEVANT_LINE.search(line):
+                yield line
+
+
+def _is_prompt(record: dict) -> bool:
+    """True for a user-typed prompt, not a tool result or injected message."""
+    if record.get("isMeta") or record.get("isCompactSummary") or "toolUseResult" in record:
+        return False
+    content = (record.get("message") or {}).get("content")
+    if isinstance(content, str):
+        return True
+    if isinstance(content, list):
+        types = {block.get("type") for block in content if isinstance(block, dict)}
+        return "text" in types and "tool_result" not in types
+    return False
+
+
+def transcript_events(
+    path: Path, is_subagent: bool, totals: ReplayTotals
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (event, matcher value) for every hook event a transcript implies."""
+    pending: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    if not is_subagent:
+        yield "SessionStart", "startup"
+
+    for line in iter_lines(path, totals):
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Truncated oversized line: recover the tool results it answers
+            for match in TOOL_USE_ID.finditer(line):
+                call = pending.pop(match.group(1).decode(), None)
+                if call:
+                    yield from _result_events(call, is_error=False)
+            continue
+        if not isinstance(record, dict):
+            continue
+
+        kind = record.get("type")
+        if kind == "system":
+            if record.get("subtype") == "compact_boundary":
+                trigger = (record.get("compactMetadata") or {}).get("trigger", "auto")
+                yield "PreCompact", trigger
+                yield "PostCompact", trigger
+            continue
+
+        content = (record.get("message") or {}).get("content")
+        if kind == "assistant" and isinstance(content, list):
+            for block in content:
+                if not isinstance(block, dict) or block.get("type") != "tool_use":
+                    continue
+                name = block.get("name", "")
+                agent_type = None
+                if name in SUBAGENT_TOOLS:
+                    agent_type = (block.get("input") or {}).get("subagent_type", "general-purpose")
+                if len(pending) >= MAX_PENDING_CALLS:
+                    pending.pop(next(iter(pending)))
+                pending[block.get("id", "")] = (name, agent_type)
+                totals.tool_calls += 1
+                yield "PreToolUse", name
+                if agent_type:
+                    yield "SubagentStart", agent_type
+
+        elif kind == "user":
+            if not is_subagent and not record.get("isSidechain") and _is_prompt(record):
+                totals.prompts += 1
+                yield "UserPromptSubmit", None
+                yield "Stop", None
+                continue
+            if isinstance(content, list):
+                for block in content:
+                    if not isinstance(block, dict) or block.get("type") != "tool_result":
+                        continue
+                    call = pending.pop(block.get("tool_use_id", ""), None)
+                    if call:
+                        yield from _result_events(call, bool(block.get("is_error")))
+
+    if not is_subagent:
+        yield "SessionEnd", "other"
+
+
+def _result_events(call: Tuple[str, Optional[str]], is_error: bool) -> Iterator[Tuple[str, Optional[str]]]:
+    name, agent_type = call
+    yield ("PostToolUseFailure" if is_error else "PostToolUse"), name
+    if agent_type:
+        yield "SubagentStop", agent_type
+
+
+def is_project_dir(root: Path) -> bool:
+    """Whether root is one project's directory (holds <session>.jsonl files)."""
+    try:
+        return any(e.name.endswith(".jsonl") and e.is_file() for e in os.scandir(root))
+    except OSError:
+        return False
+
+
+def iter_transcripts(root: Path) -> Iterator[Tuple[str, str, Path, bool]]:
+    """Yield (project, session_id, path, is_subagent) for every transcript.
+
+    Main transcripts are <project>/<session>.jsonl; subagent transcripts live
+    under <project>/<session>/ (e.g. <session>/subagents/agent-*.jsonl) and
+    are attributed to that session. root is either a directory of projects or
+    a single project. All transcripts of one project are yielded before the
+    next project's.
+    """
+    single_project = is_project_dir(root)
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = sorted(os.scandir(current), key=lambda e: e.name, reverse=True)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.name.endswith(".jsonl"):
+                path = Path(entry.path)
+                rel = path.relative_to(root).parts
+                if single_project:
+                    # --transcripts pointed at a single project directory
+                    if len(rel) == 1:
+                        yield root.name, path.stem, path, False
+                    else:
+                        yield root.name, rel[0], path, True
+                elif len(rel) == 2:
+                    yield rel[0], path.stem, path, False
+                elif len(rel) > 2:
+                    yield rel[0], rel[1], path, True
+
+
+def replay(root: Path, table: HookTable, top: int) -> Tuple[ReplayTotals, List[SessionStats]]:
+    """Replay every transcript under root; return totals and the top sessions by added time."""
+    totals = ReplayTotals()
+    heap: List[Tuple[float, str, SessionStats]] = []
+    project_sessions: Dict[str, SessionStats] = {}
+
+    def flush():
+        for stats in project_sessions.values():
+            totals.sessions += 1
+            entry = (stats.added_ms, stats.session_id, stats)
+            if len(heap) < top:
+                heapq.heappush(heap, entry)
+            elif top and entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        project_sessions.clear()
+
+    # Transcripts of one project are yielded together, so only that
+    # project's sessions are held at a time
+    current_project = None
+    for project, session_id, path, is_subagent in iter_transcripts(root):
+        if project != current_project:
+            flush()
+            current_project = project
+        stats = project_sessions.get(session_id)
+        if stats is None:
+            stats = project_sessions[session_id] = SessionStats(session_id, project)
+        totals.files += 1
+        prompts_before, calls_before = totals.prompts, totals.tool_calls
+        for event, value in transcript_events(path, is_subagent, totals):
+            fired, ms = table.fire(event, value)
+            if not fired:
+                continue
+            stats.firings += fired
+            stats.added_ms += ms
+            stats.by_event[event] = stats.by_event.get(event, 0.0) + ms
+            totals.firings[event] = totals.firings.get(event, 0) + fired
+            totals.added_ms[event] = totals.added_ms.get(event, 0.0) + ms
+        stats.prompts += totals.prompts - prompts_before
+        stats.tool_calls += totals.tool_calls - calls_before
+    flush()
+
+    return totals, [s for _, _, s in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+
+def _seconds(ms: float) -> str:
+    return f"{ms / 1000:.1f}s"
+
+
+def print_results(totals: ReplayTotals, sessions: List[SessionStats], hooks: List[HookLatency]):
+    measured = sum(1 for h in hooks if h.measured)
+    print(f"Replayed {totals.sessions} sessions ({totals.files} transcripts, {totals.lines} lines)")
+    print(f"  {totals.prompts} prompts, {totals.tool_calls} tool calls")
+    print(f"  {len(hooks)} command hooks ({measured} measured, {len(hooks) - measured} estimated)")
+    if totals.oversized_lines:
+        print(f"  {totals.oversized_lines} oversized lines read partially")
+
+    total_ms = sum(totals.added_ms.values())
+    per_session = total_ms / totals.sessions if totals.sessions else 0.0
+    print(f"\nAdded hook time: {_seconds(total_ms)} total, {_seconds(per_session)} per session")
+
+    if totals.firings:
+        print(f"\n{'Event':<20} {'Firings':>8} {'Added':>10}")
+        print("-" * 40)
+        for event in sorted(totals.firings, key=lambda e: -totals.added_ms[e]):
+            print(f"{event:<20} {totals.firings[event]:>8} {_seconds(totals.added_ms[event]):>10}")
+
+    if sessions:
+        print(f"\nTop {len(sessions)} sessions by added time:")
+        for s in sessions:
+            print(f"  {_seconds(s.added_ms):>8}  {s.session_id}  ({s.project}, "
+                  f"{s.prompts} prompts, {s.tool_calls} tool calls, {s.firings} firings)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate hook latency added to recorded sessions")
+    parser.add_argument("path", nargs="?", help="Directory holding the hooks config (default: ~/.claude)")
+    parser.add_argument("--transcripts", help="Transcript directory (default: <path>/projects)")
+    parser.add_argument("--latency", help="hook_bench.py --json report with measured timings")
+    parser.add_argument("--stat", choices=["p50", "p95", "p99"], default="p50",
+                        help="Measured statistic to charge per firing (default: p50)")
+    parser.add_argument("--assume-ms", type=float, default=DEFAULT_ASSUME_MS,
+                        help="Latency for hooks without a measurement")
+    parser.add_argument("--event-ms", action="append", default=[], metavar="EVENT=MS",
+                        help="Declared latency for unmeasured hooks of one event (repeatable)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Sessions to list")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    base = Path(args.path) if args.path else CLAUDE_DIR
+    transcripts = Path(args.transcripts) if args.transcripts else base / "projects"
+    for required in (base, transcripts):
+        if not required.exists():
+            print(f"Error: Path not found: {required}", file=sys.stderr)
+            sys.exit(2)
+
+    try:
+        event_ms = parse_event_budgets(args.event_ms)
+        measured = load_latencies(Path(args.latency), args.stat) if args.latency else {}
+    except (ValueError, OSError, KeyError, json.JSONDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    hooks = assign_latencies(find_command_hooks(base), measured, event_ms, args.assume_ms)
+    totals, sessions = replay(transcripts, HookTable(hooks), max(0, args.top))
+
+    if args.json:
+        print(json.dumps({
+            "totals": asdict(totals),
+            "hooks": [
+                {"event": h.hook.event, "matcher": h.hook.matcher, "command": h.hook.command,
+                 "source": h.hook.source, "async": h.hook.is_async,
+                 "ms": h.ms, "measured": h.measured}
+                for h in hooks
+            ],
+            "top_sessions": [asdict(s) for s in sessions],
+        }, indent=2))
+    else:
+        print_results(totals, sessions, hooks)
+
+
+if __name__ == "__main__":
+    main()
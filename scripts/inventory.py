@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Single-pass filesystem inventory of Claude Code extensions.
+
+Walks a base directory once with os.scandir and classifies every file the
+toolkit cares about (skills, agents, commands, plugins, hooks, CLAUDE.md,
+scripts). The scanner scripts query the inventory instead of running their
+own rglob() passes, so an audit costs one tree walk instead of six.
+
+The walk prunes noise directories (transcripts, todos, shell snapshots,
+plugin caches, node_modules, .git) using built-in ignore globs plus the
+gitignore-style data/scan-ignore file. Directory symlinks are followed, but
+each directory and file is visited at most once by (device, inode), which
+also breaks symlink loops.
+
+Usage:
+    python inventory.py                # Summarize ~/.claude
+    python inventory.py <path>         # Summarize a directory
+    python inventory.py <path> --json  # JSON output
+    python inventory.py --no-ignore    # Walk everything, including noise dirs
+
+Exit codes:
+    0 - Success
+    2 - Usage error
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+TOOLKIT_ROOT = SCRIPT_DIR.parent
+CLAUDE_DIR = Path.home() / ".claude"
+IGNORE_PATH = TOOLKIT_ROOT / "data" / "scan-ignore"
+
+# Directories that never contain extensions. Leading "/" anchors a pattern to
+# the scan root; a trailing "/" restricts it to directories (gitignore rules).
+DEFAULT_IGNORES = [
+    "/projects/",
+    "/todos/",
+    "/shell-snapshots/",
+    "/statsig/",
+    "/file-history/",
+    "/session-env/",
+    "/debug/",
+    "/plugins/cache/",
+    "node_modules/",
+    ".git/",
+    "__pycache__/",
+    ".venv/",
+]
+
+# Only files with these suffixes are retained; everything else (transcripts,
+# caches, binaries) is walked past without being stored.
+TRACKED_SUFFIXES = (".md", ".sh", ".json", ".py")
+SCRIPT_SUFFIXES = (".sh", ".py")
+
+
+@dataclass
+class IgnoreRule:
+    """A single gitignore-style pattern."""
+    pattern: str
+    negated: bool = False
+    anchored: bool = False
+    dir_only: bool = False
+    any_depth: bool = False
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if not self.anchored:
+            return fnmatch.fnmatchcase(name, self.pattern)
+        if fnmatch.fnmatchcase(rel_path, self.pattern):
+            return True
+        return self.any_depth and fnmatch.fnmatchcase(rel_path, "*/" + self.pattern)
+
+
+def parse_ignore_lines(lines: List[str]) -> List[IgnoreRule]:
+    """Parse gitignore-style lines into rules.
+
+    Supported subset: comments, blank lines, "!" negation, trailing "/" for
+    directories, and patterns containing "/" anchored to the scan root.
+    "**/" matches any number of leading directories.
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+
+        any_depth = line.startswith("**/")
+        if any_depth:
+            line = line[3:]
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+
+        rules.append(IgnoreRule(line, negated, anchored, dir_only, any_depth))
+    return rules
+
+
+def load_ignore_rules(path: Path = IGNORE_PATH, include_defaults: bool = True) -> List[IgnoreRule]:
+    """Load built-in ignore rules followed by user rules from path."""
+    lines = list(DEFAULT_IGNORES) if include_defaults else []
+    if path.exists():
+        try:
+            lines.extend(path.read_text().splitlines())
+        except OSError as e:
+            print(f"Warning: Cannot read {path}: {e}", file=sys.stderr)
+    return parse_ignore_lines(lines)
+
+
+def is_ignored(rules: List[IgnoreRule], rel_path: str, name: str, is_dir: bool) -> bool:
+    """Apply rules in order; the last matching rule wins, as in gitignore."""
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, name, is_dir):
+            ignored = not rule.negated
+    return ignored
+
+
+@dataclass
+class Inventory:
+    """Classified file listing for one base directory."""
+    base_dir: Path
+    skills: List[Path] = field(default_factory=list)
+    claude_md: List[Path] = field(default_factory=list)
+    hooks_json: List[Path] = field(default_factory=list)
+    markdown: List[Path] = field(default_factory=list)
+    shell: List[Path] = field(default_factory=list)
+    json_files: List[Path] = field(default_factory=list)
+    scripts: List[Path] = field(default_factory=list)
+    plugin_roots: List[Path] = field(default_factory=list)
+    by_dir: Dict[Path, List[Path]] = field(default_factory=dict)
+    # Stat taken during the walk, so callers need not stat tracked files again
+    stats: Dict[Path, os.stat_result] = field(default_factory=dict)
+    pruned: List[Path] = field(default_factory=list)
+    duplicates: int = 0
+
+    def files_in(self, directory: Path, suffix: str = ".md") -> List[Path]:
+        """Files directly inside directory with suffix (like glob('*.md'))."""
+        return [p for p in self.by_dir.get(directory, []) if p.suffix == suffix]
+
+    def files_under(self, root: Path, suffix: str = ".md") -> List[Path]:
+        """Files anywhere below root with suffix (like rglob('*.md'))."""
+        source = {
+            ".md": self.markdown,
+            ".sh": self.shell,
+            ".json": self.json_files,
+        }.get(suffix)
+        if source is None:
+            source = [p for files in self.by_dir.values() for p in files if p.suffix == suffix]
+        prefix = str(root) + os.sep
+        return [p for p in source if str(p).startswith(prefix)]
+
+    def stat(self, path: Path) -> Optional[os.stat_result]:
+        """Stat from the walk for tracked files, otherwise a fresh os.stat()."""
+        st = self.stats.get(path)
+        if st is not None:
+            return st
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def references_for(self, skill_md: Path) -> List[Path]:
+        """Reference markdown files belonging to a skill."""
+        return self.files_in(skill_md.parent / "references")
+
+    @property
+    def agents(self) -> List[Path]:
+        return self.files_in(self.base_dir / "agents")
+
+    @property
+    def commands(self) -> List[Path]:
+        return self.files_in(self.base_dir / "commands")
+
+    @property
+    def plugins(self) -> List[Path]:
+        plugins_dir = self.base_dir / "plugins"
+        return [p for p in self.plugin_roots if p.parent == plugins_dir]
+
+    @property
+    def settings(self) -> Optional[Path]:
+        settings = self.base_dir / "settings.json"
+        return settings if settings in self.by_dir.get(self.base_dir, []) else None
+
+    def classify(self, path: Path) -> str:
+        """Classify a single file path into an extension kind."""
+        return classify_path(path, self.base_dir)
+
+
+def classify_path(path: Path, base_dir: Path) -> str:
+    """Classify a file as skill, agent, command, plugin, hooks, claude_md, script or other."""
+    name = path.name
+    parent = path.parent
+
+    if name == "SKILL.md":
+        return "skill"
+    if name == "CLAUDE.md":
+        return "claude_md"
+    if name == "hooks.json" or (name == "settings.json" and parent == base_dir):
+        return "hooks"
+    if name == "plugin.json" and parent.name == ".claude-plugin":
+        return "plugin"
+    if path.suffix == ".md":
+        if parent.name == "agents":
+            return "agent"
+        if parent.name == "commands":
+            return "command"
+        if parent.name == "references":
+            return "reference"
+        return "markdown"
+    if path.suffix in SCRIPT_SUFFIXES:
+        return "script"
+    return "other"
+
+
+def walk_tree(
+    base_dir: Path,
+    rules: Optional[List[IgnoreRule]] = None,
+    pruned: Optional[List[Path]] = None,
+) -> Iterator[Tuple[Path, List[os.DirEntry], List[os.DirEntry]]]:
+    """Yield (directory, subdirs, files) for base_dir, pruning ignored entries.
+
+    Directories are visited in name order. Directory symlinks are followed,
+    but a directory already visited under another path (same device and
+    inode) is skipped, so symlink loops terminate. Ignored directories are
+    appended to pruned when it is given.
+    """
+    rules = rules or []
+    visited: Set[Tuple[int, int]] = set()
+    base = str(base_dir)
+    stack = [base]
+
+    while stack:
+        current = stack.pop()
+        try:
+            st = os.stat(current)
+        except OSError:
+            continue
+        key = (st.st_dev, st.st_ino)
+        if key in visited:
+            continue
+        visited.add(key)
+
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        rel_dir = os.path.relpath(current, base)
+        rel_prefix = "" if rel_dir == "." else rel_dir.replace(os.sep, "/") + "/"
+        subdirs = []
+        files = []
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if rules and is_ignored(rules, rel_prefix + entry.name, entry.name, is_dir):
+                if is_dir and pruned is not None:
+                    pruned.append(Path(entry.path))
+                continue
+
+            if is_dir:
+                subdirs.append(entry)
+            else:
+                files.append(entry)
+
+        yield Path(current), subdirs, files
+
+        # Reverse so the stack pops subdirectories in name order
+        stack.extend(e.path for e in reversed(subdirs))
+
+
+def build_inventory(base_dir: Path, rules: Optional[List[IgnoreRule]] = None) -> Inventory:
+    """Walk base_dir once and classify every tracked file."""
+    inventory = Inventory(base_dir)
+    seen_files: Set[Tuple[int, int]] = set()
+
+    for current_path, subdirs, files in walk_tree(base_dir, rules, inventory.pruned):
+        if any(d.name == ".claude-plugin" for d in subdirs):
+            inventory.plugin_roots.append(current_path)
+
+        dir_files: List[Path] = []
+
+        for entry in files:
+            name = entry.name
+            suffix = os.path.splitext(name)[1]
+            if suffix not in TRACKED_SUFFIXES:
+                continue
+
+            # Hard links and symlinked copies are counted once
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if key in seen_files:
+                inventory.duplicates += 1
+                continue
+            seen_files.add(key)
+
+            path = current_path / name
+            dir_files.append(path)
+            inventory.stats[path] = st
+
+            if suffix == ".md":
+                inventory.markdown.append(path)
+                if name == "SKILL.md":
+                    inventory.skills.append(path)
+                elif name == "CLAUDE.md":
+                    inventory.claude_md.append(path)
+            elif suffix == ".json":
+                inventory.json_files.append(path)
+                if name == "hooks.json":
+                    inventory.hooks_json.append(path)
+            elif suffix == ".sh":
+                inventory.shell.append(path)
+
+            if suffix in SCRIPT_SUFFIXES:
+                inventory.scripts.append(path)
+
+        if dir_files:
+            inventory.by_dir[current_path] = dir_files
+
+    return inventory
+
+
+_INVENTORIES: Dict[Path, Inventory] = {}
+
+
+def get_inventory(base_dir: Path, refresh: bool = False) -> Inventory:
+    """Return the pruned inventory for base_dir, walking it at most once per process."""
+    key = Path(base_dir)
+    if refresh or key not in _INVENTORIES:
+        _INVENTORIES[key] = build_inventory(key, load_ignore_rules())
+    return _INVENTORIES[key]
+
+
+def summarize(inventory: Inventory) -> Dict[str, int]:
+    """Count classified files by kind."""
+    return {
+        "skills": len(inventory.skills),
+        "agents": len(inventory.agents),
+        "commands": len(inventory.commands),
+        "plugins": len(inventory.plugins),
+        "hooks": len(inventory.hooks_json) + (1 if inventory.settings else 0),
+        "claude_md": len(inventory.claude_md),
+        "scripts": len(inventory.scripts),
+        "markdown": len(inventory.markdown),
+        "json": len(inventory.json_files),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inventory Claude Code extension files")
+    parser.add_argument("path", nargs="?", help="Directory to inventory (default: ~/.claude)")
+    parser.add_argument("--no-ignore", action="store_true",
+                        help="Do not prune noise directories")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    base_dir = Path(args.path) if args.path else CLAUDE_DIR
+    if not base_dir.is_dir():
+        print(f"Error: Not a directory: {base_dir}", file=sys.stderr)
+        sys.exit(2)
+
+    rules = [] if args.no_ignore else load_ignore_rules()
+    inventory = build_inventory(base_dir, rules)
+    counts = summarize(inventory)
+
+    if args.json:
+        print(json.dumps({
+            "base_dir": str(base_dir),
+            "counts": counts,
+            "pruned": [str(p) for p in inventory.pruned],
+            "duplicates": inventory.duplicates,
+        }, indent=2))
+    else:
+        print(f"Inventory of {base_dir}")
+        for kind, count in counts.items():
+            print(f"  {kind + ':':<11}{count:>6}")
+        print(f"\nPruned {len(inventory.pruned)} directories, "
+              f"skipped {inventory.duplicates} duplicate files")
+
+
+if __name__ == "__main__":
+    main()
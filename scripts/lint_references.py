@@ -4,14 +4,20 @@ Check for broken internal links and references in Claude Code extensions.
 
 Validates:
 - Markdown links: [text](path)
+- Heading anchors: [text](path.md#heading) and same-file [text](#heading)
 - Reference mentions: `references/file.md`
-- Skill references in descriptions
+- Slash command references: /skill-name, /command, /plugin:skill (unknown
+  names are warnings and do not affect the exit code)
 - Plugin component references
+- External http(s) links, with --check-urls (see url_checker.py)
 
 Usage:
     python lint_references.py <path>       # Check single file/directory
     python lint_references.py --all        # Check all extensions
     python lint_references.py --fix        # Suggest fixes for broken links
+    python lint_references.py --all --watch  # Re-lint files as they change
+    python lint_references.py . --changed-since origin/main  # Only changed files
+    python lint_references.py --all --check-urls  # Also check external URLs
 
 Exit codes:
     0 - All links valid
@@ -20,21 +26,62 @@ Exit codes:
 """
 
 import argparse
+import difflib
+import hashlib
 import json
 import os
 import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Set, Tuple
-from urllib.parse import urlparse
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from frontmatter_parser import find_frontmatter, read_frontmatter
+from git_scope import ChangedScope, scope_from_args
+from inventory import Inventory, get_inventory
+from roots import find_plugin_roots, plugin_name
+from url_checker import CACHE_PATH as URL_CACHE_PATH
+from url_checker import DEFAULT_JOBS, DEFAULT_TTL, UrlCache, check_urls
+from watch import DEFAULT_INTERVAL, Findings, watch
 
 CLAUDE_DIR = Path.home() / ".claude"
 
 # Patterns for finding references
 MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]*)\]\(([^)]+)\)')
 REFERENCE_MENTION_PATTERN = re.compile(r'`(references/[^`]+)`')
-SKILL_REFERENCE_PATTERN = re.compile(r'/([a-z0-9_-]+)')  # Slash command references
+# Slash command references: /name or /plugin:name starting a word and not
+# followed by / or . (paths such as a/b, /tmp/x and /x.md), except a
+# sentence-ending . before whitespace or the end of the line
+SKILL_REFERENCE_PATTERN = re.compile(
+    r'(?<![^\s(\["\'*_])/([a-z0-9][a-z0-9_-]*(?::[a-z0-9][a-z0-9_-]*)?)'
+    r'(?![\w/:-])(?!\.(?!\s|$))'
+)
+# An inline code span that is a whole command invocation: `/name [args]`
+CODE_COMMAND_PATTERN = re.compile(r'^/([a-z0-9][a-z0-9_-]*(?::[a-z0-9][a-z0-9_-]*)?)(?:\s.*)?$')
+INLINE_CODE_PATTERN = re.compile(r'(`+)(.+?)\1')
+URL_SPAN_PATTERN = re.compile(r'\b[a-z][a-z0-9+.-]*://\S+', re.IGNORECASE)
+
+# Commands every session has
+BUILTIN_COMMANDS = {
+    "add-dir", "agents", "bashes", "bug", "clear", "compact", "config", "context", "cost",
+    "doctor", "exit", "export", "help", "hooks", "ide", "init", "install-github-app", "login",
+    "logout", "mcp", "memory", "model", "output-style", "permissions", "plugin", "pr-comments",
+    "privacy-settings", "release-notes", "reload-plugins", "resume", "review", "rewind",
+    "sandbox", "security-review", "skills", "status", "statusline", "terminal-setup", "todos",
+    "upgrade", "usage", "vim",
+}
+
+# Heading anchors
+ATX_HEADING_PATTERN = re.compile(r'^ {0,3}#{1,6}(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+HTML_ANCHOR_PATTERN = re.compile(r'<a\s[^>]*\b(?:name|id)=["\']([^"\']+)["\']', re.IGNORECASE)
+INLINE_LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+SLUG_STRIP_PATTERN = re.compile(r'[^\w\- ]')
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+# Anchor sets by file content hash, shared by every run in this process so
+# --watch only re-slugifies files whose content changed
+_ANCHOR_CACHE: Dict[str, FrozenSet[str]] = {}
 
 
 @dataclass
@@ -47,6 +94,7 @@ class LinkResult:
     is_valid: bool
     error: str = ""
     suggestion: str = ""
+    warning: str = ""  # Not broken, but worth a look (e.g. unknown /command)
 
 
 @dataclass
@@ -59,6 +107,10 @@ class LintResult:
     def broken_count(self) -> int:
         return sum(1 for link in self.links if not link.is_valid)
 
+    @property
+    def warning_count(self) -> int:
+        return sum(1 for link in self.links if link.warning)
+
     @property
     def is_valid(self) -> bool:
         return self.broken_count == 0
@@ -73,76 +125,186 @@ def is_url(target: str) -> bool:
         return False
 
 
-def resolve_link(source_file: Path, target: str) -> Tuple[bool, str, str]:
-    """
-    Resolve a link target relative to the source file.
-    Returns (is_valid, error_message, suggestion).
-    """
-    # Skip URLs
-    if is_url(target):
-        return True, "", ""
-
-    # Skip anchor-only links
-    if target.startswith("#"):
-        return True, "", ""
-
-    # Handle fragment (anchor) in path
-    if "#" in target:
-        target = target.split("#")[0]
-
-    # Skip empty after fragment removal
-    if not target:
-        return True, "", ""
-
-    # Resolve relative to source file's directory
-    source_dir = source_file.parent
-    target_path = (source_dir / target).resolve()
-
-    if target_path.exists():
-        return True, "", ""
+def heading_slug(heading: str) -> str:
+    """GitHub-style anchor for a heading: lowercase, punctuation dropped, spaces to hyphens."""
+    text = INLINE_LINK_PATTERN.sub(r"\1", heading).strip().lower()
+    return SLUG_STRIP_PATTERN.sub("", text).replace(" ", "-")
 
-    # Try some common fixes
-    suggestion = ""
 
-    # Check if file exists with different extension
-    if not target_path.suffix:
-        md_path = target_path.with_suffix(".md")
-        if md_path.exists():
-            suggestion = f"Try: {target}.md"
+def heading_anchors(content: str) -> FrozenSet[str]:
+    """Every anchor a markdown file defines.
 
-    # Check if in references/ directory
-    if "references" not in target:
-        ref_path = source_dir / "references" / target
-        if ref_path.exists():
-            suggestion = f"Try: references/{target}"
-        ref_md_path = source_dir / "references" / (target + ".md")
-        if ref_md_path.exists():
-            suggestion = f"Try: references/{target}.md"
-
-    return False, f"File not found: {target_path}", suggestion
+    Headings inside fenced code blocks and frontmatter are ignored. Repeated
+    headings get -1, -2, ... suffixes as on GitHub; explicit <a name/id>
+    anchors are included.
+    """
+    spans = find_frontmatter(content)
+    if spans is not None:
+        content = content[spans[2]:]
+
+    anchors = set()
+    counts: Dict[str, int] = {}
+    for _, line in prose_lines(content):
+        anchors.update(HTML_ANCHOR_PATTERN.findall(line))
+        match = ATX_HEADING_PATTERN.match(line)
+        if match:
+            slug = heading_slug(match.group(1) or "")
+            seen = counts.get(slug, 0)
+            counts[slug] = seen + 1
+            anchors.add(f"{slug}-{seen}" if seen else slug)
+    return frozenset(anchors)
+
+
+class LinkResolver:
+    """Resolves links for one lint run from cached directory listings.
+
+    Each directory is listed once with os.scandir, so existence checks and
+    fix suggestions become set lookups instead of stat calls, and a source
+    directory is resolved through symlinks once rather than once per link.
+    Results are memoized per (source directory, target). Create a new
+    resolver for each run so files created or deleted in between are seen.
+
+    #fragment anchors are checked against the headings of the target file,
+    or of the source file for same-file links. Each file's anchors are
+    built once per run, and reused across runs while its content hash
+    is unchanged.
+    """
 
+    def __init__(self):
+        self._listings: Dict[str, Optional[Set[str]]] = {}
+        self._real_dirs: Dict[str, str] = {}
+        self._anchors: Dict[str, Optional[FrozenSet[str]]] = {}
+        self._results: Dict[Tuple[str, str], Tuple[bool, str, str]] = {}
+
+    def listing(self, directory: str) -> Optional[Set[str]]:
+        """Names in directory that exist (dangling symlinks excluded), or None."""
+        if directory not in self._listings:
+            try:
+                with os.scandir(directory) as it:
+                    names = {
+                        entry.name for entry in it
+                        if not entry.is_symlink() or os.path.exists(entry.path)
+                    }
+            except OSError:
+                names = None
+            self._listings[directory] = names
+        return self._listings[directory]
+
+    def exists(self, path: str) -> bool:
+        """Whether a normalized absolute path exists, answered from listings."""
+        parent, name = os.path.split(path)
+        if not name:
+            return True
+        names = self.listing(parent)
+        return names is not None and name in names
+
+    def real_dir(self, directory: Path) -> str:
+        key = str(directory)
+        if key not in self._real_dirs:
+            self._real_dirs[key] = os.path.realpath(directory)
+        return self._real_dirs[key]
+
+    def anchors(self, path: str) -> Optional[FrozenSet[str]]:
+        """Anchors defined by the markdown file at path, or None if unreadable."""
+        if path not in self._anchors:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                self._anchors[path] = None
+                return None
+            digest = hashlib.sha256(data).hexdigest()
+            if digest not in _ANCHOR_CACHE:
+                _ANCHOR_CACHE[digest] = heading_anchors(data.decode("utf-8", errors="replace"))
+            self._anchors[path] = _ANCHOR_CACHE[digest]
+        return self._anchors[path]
+
+    def resolve(self, source_file: Path, target: str) -> Tuple[bool, str, str]:
+        """Resolve a link target relative to the source file.
+
+        Returns (is_valid, error_message, suggestion).
+        """
+        # Skip URLs
+        if is_url(target):
+            return True, "", ""
+
+        # Split off the fragment (anchor)
+        path_part, _, fragment = target.partition("#")
+        source_dir = self.real_dir(source_file.parent)
+
+        # Same-file anchor: check the source's own headings
+        if not path_part:
+            if not fragment:
+                return True, "", ""
+            source_path = os.path.join(source_dir, source_file.name)
+            key = (source_path, target)
+            if key not in self._results:
+                self._results[key] = self._check_anchor(source_path, fragment, "")
+            return self._results[key]
+
+        key = (source_dir, target)
+        if key not in self._results:
+            result = self._resolve(source_dir, path_part)
+            if result[0] and fragment:
+                target_path = os.path.normpath(os.path.join(source_dir, path_part))
+                result = self._check_anchor(target_path, fragment, path_part)
+            self._results[key] = result
+        return self._results[key]
+
+    def _check_anchor(self, path: str, fragment: str, path_part: str) -> Tuple[bool, str, str]:
+        """Validate #fragment against the headings of a markdown file."""
+        if not path.lower().endswith(MARKDOWN_SUFFIXES):
+            return True, "", ""
+        anchors = self.anchors(path)
+        if anchors is None or fragment in anchors or unquote(fragment) in anchors:
+            return True, "", ""
+
+        suggestion = ""
+        closest = difflib.get_close_matches(unquote(fragment).lower(), sorted(anchors), n=1, cutoff=0.6)
+        if closest:
+            suggestion = f"Try: {path_part}#{closest[0]}"
+        return False, f"Anchor not found: #{fragment} in {path}", suggestion
+
+    def _resolve(self, source_dir: str, target: str) -> Tuple[bool, str, str]:
+        # Resolve relative to source file's directory
+        target_path = os.path.normpath(os.path.join(source_dir, target))
+
+        if self.exists(target_path):
+            return True, "", ""
+
+        # Try some common fixes
+        suggestion = ""
+
+        # Check if file exists with different extension
+        if not Path(target_path).suffix:
+            if self.exists(target_path + ".md"):
+                suggestion = f"Try: {target}.md"
+
+        # Check if in references/ directory
+        if "references" not in target:
+            ref_path = os.path.normpath(os.path.join(source_dir, "references", target))
+            if self.exists(ref_path):
+                suggestion = f"Try: references/{target}"
+            if self.exists(ref_path + ".md"):
+                suggestion = f"Try: references/{target}.md"
+
+        return False, f"File not found: {target_path}", suggestion
+
+
+def resolve_link(source_file: Path, target: str,
+                 resolver: Optional[LinkResolver] = None) -> Tuple[bool, str, str]:
+    """
+    Resolve a link target relative to the source file.
+    Returns (is_valid, error_message, suggestion).
+    """
+    return (resolver or LinkResolver()).resolve(source_file, target)
 
-def lint_markdown_file(path: Path) -> LintResult:
-    """Lint a markdown file for broken links."""
-    result = LintResult(str(path))
 
-    try:
-        content = path.read_text()
-    except Exception as e:
-        result.links.append(LinkResult(
-            source_file=str(path),
-            link_text="",
-            link_target="",
-            line_number=0,
-            is_valid=False,
-            error=f"Cannot read file: {e}"
-        ))
-        return result
-
-    lines = content.split("\n")
+def prose_lines(content: str) -> Iterator[Tuple[int, str]]:
+    """(line number, line) for lines outside fenced code blocks."""
     in_code_block = False
 
-    for line_num, line in enumerate(lines, 1):
+    for line_num, line in enumerate(content.split("\n"), 1):
         # Track fenced code blocks (``` or ~~~)
         stripped = line.strip()
         if stripped.startswith("```") or stripped.startswith("~~~"):
@@ -150,10 +312,16 @@ def lint_markdown_file(path: Path) -> LintResult:
             continue
 
         # Skip lines inside code blocks (template examples, not real links)
-        if in_code_block:
-            continue
+        if not in_code_block:
+            yield line_num, line
+
 
-        # Check markdown links
+def extract_links(content: str) -> List[Tuple[int, str, str]]:
+    """(line number, link text, target) for every link and reference mention in content."""
+    links = []
+
+    for line_num, line in prose_lines(content):
+        # Markdown links
         for match in MARKDOWN_LINK_PATTERN.finditer(line):
             link_text, link_target = match.groups()
 
@@ -161,19 +329,9 @@ def lint_markdown_file(path: Path) -> LintResult:
             if link_target.startswith("mailto:"):
                 continue
 
-            is_valid, error, suggestion = resolve_link(path, link_target)
-
-            result.links.append(LinkResult(
-                source_file=str(path),
-                link_text=link_text,
-                link_target=link_target,
-                line_number=line_num,
-                is_valid=is_valid,
-                error=error,
-                suggestion=suggestion
-            ))
+            links.append((line_num, link_text, link_target))
 
-        # Check reference mentions in backticks
+        # Reference mentions in backticks
         for match in REFERENCE_MENTION_PATTERN.finditer(line):
             ref_path = match.group(1)
             match_start = match.start()
@@ -184,93 +342,341 @@ def lint_markdown_file(path: Path) -> LintResult:
             if prefix.count('"') % 2 == 1 or prefix.count("'") % 2 == 1:
                 continue  # Inside a quoted string - this is a syntax example
 
-            is_valid, error, suggestion = resolve_link(path, ref_path)
+            links.append((line_num, f"`{ref_path}`", ref_path))
+
+    return links
+
+
+def extract_command_refs(content: str) -> List[Tuple[int, str]]:
+    """(line number, name) for every /command reference outside code and URLs.
+
+    Inline code counts only when the whole span is an invocation such as
+    `/name args`; other code spans (`ls /tmp`) are skipped.
+    """
+    refs = []
+    for line_num, line in prose_lines(content):
+        code_refs = []
+
+        def strip_code(match: "re.Match[str]") -> str:
+            command = CODE_COMMAND_PATTERN.match(match.group(2).strip())
+            if command:
+                code_refs.append((match.start(), command.group(1)))
+            return " "
 
+        line = INLINE_CODE_PATTERN.sub(strip_code, line)
+        # Link targets and URLs are paths, not commands
+        line = MARKDOWN_LINK_PATTERN.sub(lambda m: f"[{m.group(1)}]()", line)
+        line = URL_SPAN_PATTERN.sub("", line)
+        prose_refs = [(m.start(), m.group(1)) for m in SKILL_REFERENCE_PATTERN.finditer(line)]
+        refs.extend((line_num, name) for _, name in sorted(code_refs + prose_refs))
+    return refs
+
+
+@dataclass
+class CommandIndex:
+    """Every name a slash command can use in one tree.
+
+    Skills are indexed by directory name and frontmatter name, commands by
+    file stem, and components of a plugin also as plugin:name.
+    """
+    names: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def build(cls, inventory: Inventory,
+              plugin_roots: Optional[List[Path]] = None) -> "CommandIndex":
+        """Index for inventory's tree plus installed plugins.
+
+        plugin_roots defaults to the plugins under ~/.claude/plugins/cache,
+        which tree walks skip but whose components are invocable everywhere.
+        """
+        index = cls(set(BUILTIN_COMMANDS))
+        index.add_tree(inventory)
+        if plugin_roots is None:
+            plugin_roots = installed_plugin_roots()
+        for root in plugin_roots:
+            index.add_tree(get_inventory(root))
+        return index
+
+    def add_tree(self, inventory: Inventory) -> None:
+        """Add the skills and commands of one tree, and of plugins in it."""
+        plugin_names = {root: plugin_name(root) for root in inventory.plugin_roots}
+
+        def plugin_of(path: Path) -> Optional[str]:
+            for root, name in plugin_names.items():
+                if root in path.parents:
+                    return name
+            return None
+
+        components = []
+        for skill_md in inventory.skills:
+            names = {skill_md.parent.name}
+            try:
+                frontmatter = read_frontmatter(skill_md)
+            except OSError:
+                frontmatter = None
+            declared = frontmatter.scalar("name") if frontmatter else None
+            if declared:
+                names.add(declared)
+            components.append((skill_md, names))
+
+        command_files = list(inventory.commands)
+        for root in inventory.plugin_roots:
+            command_files.extend(inventory.files_in(root / "commands"))
+        components.extend((path, {path.stem}) for path in command_files)
+
+        for path, names in components:
+            plugin = plugin_of(path)
+            for name in names:
+                self.names.add(name.lower())
+                if plugin:
+                    self.names.add(f"{plugin}:{name}".lower())
+
+    def check(self, name: str) -> Tuple[bool, str]:
+        """(is_known, suggestion) for a slash command name."""
+        if name in self.names:
+            return True, ""
+        plugin, sep, _ = name.rpartition(":")
+        candidates = [n for n in self.names if n.startswith(plugin + ":")] if sep else self.names
+        closest = difflib.get_close_matches(name, sorted(candidates), n=1, cutoff=0.7)
+        return False, f"Try: /{closest[0]}" if closest else ""
+
+
+def installed_plugin_roots(claude_dir: Path = CLAUDE_DIR) -> List[Path]:
+    """Plugins installed under claude_dir/plugins/cache."""
+    cache = claude_dir / "plugins" / "cache"
+    return find_plugin_roots(cache) if cache.is_dir() else []
+
+
+def command_index_for(path: Path) -> Optional[CommandIndex]:
+    """Index for the nearest ~/.claude-style or plugin root above path, if any."""
+    for directory in path.resolve().parents:
+        if directory.name == ".claude" or (directory / ".claude-plugin" / "plugin.json").is_file():
+            return CommandIndex.build(get_inventory(directory))
+    return None
+
+
+def lint_markdown_file(path: Path, resolver: Optional[LinkResolver] = None,
+                       commands: Optional[CommandIndex] = None) -> LintResult:
+    """Lint a markdown file for broken links.
+
+    Given an index, /command references are checked too; unknown names are
+    warnings rather than broken links, since prose slashes can be ambiguous.
+    """
+    result = LintResult(str(path))
+    if resolver is None:
+        resolver = LinkResolver()
+
+    try:
+        content = path.read_text()
+    except Exception as e:
+        result.links.append(LinkResult(
+            source_file=str(path),
+            link_text="",
+            link_target="",
+            line_number=0,
+            is_valid=False,
+            error=f"Cannot read file: {e}"
+        ))
+        return result
+
+    for line_num, link_text, link_target in extract_links(content):
+        is_valid, error, suggestion = resolver.resolve(path, link_target)
+
+        result.links.append(LinkResult(
+            source_file=str(path),
+            link_text=link_text,
+            link_target=link_target,
+            line_number=line_num,
+            is_valid=is_valid,
+            error=error,
+            suggestion=suggestion
+        ))
+
+    if commands is not None:
+        for line_num, name in extract_command_refs(content):
+            is_known, suggestion = commands.check(name)
             result.links.append(LinkResult(
                 source_file=str(path),
-                link_text=f"`{ref_path}`",
-                link_target=ref_path,
+                link_text=f"/{name}",
+                link_target=f"/{name}",
                 line_number=line_num,
-                is_valid=is_valid,
-                error=error,
-                suggestion=suggestion
+                is_valid=True,
+                suggestion=suggestion,
+                warning="" if is_known else f"Unknown skill or command: /{name}"
             ))
+        result.links.sort(key=lambda link: link.line_number)
 
     return result
 
 
-def lint_skill(path: Path) -> List[LintResult]:
+def lint_skill(path: Path, inventory: Optional[Inventory] = None,
+               resolver: Optional[LinkResolver] = None,
+               commands: Optional[CommandIndex] = None) -> List[LintResult]:
     """Lint a skill and its references directory."""
-    results = [lint_markdown_file(path)]
+    resolver = resolver or LinkResolver()
+    results = [lint_markdown_file(path, resolver, commands)]
+
+    if inventory is not None:
+        ref_files = inventory.references_for(path)
+    else:
+        references_dir = path.parent / "references"
+        ref_files = list(references_dir.glob("*.md")) if references_dir.exists() else []
 
-    references_dir = path.parent / "references"
-    if references_dir.exists():
-        for ref_file in references_dir.glob("*.md"):
-            results.append(lint_markdown_file(ref_file))
+    for ref_file in ref_files:
+        results.append(lint_markdown_file(ref_file, resolver, commands))
 
     return results
 
 
-def lint_plugin(path: Path) -> List[LintResult]:
+def lint_plugin(path: Path, inventory: Optional[Inventory] = None,
+                resolver: Optional[LinkResolver] = None,
+                commands: Optional[CommandIndex] = None) -> List[LintResult]:
     """Lint all markdown files in a plugin."""
     results = []
+    if inventory is None:
+        inventory = get_inventory(path)
+    resolver = resolver or LinkResolver()
 
-    for md_file in path.rglob("*.md"):
-        results.append(lint_markdown_file(md_file))
+    for md_file in inventory.files_under(path, ".md"):
+        results.append(lint_markdown_file(md_file, resolver, commands))
 
     return results
 
 
-def find_and_lint_all(base_dir: Path) -> List[LintResult]:
-    """Find and lint all extensions."""
-    results = []
+def find_lint_targets(base_dir: Path, scope: Optional[ChangedScope] = None) -> List[Path]:
+    """Find every markdown file that --all lints.
+
+    With a scope, keep changed files plus the SKILL.md of any skill whose
+    files changed, so a deleted reference is reported from its skill.
+    """
+    targets = []
+    inventory = get_inventory(base_dir)
 
-    # Skills
-    for skill_md in base_dir.rglob("SKILL.md"):
-        results.extend(lint_skill(skill_md))
+    # Skills and their references
+    for skill_md in inventory.skills:
+        targets.append(skill_md)
+        targets.extend(inventory.references_for(skill_md))
 
     # Agents
-    agents_dir = base_dir / "agents"
-    if agents_dir.exists():
-        for agent in agents_dir.glob("*.md"):
-            results.append(lint_markdown_file(agent))
+    targets.extend(inventory.agents)
 
     # Commands
-    commands_dir = base_dir / "commands"
-    if commands_dir.exists():
-        for cmd in commands_dir.glob("*.md"):
-            results.append(lint_markdown_file(cmd))
+    targets.extend(inventory.commands)
 
     # Plugins
-    plugins_dir = base_dir / "plugins"
-    if plugins_dir.exists():
-        for item in plugins_dir.iterdir():
-            if item.is_dir() and (item / ".claude-plugin").exists():
-                results.extend(lint_plugin(item))
+    for item in inventory.plugins:
+        targets.extend(inventory.files_under(item, ".md"))
 
     # CLAUDE.md files
-    for claude_md in base_dir.rglob("CLAUDE.md"):
-        results.append(lint_markdown_file(claude_md))
+    targets.extend(inventory.claude_md)
 
-    return results
+    if scope is not None:
+        targets = [t for t in targets if scope.includes(t)]
+
+    return targets
+
+
+def find_and_lint_all(base_dir: Path, scope: Optional[ChangedScope] = None) -> List[LintResult]:
+    """Find and lint all extensions, sharing one resolver and command index across files."""
+    resolver = LinkResolver()
+    commands = CommandIndex.build(get_inventory(base_dir))
+    return [lint_markdown_file(path, resolver, commands)
+            for path in find_lint_targets(base_dir, scope)]
+
+
+def check_external_links(results: List[LintResult], ttl: float = DEFAULT_TTL,
+                         jobs: int = DEFAULT_JOBS) -> None:
+    """Check every http(s) link once across all files, marking unreachable ones broken."""
+    links = [link for result in results for link in result.links
+             if link.is_valid and is_url(link.link_target)]
+    if not links:
+        return
+
+    cache = UrlCache.load(URL_CACHE_PATH, ttl)
+    statuses = check_urls([link.link_target for link in links], cache, jobs)
+    cache.save()
+
+    for link in links:
+        status = statuses[link.link_target]
+        if not status.ok:
+            link.is_valid = False
+            link.error = f"URL unreachable: {status.error}"
+
+
+def link_target_path(source_file: Path, target: str) -> Optional[str]:
+    """Normalized path a local link points at, or None for URLs and anchors."""
+    if is_url(target) or target.startswith("#") or target.startswith("mailto:"):
+        return None
+    target = target.split("#")[0]
+    if not target:
+        return None
+    return os.path.normpath(os.path.join(source_file.parent, target))
+
+
+def watch_lint(base_dir: Path, interval: float = DEFAULT_INTERVAL) -> None:
+    """Re-lint changed files and every file that links to them."""
+    # Target path -> source files that link to it, valid or not, so creating
+    # a missing file also re-checks the links that pointed at it
+    linked_from: Dict[str, Set[str]] = {}
+
+    def record(result: LintResult) -> Set[str]:
+        for link in result.links:
+            target = link_target_path(Path(result.path), link.link_target)
+            if target:
+                linked_from.setdefault(target, set()).add(result.path)
+        return {
+            f"{link.link_text} -> {link.error or link.warning}"
+            for link in result.links if not link.is_valid or link.warning
+        }
+
+    def run_full() -> Findings:
+        linked_from.clear()
+        return {result.path: record(result) for result in find_and_lint_all(base_dir)}
+
+    def run_changed(changed: Set[Path]) -> Findings:
+        scope = {str(p) for p in find_lint_targets(base_dir)}
+        recheck = set()
+        for path in changed:
+            key = str(path)
+            recheck.add(key)
+            recheck.update(linked_from.get(key, ()))
+
+        findings = {}
+        resolver = LinkResolver()
+        commands = CommandIndex.build(get_inventory(base_dir))
+        for key in recheck:
+            if key in scope:
+                findings[key] = record(lint_markdown_file(Path(key), resolver, commands))
+            else:
+                # Deleted or out of scope: clear anything reported earlier
+                findings[key] = set()
+        return findings
+
+    watch(base_dir, run_full, run_changed, interval)
 
 
 def print_results(results: List[LintResult], show_valid: bool = False) -> int:
     """Print lint results and return exit code."""
     total_broken = 0
+    total_warnings = 0
     total_links = 0
 
     for result in results:
         broken = [link for link in result.links if not link.is_valid]
+        warnings = [link for link in result.links if link.warning]
         total_broken += len(broken)
+        total_warnings += len(warnings)
         total_links += len(result.links)
 
-        if broken:
+        if broken or warnings:
             print(f"\n{result.path}:")
-            for link in broken:
+            for link in sorted(broken + warnings, key=lambda link: link.line_number):
                 print(f"  Line {link.line_number}: {link.link_text}")
-                print(f"    Target: {link.link_target}")
-                print(f"    Error: {link.error}")
+                if link.is_valid:
+                    print(f"    Warning: {link.warning}")
+                else:
+                    print(f"    Target: {link.link_target}")
+                    print(f"    Error: {link.error}")
                 if link.suggestion:
                     print(f"    Suggestion: {link.suggestion}")
 
@@ -280,6 +686,8 @@ def print_results(results: List[LintResult], show_valid: bool = False) -> int:
     print(f"\n{'='*50}")
     print(f"Checked {total_links} links in {len(results)} files")
     print(f"Found {total_broken} broken links")
+    if total_warnings:
+        print(f"Warnings: {total_warnings} unknown /command references")
 
     return 1 if total_broken > 0 else 0
 
@@ -290,12 +698,42 @@ def main():
     parser.add_argument("--all", action="store_true", help="Lint all extensions in ~/.claude")
     parser.add_argument("--verbose", "-v", action="store_true", help="Show valid links too")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-lint files as they change")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Seconds between polls in --watch mode")
+    parser.add_argument("--changed-since", metavar="REV",
+                        help="Only lint files changed since git REV and their skills")
+    parser.add_argument("--check-urls", action="store_true",
+                        help="Also check that external http(s) links respond")
+    parser.add_argument("--url-ttl", type=float, default=DEFAULT_TTL,
+                        help=f"Seconds to reuse cached URL results; 0 rechecks (default: {DEFAULT_TTL})")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS,
+                        help=f"Concurrent URL checks with --check-urls (default: {DEFAULT_JOBS})")
 
     args = parser.parse_args()
 
     results = []
 
-    if args.all:
+    if args.watch:
+        if args.check_urls:
+            print("Error: --check-urls cannot be combined with --watch", file=sys.stderr)
+            sys.exit(2)
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not base_dir.is_dir():
+            print(f"Error: --watch needs --all or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(2)
+        watch_lint(base_dir, args.interval)
+        sys.exit(0)
+
+    if args.changed_since:
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not base_dir.is_dir():
+            print(f"Error: --changed-since needs --all or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(2)
+        scope = scope_from_args(base_dir, args.changed_since)
+        results = find_and_lint_all(base_dir, scope)
+    elif args.all:
         results = find_and_lint_all(CLAUDE_DIR)
     elif args.path:
         path = Path(args.path)
@@ -304,22 +742,27 @@ def main():
             sys.exit(2)
 
         if path.is_file():
+            commands = command_index_for(path)
             if path.name == "SKILL.md":
-                results = lint_skill(path)
+                results = lint_skill(path, commands=commands)
             else:
-                results = [lint_markdown_file(path)]
+                results = [lint_markdown_file(path, commands=commands)]
         else:
             results = find_and_lint_all(path)
     else:
         parser.print_help()
         sys.exit(2)
 
+    if args.check_urls:
+        check_external_links(results, args.url_ttl, args.jobs)
+
     if args.json:
         output = []
         for result in results:
             output.append({
                 "path": result.path,
                 "broken_count": result.broken_count,
+                "warning_count": result.warning_count,
                 "links": [
                     {
                         "text": link.link_text,
@@ -328,9 +771,10 @@ def main():
                         "valid": link.is_valid,
                         "error": link.error,
                         "suggestion": link.suggestion,
+                        "warning": link.warning,
                     }
                     for link in result.links
-                    if not link.is_valid or args.verbose
+                    if not link.is_valid or link.warning or args.verbose
                 ]
             })
         print(json.dumps(output, indent=2))
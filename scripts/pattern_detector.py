@@ -8,6 +8,13 @@ Usage:
     python pattern_detector.py <path>           # Check single file/directory
     python pattern_detector.py --all            # Check all extensions
     python pattern_detector.py --severity error # Only show errors
+    python pattern_detector.py --all --watch    # Re-check files as they change
+    python pattern_detector.py . --changed-since origin/main  # Only changed files
+    python pattern_detector.py --all --max-file-kb 1024       # Skip files over 1 MB
+
+Files are streamed in line-aligned chunks (memory-mapped when large), so
+memory stays flat regardless of file size. Binary files and files over the
+size cap are skipped and listed in the report.
 
 Exit codes:
     0 - No deprecated patterns found
@@ -17,11 +24,17 @@ Exit codes:
 
 import argparse
 import json
+import mmap
+import os
 import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from git_scope import ChangedScope, scope_from_args
+from inventory import get_inventory
+from watch import DEFAULT_INTERVAL, Findings, watch
 
 SCRIPT_DIR = Path(__file__).parent
 TOOLKIT_ROOT = SCRIPT_DIR.parent
@@ -29,6 +42,18 @@ CLAUDE_DIR = Path.home() / ".claude"
 
 MANIFEST_PATH = TOOLKIT_ROOT / "data" / "version-manifest.json"
 
+# Files larger than this are skipped unless --max-file-kb says otherwise
+DEFAULT_MAX_FILE_KB = 4096
+
+# Files at least this large are memory-mapped instead of read
+MMAP_MIN_BYTES = 1024 * 1024
+
+# Text is scanned in chunks of about this size, cut at line boundaries
+SCAN_CHUNK_BYTES = 256 * 1024
+
+# A NUL byte in the first block marks a file as binary
+BINARY_SNIFF_BYTES = 8192
+
 
 @dataclass
 class PatternMatch:
@@ -47,6 +72,8 @@ class DetectionResult:
     """Result of pattern detection for a file."""
     file_path: str
     matches: List[PatternMatch] = field(default_factory=list)
+    skipped: Optional[str] = None  # "oversized" or "binary"
+    size: int = 0
 
     @property
     def has_errors(self) -> bool:
@@ -69,70 +96,318 @@ def load_deprecations() -> List[dict]:
     return manifest.get("deprecations", [])
 
 
-def check_file(path: Path, deprecations: List[dict]) -> DetectionResult:
-    """Check a file for deprecated patterns."""
+# `$NAME` in a manifest pattern means the literal shell variable; as a regex
+# the `$` would be an end anchor and the pattern could never match
+SHELL_VARIABLE = re.compile(r"(?<!\\)\$(?=[A-Za-z_])")
+
+# Characters that end a run of literal text in a pattern
+REGEX_SPECIAL = set(".^$*+?{}[]()|\\")
+
+# Shortest literal worth using as a prefilter
+MIN_PREFILTER_LITERAL = 3
+
+
+@dataclass
+class CompiledDeprecation:
+    """A manifest deprecation with its regex and prefilter literal."""
+    index: int
+    pattern: str
+    replacement: str
+    severity: str
+    since: str
+    regex: "re.Pattern"
+    literal: Optional[str]
+
+
+def _pattern_source(pattern: str) -> str:
+    """Regex source for a manifest pattern; invalid regexes match literally."""
+    source = SHELL_VARIABLE.sub(r"\\$", pattern)
+    try:
+        # Compiled as a group because it is combined with the other patterns
+        re.compile(f"(?:{source})")
+    except re.error:
+        source = re.escape(pattern)
+    return source
+
+
+def required_literal(source: str) -> Optional[str]:
+    """Longest lowercase substring every match of source must contain.
+
+    Only simple patterns are analysed: alternation, groups, classes and
+    escapes other than escaped punctuation give up and return None, which
+    means the pattern cannot be prefiltered.
+    """
+    if any(c in source for c in "|([") or re.search(r"\\[A-Za-z0-9]", source):
+        return None
+
+    runs = []
+    current = []
+    i = 0
+    while i < len(source):
+        c = source[i]
+        if c == "\\" and i + 1 < len(source):
+            c = source[i + 1]
+            i += 1
+        elif c in REGEX_SPECIAL:
+            runs.append("".join(current))
+            current = []
+            i += 1
+            continue
+        nxt = source[i + 1] if i + 1 < len(source) else ""
+        if nxt in ("*", "?", "{"):
+            # The character is optional or repeated a variable number of times
+            runs.append("".join(current))
+            current = []
+        else:
+            current.append(c)
+        i += 1
+    runs.append("".join(current))
+
+    longest = max(runs, key=len)
+    return longest.lower() if len(longest) >= MIN_PREFILTER_LITERAL else None
+
+
+class DeprecationScanner:
+    """All manifest deprecations compiled once and matched in a single pass.
+
+    Each file is first checked for the literal text every match must contain;
+    deprecations whose literal is absent are skipped. The remaining ones are
+    combined into one alternation of named groups (d0, d1, ...) and the file
+    content is searched once. A hit names the first deprecation matching at
+    that position; the other candidates are then checked on that line alone,
+    so a line matching several deprecations reports each of them, exactly as
+    testing every pattern against every line would.
+    """
+
+    def __init__(self, deprecations: List[dict]):
+        self.deprecations = []
+        for index, entry in enumerate(deprecations):
+            source = _pattern_source(entry["pattern"])
+            self.deprecations.append(CompiledDeprecation(
+                index=index,
+                pattern=entry["pattern"],
+                replacement=entry.get("replacement", "see documentation"),
+                severity=entry.get("severity", "warning"),
+                since=entry.get("since", "unknown"),
+                regex=re.compile(source, re.IGNORECASE),
+                literal=required_literal(source),
+            ))
+        self._combined: Dict[Tuple[int, ...], "re.Pattern"] = {}
+
+    def _combined_regex(self, candidates: Tuple[int, ...]) -> "re.Pattern":
+        regex = self._combined.get(candidates)
+        if regex is None:
+            regex = re.compile(
+                "|".join(f"(?P<d{i}>{self.deprecations[i].regex.pattern})" for i in candidates),
+                re.IGNORECASE | re.MULTILINE,
+            )
+            self._combined[candidates] = regex
+        return regex
+
+    def scan(self, content: str, first_line: int = 1) -> List[Tuple[CompiledDeprecation, int, str]]:
+        """(deprecation, line number, line) for every match, in manifest then line order.
+
+        first_line numbers the first line of content, for scanning a file in chunks.
+        """
+        lowered = None
+        candidates = []
+        for dep in self.deprecations:
+            if dep.literal is not None:
+                if lowered is None:
+                    lowered = content.lower()
+                if dep.literal not in lowered:
+                    continue
+            candidates.append(dep.index)
+        if not candidates:
+            return []
+
+        regex = self._combined_regex(tuple(candidates))
+        hits = []
+        pos = 0
+        line_number = first_line
+        line_start = 0
+        while True:
+            match = regex.search(content, pos)
+            if match is None:
+                break
+            start = match.start()
+            line_number += content.count("\n", line_start, start)
+            line_start = content.rfind("\n", 0, start) + 1
+            line_end = content.find("\n", start)
+            if line_end == -1:
+                line_end = len(content)
+            line = content[line_start:line_end]
+
+            first = int(match.lastgroup[1:])
+            for i in candidates:
+                # A match may span lines; confirm every candidate on this line
+                if i == first and match.end() <= line_end or self.deprecations[i].regex.search(line):
+                    hits.append((self.deprecations[i], line_number, line))
+
+            if line_end == len(content):
+                break
+            pos = line_end + 1
+
+        hits.sort(key=lambda hit: (hit[0].index, hit[1]))
+        return hits
+
+
+def iter_text_chunks(data, chunk_bytes: int = SCAN_CHUNK_BYTES) -> Iterator[Tuple[int, str]]:
+    """Yield (first line number, text) for line-aligned chunks of a bytes-like buffer.
+
+    Chunks end just after a newline, so no line is split and UTF-8 sequences
+    stay whole; a line longer than chunk_bytes is yielded in one piece.
+    """
+    line_number = 1
+    start = 0
+    size = len(data)
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        if end < size:
+            newline = data.rfind(b"\n", start, end)
+            if newline == -1:
+                newline = data.find(b"\n", end)
+            end = size if newline == -1 else newline + 1
+        chunk = data[start:end]
+        yield line_number, chunk.decode("utf-8", errors="replace")
+        line_number += chunk.count(b"\n")
+        start = end
+
+
+def check_file(
+    path: Path,
+    deprecations: Union[DeprecationScanner, List[dict]],
+    max_bytes: Optional[int] = DEFAULT_MAX_FILE_KB * 1024,
+) -> DetectionResult:
+    """Check a file for deprecated patterns.
+
+    Files over max_bytes (None for no cap) and binary files are not scanned;
+    the result records why in `skipped`.
+    """
     result = DetectionResult(str(path))
 
+    if not isinstance(deprecations, DeprecationScanner):
+        deprecations = DeprecationScanner(deprecations)
+
     try:
-        content = path.read_text()
-    except Exception as e:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            result.size = size
+            if max_bytes is not None and size > max_bytes:
+                result.skipped = "oversized"
+                return result
+            if size == 0:
+                return result
+            if b"\0" in f.read(BINARY_SNIFF_BYTES):
+                result.skipped = "binary"
+                return result
+            f.seek(0)
+            if size >= MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    hits = _scan_chunks(deprecations, data)
+            else:
+                hits = _scan_chunks(deprecations, f.read())
+    except (OSError, ValueError) as e:
         print(f"Warning: Cannot read {path}: {e}", file=sys.stderr)
         return result
 
-    lines = content.split("\n")
-
-    for deprecation in deprecations:
-        pattern = deprecation["pattern"]
-        replacement = deprecation.get("replacement", "see documentation")
-        severity = deprecation.get("severity", "warning")
-        since = deprecation.get("since", "unknown")
-
-        try:
-            regex = re.compile(pattern, re.IGNORECASE)
-        except re.error:
-            # Treat as literal string match
-            regex = re.compile(re.escape(pattern), re.IGNORECASE)
-
-        for line_num, line in enumerate(lines, 1):
-            if regex.search(line):
-                match = PatternMatch(
-                    file_path=str(path),
-                    line_number=line_num,
-                    line_content=line.strip()[:80],
-                    pattern=pattern,
-                    replacement=replacement,
-                    severity=severity,
-                    since=since,
-                )
-                result.matches.append(match)
+    for dep, line_number, line in hits:
+        result.matches.append(PatternMatch(
+            file_path=str(path),
+            line_number=line_number,
+            line_content=line.strip()[:80],
+            pattern=dep.pattern,
+            replacement=dep.replacement,
+            severity=dep.severity,
+            since=dep.since,
+        ))
 
     return result
 
 
-def find_extension_files(base_dir: Path) -> List[Path]:
-    """Find all extension files to check."""
+def _scan_chunks(scanner: DeprecationScanner, data) -> List[Tuple[CompiledDeprecation, int, str]]:
+    hits = []
+    for first_line, text in iter_text_chunks(data):
+        hits.extend(scanner.scan(text, first_line))
+    hits.sort(key=lambda hit: (hit[0].index, hit[1]))
+    return hits
+
+
+def find_extension_files(base_dir: Path, scope: Optional[ChangedScope] = None) -> List[Path]:
+    """Find all extension files to check, or only changed ones when scoped."""
+    inventory = get_inventory(base_dir)
     files = []
 
     # Markdown files (skills, agents, commands)
-    for md_file in base_dir.rglob("*.md"):
-        files.append(md_file)
+    files.extend(inventory.markdown)
 
     # Shell scripts (hooks)
-    for sh_file in base_dir.rglob("*.sh"):
-        files.append(sh_file)
+    files.extend(inventory.shell)
 
     # JSON files (settings, hooks config)
-    for json_file in base_dir.rglob("*.json"):
+    for json_file in inventory.json_files:
         # Skip manifest and package files
         if json_file.name not in ["package.json", "package-lock.json"]:
             files.append(json_file)
 
+    if scope is not None:
+        files = [f for f in files if f in scope.files]
+
     return files
 
 
+def watch_patterns(
+    base_dir: Path,
+    scanner: DeprecationScanner,
+    severity_filter: Optional[str] = None,
+    interval: float = DEFAULT_INTERVAL,
+    max_bytes: Optional[int] = DEFAULT_MAX_FILE_KB * 1024,
+) -> None:
+    """Re-check changed extension files for deprecated patterns."""
+    def findings_of(result: DetectionResult) -> Set[str]:
+        return {
+            f"[{m.severity.upper()}] {m.pattern} -> {m.replacement}: {m.line_content}"
+            for m in result.matches
+            if not severity_filter or m.severity == severity_filter
+        }
+
+    def run_full() -> Findings:
+        return {
+            str(f): findings_of(check_file(f, scanner, max_bytes))
+            for f in find_extension_files(base_dir)
+        }
+
+    def run_changed(changed: Set[Path]) -> Findings:
+        scope = set(find_extension_files(base_dir))
+        return {
+            str(path): findings_of(check_file(path, scanner, max_bytes)) if path in scope else set()
+            for path in changed
+        }
+
+    watch(base_dir, run_full, run_changed, interval)
+
+
+def describe_skip(result: DetectionResult, max_bytes: Optional[int]) -> str:
+    """Report line for a file that was not scanned."""
+    if result.skipped == "oversized" and max_bytes is not None:
+        return (f"oversized, skipped ({result.size / 1024:.0f} KB > "
+                f"{max_bytes / 1024:.0f} KB cap)")
+    return f"{result.skipped}, skipped"
+
+
+def print_skipped(results: List[DetectionResult], max_bytes: Optional[int]) -> None:
+    skipped = [r for r in results if r.skipped]
+    if not skipped:
+        return
+    print(f"\nSkipped {len(skipped)} files:")
+    for r in skipped:
+        print(f"  {r.file_path}: {describe_skip(r, max_bytes)}")
+
+
 def print_results(
     results: List[DetectionResult],
-    severity_filter: Optional[str] = None
+    severity_filter: Optional[str] = None,
+    max_bytes: Optional[int] = DEFAULT_MAX_FILE_KB * 1024,
 ) -> int:
     """Print detection results and return exit code."""
     has_issues = False
@@ -155,6 +430,8 @@ def print_results(
             print(f"    Replace with: {match.replacement}")
             print(f"    Deprecated since: v{match.since}")
 
+    print_skipped(results, max_bytes)
+
     if has_issues:
         error_count = sum(
             1 for r in results for m in r.matches if m.severity == "error"
@@ -187,6 +464,22 @@ def main():
         "--json", action="store_true",
         help="Output as JSON"
     )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running and re-check files as they change"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_INTERVAL,
+        help="Seconds between polls in --watch mode"
+    )
+    parser.add_argument(
+        "--changed-since", metavar="REV",
+        help="Only check files changed since git REV"
+    )
+    parser.add_argument(
+        "--max-file-kb", type=int, default=DEFAULT_MAX_FILE_KB,
+        help=f"Skip files larger than this many KB, 0 for no limit (default: {DEFAULT_MAX_FILE_KB})"
+    )
 
     args = parser.parse_args()
 
@@ -194,13 +487,31 @@ def main():
     if not deprecations:
         print("No deprecation patterns loaded. Check version-manifest.json.")
         sys.exit(0)
+    scanner = DeprecationScanner(deprecations)
+    max_bytes = args.max_file_kb * 1024 if args.max_file_kb > 0 else None
 
     results = []
 
-    if args.all:
+    if args.watch:
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not base_dir.is_dir():
+            print(f"Error: --watch needs --all or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(2)
+        watch_patterns(base_dir, scanner, args.severity, args.interval, max_bytes)
+        sys.exit(0)
+
+    if args.changed_since:
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not base_dir.is_dir():
+            print(f"Error: --changed-since needs --all or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(2)
+        scope = scope_from_args(base_dir, args.changed_since)
+        for f in find_extension_files(base_dir, scope):
+            results.append(check_file(f, scanner, max_bytes))
+    elif args.all:
         files = find_extension_files(CLAUDE_DIR)
         for f in files:
-            results.append(check_file(f, deprecations))
+            results.append(check_file(f, scanner, max_bytes))
     elif args.path:
         path = Path(args.path)
         if not path.exists():
@@ -208,11 +519,11 @@ def main():
             sys.exit(2)
 
         if path.is_file():
-            results.append(check_file(path, deprecations))
+            results.append(check_file(path, scanner, max_bytes))
         else:
             files = find_extension_files(path)
             for f in files:
-                results.append(check_file(f, deprecations))
+                results.append(check_file(f, scanner, max_bytes))
     else:
         parser.print_help()
         sys.exit(2)
@@ -235,10 +546,17 @@ def main():
                         for m in r.matches
                     ]
                 })
+            elif r.skipped:
+                output.append({
+                    "file": r.file_path,
+                    "skipped": r.skipped,
+                    "size": r.size,
+                    "matches": [],
+                })
         print(json.dumps(output, indent=2))
         sys.exit(1 if any(r.has_errors for r in results) else 0)
     else:
-        sys.exit(print_results(results, args.severity))
+        sys.exit(print_results(results, args.severity, max_bytes))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Check that skill reference files are reachable, and how deeply.
+
+Builds a link graph of every markdown file in the tree from the links and
+`references/...` mentions lint_references.py extracts, then walks it from
+each SKILL.md entry point. Reports:
+
+    orphans   reference files no SKILL.md reaches; they are never read but
+              still counted by token_counter.py
+    deep      files only reachable through another reference (more than one
+              hop from SKILL.md); Claude follows these less reliably than
+              links from SKILL.md itself
+    cycles    groups of references that link to each other in a loop
+              (links back to a SKILL.md are navigation and not counted)
+
+Candidate reference files are the markdown files inside a skill directory
+other than SKILL.md, and any file in a references/ directory.
+
+Each file's resolved link list is cached in data/cache/link-graph.json by
+mtime and size, so later runs only re-read files that changed.
+
+Usage:
+    python reference_graph.py <path>        # Check a directory
+    python reference_graph.py --all         # Check ~/.claude
+    python reference_graph.py --all --verbose  # Per-skill reachability
+    python reference_graph.py --all --json
+
+Exit codes:
+    0 - No orphaned reference files
+    1 - Orphaned reference files found
+    2 - Usage error
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from inventory import Inventory, get_inventory
+from lint_references import extract_links, link_target_path
+from tokenizer import DEFAULT_ESTIMATOR, ESTIMATORS, count_tokens_many
+
+SCRIPT_DIR = Path(__file__).parent
+TOOLKIT_ROOT = SCRIPT_DIR.parent
+
+CLAUDE_DIR = Path.home() / ".claude"
+CACHE_PATH = TOOLKIT_ROOT / "data" / "cache" / "link-graph.json"
+CACHE_VERSION = 1
+
+# Hops from SKILL.md beyond which a reference counts as deep
+MAX_DEPTH = 1
+
+
+@dataclass
+class SkillReach:
+    """Files reachable from one SKILL.md."""
+    skill: str
+    reachable: int = 0
+    max_depth: int = 0
+
+
+@dataclass
+class ReferenceGraph:
+    """Link graph over the markdown files of one tree."""
+    base_dir: Path
+    edges: Dict[str, List[str]] = field(default_factory=dict)  # file -> linked files
+    entry_points: List[str] = field(default_factory=list)      # SKILL.md files
+    candidates: Set[str] = field(default_factory=set)          # Reference files
+    cached: int = 0
+    parsed: int = 0
+
+    @property
+    def link_count(self) -> int:
+        return sum(len(targets) for targets in self.edges.values())
+
+
+@dataclass
+class Reachability:
+    """Result of walking the graph from every entry point."""
+    depth: Dict[str, int] = field(default_factory=dict)
+    via: Dict[str, str] = field(default_factory=dict)  # file -> file that first linked it
+    skills: List[SkillReach] = field(default_factory=list)
+    orphans: List[str] = field(default_factory=list)
+    orphan_tokens: Dict[str, int] = field(default_factory=dict)
+    deep: List[str] = field(default_factory=list)
+    cycles: List[List[str]] = field(default_factory=list)
+
+    def chain(self, path: str) -> List[str]:
+        """Shortest link chain from a SKILL.md to path."""
+        chain = [path]
+        while chain[-1] in self.via:
+            chain.append(self.via[chain[-1]])
+        return chain[::-1]
+
+
+class LinkCache:
+    """Per-file resolved link lists, keyed by path and checked by mtime and size."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, path: Path = CACHE_PATH) -> "LinkCache":
+        cache = cls(path)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return cache
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            cache.entries = data.get("files", {})
+        return cache
+
+    def get(self, path: str, fingerprint: List[int]) -> Optional[List[str]]:
+        entry = self.entries.get(path)
+        if entry is not None and entry.get("fingerprint") == fingerprint:
+            return entry["targets"]
+        return None
+
+    def put(self, path: str, fingerprint: List[int], targets: List[str]) -> None:
+        self.entries[path] = {"fingerprint": fingerprint, "targets": targets}
+
+    def save(self, base_dir: Path, present: Set[str]) -> None:
+        """Write the cache atomically, dropping files under base_dir that are gone."""
+        prefix = str(base_dir) + os.sep
+        entries = {p: e for p, e in self.entries.items() if p in present or not p.startswith(prefix)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"version": CACHE_VERSION, "files": entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Cannot write link graph cache: {e}", file=sys.stderr)
+
+
+def file_links(path: Path) -> List[str]:
+    """Normalized paths of the local files path links to."""
+    try:
+        content = path.read_text(errors="replace")
+    except OSError:
+        return []
+    targets = []
+    for _, _, target in extract_links(content):
+        resolved = link_target_path(path, target)
+        if resolved and resolved != str(path) and resolved not in targets:
+            targets.append(resolved)
+    return targets
+
+
+def reference_candidates(inventory: Inventory) -> Set[str]:
+    """Markdown files that only make sense if a skill links to them."""
+    candidates = set()
+    for skill_md in inventory.skills:
+        for path in inventory.files_under(skill_md.parent, ".md"):
+            if path.name != "SKILL.md":
+                candidates.add(str(path))
+    for path in inventory.markdown:
+        if path.parent.name == "references":
+            candidates.add(str(path))
+    return candidates
+
+
+def build_graph(base_dir: Path, cache: Optional[LinkCache] = None) -> ReferenceGraph:
+    """Link graph of every markdown file under base_dir, reusing cached link lists."""
+    inventory = get_inventory(base_dir)
+    graph = ReferenceGraph(base_dir)
+    graph.entry_points = sorted(str(p) for p in inventory.skills)
+    graph.candidates = reference_candidates(inventory)
+
+    for path in inventory.markdown:
+        key = str(path)
+        st = inventory.stat(path)
+        fingerprint = [st.st_mtime_ns, st.st_size] if st else [0, 0]
+        targets = cache.get(key, fingerprint) if cache is not None and st else None
+        if targets is None:
+            targets = file_links(path)
+            graph.parsed += 1
+            if cache is not None and st:
+                cache.put(key, fingerprint, targets)
+        else:
+            graph.cached += 1
+        graph.edges[key] = targets
+
+    # Only links between files in the tree are edges
+    nodes = set(graph.edges)
+    for key, targets in graph.edges.items():
+        graph.edges[key] = [t for t in targets if t in nodes]
+    return graph
+
+
+def find_cycles(graph: ReferenceGraph) -> List[List[str]]:
+    """Strongly connected groups of two or more files, ignoring links into SKILL.md."""
+    entry_points = set(graph.entry_points)
+    edges = {k: [t for t in v if t not in entry_points] for k, v in graph.edges.items()}
+
+    # Iterative Tarjan
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    cycles = []
+    counter = 0
+
+    for root in sorted(edges):
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack.add(node)
+            targets = edges.get(node, [])
+            if i < len(targets):
+                work.append((node, i + 1))
+                target = targets[i]
+                if target not in index:
+                    work.append((target, 0))
+                elif target in on_stack:
+                    low[node] = min(low[node], index[target])
+                continue
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    cycles.append(sorted(component))
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+    return sorted(cycles)
+
+
+def bfs(graph: ReferenceGraph, sources: List[str]) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """Hop counts and first-discovering parent from the given sources."""
+    depth = {s: 0 for s in sources}
+    via: Dict[str, str] = {}
+    queue = deque(sources)
+    while queue:
+        node = queue.popleft()
+        for target in graph.edges.get(node, []):
+            if target not in depth:
+                depth[target] = depth[node] + 1
+                via[target] = node
+                queue.append(target)
+    return depth, via
+
+
+def analyze(graph: ReferenceGraph, estimator: str = DEFAULT_ESTIMATOR) -> Reachability:
+    """Reachability, disclosure depth, orphans and cycles for a graph."""
+    result = Reachability()
+    result.depth, result.via = bfs(graph, graph.entry_points)
+
+    for skill in graph.entry_points:
+        depth, _ = bfs(graph, [skill])
+        reached = [p for p in depth if p != skill]
+        result.skills.append(SkillReach(skill, len(reached), max(depth.values())))
+
+    result.orphans = sorted(graph.candidates - result.depth.keys())
+    result.deep = sorted((p for p in graph.candidates if result.depth.get(p, 0) > MAX_DEPTH),
+                         key=lambda p: (-result.depth[p], p))
+    result.cycles = find_cycles(graph)
+
+    texts = []
+    for path in result.orphans:
+        try:
+            texts.append(Path(path).read_text(errors="replace"))
+        except OSError:
+            texts.append("")
+    result.orphan_tokens = dict(zip(result.orphans, count_tokens_many(texts, estimator)))
+    return result
+
+
+def relative(path: str, base_dir: Path) -> str:
+    try:
+        return str(Path(path).relative_to(base_dir))
+    except ValueError:
+        return path
+
+
+def print_report(graph: ReferenceGraph, reach: Reachability, verbose: bool = False) -> None:
+    base = graph.base_dir
+    print("=" * 70)
+    print(f"REFERENCE GRAPH: {base}")
+    print("=" * 70)
+    print(f"{len(graph.entry_points)} skills, {len(graph.candidates)} reference files, "
+          f"{graph.link_count} links ({graph.cached} files from cache, {graph.parsed} read)")
+
+    if reach.orphans:
+        total = sum(reach.orphan_tokens.values())
+        print(f"\n## Orphaned reference files ({len(reach.orphans)}, {total:,} tokens)")
+        for path in reach.orphans:
+            print(f"  {reach.orphan_tokens[path]:>7,} tok  {relative(path, base)}")
+
+    if reach.deep:
+        print(f"\n## References more than {MAX_DEPTH} hop from SKILL.md ({len(reach.deep)})")
+        for path in reach.deep:
+            chain = " -> ".join(relative(p, base) for p in reach.chain(path))
+            print(f"  depth {reach.depth[path]}: {chain}")
+
+    if reach.cycles:
+        print(f"\n## Reference cycles ({len(reach.cycles)})")
+        for cycle in reach.cycles:
+            print("  " + ", ".join(relative(p, base) for p in cycle))
+
+    if verbose and reach.skills:
+        print("\n## Reachability per skill")
+        print(f"  {'Files':>6} {'Depth':>6}  Skill")
+        for skill in sorted(reach.skills, key=lambda s: (-s.reachable, s.skill)):
+            print(f"  {skill.reachable:>6} {skill.max_depth:>6}  {relative(skill.skill, base)}")
+
+    print(f"\n{'='*50}")
+    print(f"{len(reach.orphans)} orphaned, {len(reach.deep)} deep, {len(reach.cycles)} cycles")
+
+
+def report_to_dict(graph: ReferenceGraph, reach: Reachability) -> dict:
+    base = graph.base_dir
+    return {
+        "base_dir": str(base),
+        "skills": len(graph.entry_points),
+        "reference_files": len(graph.candidates),
+        "links": graph.link_count,
+        "orphans": [{"path": relative(p, base), "tokens": reach.orphan_tokens[p]} for p in reach.orphans],
+        "deep": [
+            {"path": relative(p, base), "depth": reach.depth[p],
+             "chain": [relative(c, base) for c in reach.chain(p)]}
+            for p in reach.deep
+        ],
+        "cycles": [[relative(p, base) for p in cycle] for cycle in reach.cycles],
+        "per_skill": [
+            {"skill": relative(s.skill, base), "reachable": s.reachable, "max_depth": s.max_depth}
+            for s in reach.skills
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find orphaned and deeply nested skill references")
+    parser.add_argument("path", nargs="?", help="Directory to check")
+    parser.add_argument("--all", action="store_true", help="Check ~/.claude")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show reachability per skill")
+    parser.add_argument("--no-cache", action="store_true", help="Re-read every file")
+    parser.add_argument("--estimator", choices=ESTIMATORS, default=DEFAULT_ESTIMATOR,
+                        help=f"Token estimator for orphan sizes (default: {DEFAULT_ESTIMATOR})")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if args.all:
+        base_dir = CLAUDE_DIR
+    elif args.path:
+        base_dir = Path(args.path)
+    else:
+        parser.print_help()
+        sys.exit(2)
+    if not base_dir.is_dir():
+        print(f"Error: Not a directory: {base_dir}", file=sys.stderr)
+        sys.exit(2)
+    base_dir = base_dir.resolve()
+
+    cache = None if args.no_cache else LinkCache.load()
+    graph = build_graph(base_dir, cache)
+    if cache is not None:
+        cache.save(base_dir, set(graph.edges))
+    reach = analyze(graph, args.estimator)
+
+    if args.json:
+        print(json.dumps(report_to_dict(graph, reach), indent=2))
+    else:
+        print_report(graph, reach, args.verbose)
+    sys.exit(1 if reach.orphans else 0)
+
+
+if __name__ == "__main__":
+    main()
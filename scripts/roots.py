@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Discover the directories Claude Code loads extensions from.
+
+Each root is a directory scanned like ~/.claude (skills/, agents/,
+commands/, ...) tagged with its scope. Scopes follow the priority order in
+references/locations.md, highest first:
+
+    enterprise   managed config (/etc/claude-code, /Library/Application Support/ClaudeCode)
+    user         ~/.claude
+    project      <project>/.claude
+    plugin       each installed plugin under ~/.claude/plugins/cache
+    plugin-dir   plugin directories passed explicitly (claude --plugin-dir)
+    marketplace  plugins in local marketplaces (available, not necessarily installed)
+
+When two roots define a skill, agent or command with the same name, the
+higher-priority one wins and the other is shadowed. Components of plugin
+roots (plugin, plugin-dir, marketplace) are invoked as plugin:name, so they
+only collide with the same component of a plugin with the same name.
+
+Usage:
+    python roots.py                    # Discovered roots for the current directory
+    python roots.py --project ~/repo   # Discover for another project
+    python roots.py --json
+
+Exit codes:
+    0 - Success
+    2 - Usage error
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+CLAUDE_DIR = Path.home() / ".claude"
+
+SCOPE_PRECEDENCE = ["enterprise", "user", "project", "plugin", "plugin-dir", "marketplace"]
+
+# Scopes whose root is a single plugin, with namespaced components
+PLUGIN_SCOPES = ("plugin", "plugin-dir", "marketplace")
+
+ENTERPRISE_DIRS = [
+    Path("/etc/claude-code"),
+    Path("/Library/Application Support/ClaudeCode"),
+]
+
+KNOWN_MARKETPLACES = "known_marketplaces.json"
+
+
+@dataclass
+class Root:
+    """A directory holding extensions, with the scope it is loaded at."""
+    path: Path
+    scope: str
+
+    @property
+    def rank(self) -> int:
+        """Position in SCOPE_PRECEDENCE; lower wins."""
+        try:
+            return SCOPE_PRECEDENCE.index(self.scope)
+        except ValueError:
+            return len(SCOPE_PRECEDENCE)
+
+    @property
+    def namespace(self) -> str:
+        """Plugin name its components are invoked under, or "" outside plugins."""
+        return plugin_name(self.path) if self.scope in PLUGIN_SCOPES else ""
+
+
+def plugin_name(path: Path) -> str:
+    """Name from a plugin's .claude-plugin/plugin.json, else its directory name."""
+    try:
+        with open(path / ".claude-plugin" / "plugin.json") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        manifest = {}
+    name = manifest.get("name") if isinstance(manifest, dict) else None
+    return name if isinstance(name, str) and name else path.name
+
+
+def parse_root(spec: str) -> Root:
+    """Parse SCOPE=PATH (or a bare PATH, taken as a project root)."""
+    scope, sep, path = spec.partition("=")
+    if not sep:
+        scope, path = "project", spec
+    if scope not in SCOPE_PRECEDENCE:
+        raise ValueError(f"Unknown scope '{scope}' (expected one of: {', '.join(SCOPE_PRECEDENCE)})")
+    return Root(Path(path).expanduser(), scope)
+
+
+def find_plugin_roots(directory: Path, max_depth: int = 4) -> List[Path]:
+    """Directories below directory that contain .claude-plugin/plugin.json."""
+    found = []
+    stack = [(directory, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if (current / ".claude-plugin" / "plugin.json").is_file():
+            found.append(current)
+            continue
+        if depth >= max_depth:
+            continue
+        try:
+            children = sorted(p for p in current.iterdir()
+                              if p.is_dir() and not p.name.startswith("."))
+        except OSError:
+            continue
+        stack.extend((child, depth + 1) for child in reversed(children))
+    return found
+
+
+def find_project_dir(start: Path) -> Optional[Path]:
+    """Nearest .claude directory at or above start, excluding ~/.claude itself."""
+    start = start.resolve()
+    user_dir = CLAUDE_DIR.resolve() if CLAUDE_DIR.exists() else None
+    for directory in [start, *start.parents]:
+        candidate = directory / ".claude"
+        if candidate.is_dir() and candidate.resolve() != user_dir:
+            return candidate
+    return None
+
+
+def marketplace_dirs(claude_dir: Path) -> List[Path]:
+    """Local marketplace directories registered in known_marketplaces.json."""
+    path = claude_dir / "plugins" / KNOWN_MARKETPLACES
+    try:
+        with open(path) as f:
+            known = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    if not isinstance(known, dict):
+        return []
+
+    dirs = []
+    for entry in known.values():
+        if not isinstance(entry, dict):
+            continue
+        source = entry.get("source") if isinstance(entry.get("source"), dict) else {}
+        for candidate in (entry.get("installLocation"), source.get("path")):
+            if isinstance(candidate, str) and Path(candidate).expanduser().is_dir():
+                dirs.append(Path(candidate).expanduser())
+                break
+    return dirs
+
+
+def discover_roots(
+    project: Optional[Path] = None,
+    claude_dir: Path = CLAUDE_DIR,
+    plugin_dirs: Optional[List[Path]] = None,
+) -> List[Root]:
+    """Every extension root for a project, in precedence order."""
+    roots = [Root(d, "enterprise") for d in ENTERPRISE_DIRS if d.is_dir()]
+    if claude_dir.is_dir():
+        roots.append(Root(claude_dir, "user"))
+
+    project_dir = find_project_dir(project or Path.cwd())
+    if project_dir is not None:
+        roots.append(Root(project_dir, "project"))
+
+    # The user root prunes plugins/cache, so installed plugins are roots of their own
+    cache = claude_dir / "plugins" / "cache"
+    if cache.is_dir():
+        roots.extend(Root(p, "plugin") for p in find_plugin_roots(cache))
+
+    roots.extend(Root(p, "plugin-dir") for p in plugin_dirs or [])
+
+    seen = {r.path.resolve() for r in roots}
+    for marketplace in marketplace_dirs(claude_dir):
+        for plugin in find_plugin_roots(marketplace):
+            if plugin.resolve() not in seen:
+                seen.add(plugin.resolve())
+                roots.append(Root(plugin, "marketplace"))
+
+    return sorted(roots, key=lambda r: r.rank)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover Claude Code extension roots")
+    parser.add_argument("--project", help="Project directory (default: current directory)")
+    parser.add_argument("--plugin-dir", action="append", default=[],
+                        help="Development plugin directory (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    project = Path(args.project) if args.project else None
+    if project is not None and not project.is_dir():
+        print(f"Error: Not a directory: {project}", file=sys.stderr)
+        sys.exit(2)
+
+    roots = discover_roots(project, plugin_dirs=[Path(p) for p in args.plugin_dir])
+    if args.json:
+        print(json.dumps([{"scope": r.scope, "path": str(r.path)} for r in roots], indent=2))
+    else:
+        for root in roots:
+            print(f"  {root.scope:<12} {root.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,33 +2,76 @@
 """
 Estimate token usage for Claude Code extensions.
 
-Uses a simple chars/4 approximation as mentioned in the skill-optimizer.
-Provides breakdowns by section and identifies optimization opportunities.
+Counts with the offline BPE tokenizer (tokenizer.py) by default and shows
+the chars/4 approximation alongside; --estimator chars counts with chars/4
+only. Provides breakdowns by section and identifies optimization
+opportunities.
 
 Usage:
     python token_counter.py <path>           # Count tokens in file/directory
     python token_counter.py --all            # Count all extensions
     python token_counter.py --type skills    # Count specific type
     python token_counter.py --top 10         # Show top N by token count
+    python token_counter.py --all --estimator chars  # chars/4 only
+    python token_counter.py . --changed-since origin/main  # Only changed extensions
+    python token_counter.py --workspace ~/src  # Token totals per project
+    python token_counter.py --all --estimator calibrated  # Per-content-class ratios
+    python token_counter.py --calibrate ~/.claude  # Refit data/token-ratios.json
+    python token_counter.py --calibrate ~/docs --reference tokenizer.json
+    python token_counter.py --calibrate --corpus --reference tokenizer.json  # Bundled ratios
+    python token_counter.py . --baseline tokens.json --update-baseline  # Record counts
+    python token_counter.py . --baseline tokens.json  # Fail if budgets are exceeded
+
+--calibrate samples .md and .json files, fits a chars-per-token ratio for each
+content class (prose, fenced code, tables, frontmatter, JSON), saves the
+ratios and reports each estimator's error and time on a held-out sample.
+Ratios are fitted against --reference, a Hugging Face tokenizer.json (needs
+the optional tokenizers package), or the bundled BPE tokenizer without it.
+Sample text the reference was not trained on, or the held-out error is
+in-sample. --corpus downloads the pinned "calibrate" corpus listed in
+data/token-corpus.json; the bundled ratios are fitted on it against the
+tokenizer.json that `tokenizer.py corpus reference DIR` fetches.
+
+--baseline compares per-file and per-section counts with a stored baseline
+and names the sections that grew. It fails when an extension grows by more
+than its type's TOKEN_BUDGETS allowance, or past its TOKEN_RANGES maximum.
 
 Exit codes:
     0 - Success
-    1 - Error
+    1 - Error, or token budget exceeded with --baseline
 """
 
 import argparse
+import hashlib
 import json
 import os
-import re
+import random
 import sys
+import tempfile
+import time
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+import frontmatter_parser
+from git_scope import ChangedScope, scope_from_args
+from inventory import Inventory, get_inventory
+from tokenizer import (
+    CONTENT_CLASSES, CORPUS_PATH, DEFAULT_ESTIMATOR, ESTIMATORS, RATIOS_PATH, RATIOS_VERSION,
+    TOOLKIT_ROOT, TokenizerError, calibrated_estimate, chars_estimate, content_segments,
+    count_tokens, count_tokens_many, fetch_corpus, get_tokenizer, load_ratios,
+)
+from workspace import (
+    DEFAULT_JOBS, Project, ProjectRollup, find_projects, print_rollup, rollup_projects,
+    rollup_to_dict, workspace_from_args,
+)
 
 CLAUDE_DIR = Path.home() / ".claude"
 
-# Token estimation: ~4 chars per token (conservative estimate for English text)
-CHARS_PER_TOKEN = 4
+# Content classes with less text than this in the calibration sample keep
+# their previous ratio rather than fitting noise
+MIN_CLASS_CHARS = 2000
 
 # Recommended token ranges by extension type
 TOKEN_RANGES = {
@@ -39,6 +82,18 @@ TOKEN_RANGES = {
     "claude_md": (200, 2000),  # Project instructions
 }
 
+# Growth allowed per extension against a --baseline before the check fails.
+# An extension also fails if it grows past the TOKEN_RANGES maximum.
+TOKEN_BUDGETS = {
+    "skill": 150,
+    "agent": 200,
+    "command": 50,
+    "plugin": 500,
+    "claude_md": 200,
+}
+
+BASELINE_VERSION = 1
+
 
 @dataclass
 class TokenCount:
@@ -52,28 +107,31 @@ class TokenCount:
     frontmatter_tokens: int = 0
     body_tokens: int = 0
     recommendation: str = ""
+    chars_tokens: int = 0  # chars/4 estimate of the same text, for comparison
 
 
-def estimate_tokens(text: str) -> int:
+def estimate_tokens(text: str, estimator: str = DEFAULT_ESTIMATOR) -> int:
     """Estimate token count from text."""
-    return len(text) // CHARS_PER_TOKEN
+    return count_tokens(text, estimator)
 
 
 def parse_frontmatter(content: str) -> Tuple[str, str]:
     """Split content into frontmatter and body."""
-    if not content.startswith("---"):
+    spans = frontmatter_parser.find_frontmatter(content)
+    if spans is None:
         return "", content
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return "", content
+    header_start, header_end, body_start = spans
+    return content[header_start:header_end], content[body_start:]
 
-    return parts[1], parts[2]
 
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    """Split markdown into (heading, text) pairs at every heading line.
 
-def extract_sections(content: str) -> Dict[str, int]:
-    """Extract markdown sections and their token counts."""
-    sections = {}
+    Text before the first heading is "_intro". Heading lines themselves are
+    not part of any section's text.
+    """
+    sections = []
     current_section = "_intro"
     current_text = []
 
@@ -81,8 +139,7 @@ def extract_sections(content: str) -> Dict[str, int]:
         if line.startswith("#"):
             # Save previous section
             if current_text:
-                text = "\n".join(current_text)
-                sections[current_section] = estimate_tokens(text)
+                sections.append((current_section, "\n".join(current_text)))
             # Start new section
             current_section = line.lstrip("#").strip()
             current_text = []
@@ -91,13 +148,30 @@ def extract_sections(content: str) -> Dict[str, int]:
 
     # Save last section
     if current_text:
-        text = "\n".join(current_text)
-        sections[current_section] = estimate_tokens(text)
+        sections.append((current_section, "\n".join(current_text)))
 
     return sections
 
 
-def count_skill_tokens(path: Path) -> TokenCount:
+def section_keys(headings: List[str]) -> List[str]:
+    """Unique keys for headings: a repeated heading becomes "Example #2", "Example #3"."""
+    seen: Dict[str, int] = {}
+    keys = []
+    for heading in headings:
+        seen[heading] = seen.get(heading, 0) + 1
+        keys.append(heading if seen[heading] == 1 else f"{heading} #{seen[heading]}")
+    return keys
+
+
+def extract_sections(content: str, estimator: str = DEFAULT_ESTIMATOR) -> Dict[str, int]:
+    """Extract markdown sections and their token counts, keyed by section_keys()."""
+    sections = split_sections(content)
+    keys = section_keys([heading for heading, _ in sections])
+    return {key: estimate_tokens(text, estimator) for key, (_, text) in zip(keys, sections)}
+
+
+def count_skill_tokens(path: Path, inventory: Optional[Inventory] = None,
+                       estimator: str = DEFAULT_ESTIMATOR) -> TokenCount:
     """Count tokens for a skill and its references."""
     result = TokenCount(str(path), "skill", 0, 0)
 
@@ -111,21 +185,30 @@ def count_skill_tokens(path: Path) -> TokenCount:
 
     # Parse frontmatter vs body
     frontmatter, body = parse_frontmatter(content)
-    result.frontmatter_tokens = estimate_tokens(frontmatter)
-    result.body_tokens = estimate_tokens(body)
-    result.sections = extract_sections(body)
+    result.frontmatter_tokens = estimate_tokens(frontmatter, estimator)
+    result.body_tokens = estimate_tokens(body, estimator)
+    result.chars_tokens = chars_estimate(frontmatter) + chars_estimate(body)
+    result.sections = extract_sections(body, estimator)
 
     # Check for references
     references_dir = path.parent / "references"
-    if references_dir.exists():
-        for ref_file in references_dir.glob("*.md"):
-            try:
-                ref_content = ref_file.read_text()
-                ref_tokens = estimate_tokens(ref_content)
-                result.references_tokens += ref_tokens
-                result.sections[f"ref:{ref_file.name}"] = ref_tokens
-            except Exception:
-                pass
+    if inventory is not None:
+        ref_files = inventory.references_for(path)
+    elif references_dir.exists():
+        ref_files = list(references_dir.glob("*.md"))
+    else:
+        ref_files = []
+    ref_texts = {}
+    for ref_file in ref_files:
+        try:
+            ref_texts[ref_file.name] = ref_file.read_text()
+        except Exception:
+            pass
+    ref_counts = count_tokens_many(list(ref_texts.values()), estimator)
+    for (name, text), ref_tokens in zip(ref_texts.items(), ref_counts):
+        result.references_tokens += ref_tokens
+        result.chars_tokens += chars_estimate(text)
+        result.sections[f"ref:{name}"] = ref_tokens
 
     result.total_tokens = result.frontmatter_tokens + result.body_tokens + result.references_tokens
 
@@ -141,7 +224,7 @@ def count_skill_tokens(path: Path) -> TokenCount:
     return result
 
 
-def count_agent_tokens(path: Path) -> TokenCount:
+def count_agent_tokens(path: Path, estimator: str = DEFAULT_ESTIMATOR) -> TokenCount:
     """Count tokens for an agent definition."""
     result = TokenCount(str(path), "agent", 0, 0)
 
@@ -154,9 +237,10 @@ def count_agent_tokens(path: Path) -> TokenCount:
     result.total_chars = len(content)
 
     frontmatter, body = parse_frontmatter(content)
-    result.frontmatter_tokens = estimate_tokens(frontmatter)
-    result.body_tokens = estimate_tokens(body)
-    result.sections = extract_sections(body)
+    result.frontmatter_tokens = estimate_tokens(frontmatter, estimator)
+    result.body_tokens = estimate_tokens(body, estimator)
+    result.chars_tokens = chars_estimate(frontmatter) + chars_estimate(body)
+    result.sections = extract_sections(body, estimator)
     result.total_tokens = result.frontmatter_tokens + result.body_tokens
 
     min_tokens, max_tokens = TOKEN_RANGES["agent"]
@@ -170,7 +254,7 @@ def count_agent_tokens(path: Path) -> TokenCount:
     return result
 
 
-def count_command_tokens(path: Path) -> TokenCount:
+def count_command_tokens(path: Path, estimator: str = DEFAULT_ESTIMATOR) -> TokenCount:
     """Count tokens for a command."""
     result = TokenCount(str(path), "command", 0, 0)
 
@@ -183,8 +267,9 @@ def count_command_tokens(path: Path) -> TokenCount:
     result.total_chars = len(content)
 
     frontmatter, body = parse_frontmatter(content)
-    result.frontmatter_tokens = estimate_tokens(frontmatter)
-    result.body_tokens = estimate_tokens(body)
+    result.frontmatter_tokens = estimate_tokens(frontmatter, estimator)
+    result.body_tokens = estimate_tokens(body, estimator)
+    result.chars_tokens = chars_estimate(frontmatter) + chars_estimate(body)
     result.total_tokens = result.frontmatter_tokens + result.body_tokens
 
     min_tokens, max_tokens = TOKEN_RANGES["command"]
@@ -196,33 +281,28 @@ def count_command_tokens(path: Path) -> TokenCount:
     return result
 
 
-def count_plugin_tokens(path: Path) -> TokenCount:
+def count_plugin_tokens(path: Path, inventory: Optional[Inventory] = None,
+                        estimator: str = DEFAULT_ESTIMATOR) -> TokenCount:
     """Count total tokens for a plugin and all its components."""
     result = TokenCount(str(path), "plugin", 0, 0)
 
     total = 0
+    if inventory is None:
+        inventory = get_inventory(path)
 
-    # Count all markdown files in plugin
-    for md_file in path.rglob("*.md"):
+    # Count all markdown and JSON files in the plugin as one batch
+    texts = {}
+    for file in inventory.files_under(path, ".md") + inventory.files_under(path, ".json"):
         try:
-            content = md_file.read_text()
-            tokens = estimate_tokens(content)
-            total += tokens
-            rel_path = md_file.relative_to(path)
-            result.sections[str(rel_path)] = tokens
+            texts[str(file.relative_to(path))] = file.read_text()
         except Exception:
             pass
 
-    # Count JSON files
-    for json_file in path.rglob("*.json"):
-        try:
-            content = json_file.read_text()
-            tokens = estimate_tokens(content)
-            total += tokens
-            rel_path = json_file.relative_to(path)
-            result.sections[str(rel_path)] = tokens
-        except Exception:
-            pass
+    counts = count_tokens_many(list(texts.values()), estimator)
+    for (rel_path, content), tokens in zip(texts.items(), counts):
+        total += tokens
+        result.chars_tokens += chars_estimate(content)
+        result.sections[rel_path] = tokens
 
     result.total_tokens = total
     result.recommendation = f"Plugin total: {total} tokens across {len(result.sections)} files"
@@ -230,46 +310,421 @@ def count_plugin_tokens(path: Path) -> TokenCount:
     return result
 
 
-def find_and_count_all(base_dir: Path, ext_type: Optional[str] = None) -> List[TokenCount]:
-    """Find and count all extensions."""
+def find_and_count_all(
+    base_dir: Path,
+    ext_type: Optional[str] = None,
+    scope: Optional[ChangedScope] = None,
+    estimator: str = DEFAULT_ESTIMATOR,
+) -> List[TokenCount]:
+    """Find and count all extensions, or only those owning files in scope."""
     results = []
+    inventory = get_inventory(base_dir)
+
+    def in_scope(path: Path) -> bool:
+        return scope is None or scope.includes(path)
 
     if ext_type is None or ext_type == "skills":
-        for skill_md in base_dir.rglob("SKILL.md"):
-            results.append(count_skill_tokens(skill_md))
+        for skill_md in filter(in_scope, inventory.skills):
+            results.append(count_skill_tokens(skill_md, inventory, estimator))
 
     if ext_type is None or ext_type == "agents":
-        agents_dir = base_dir / "agents"
-        if agents_dir.exists():
-            for agent in agents_dir.glob("*.md"):
-                results.append(count_agent_tokens(agent))
+        for agent in filter(in_scope, inventory.agents):
+            results.append(count_agent_tokens(agent, estimator))
 
     if ext_type is None or ext_type == "commands":
-        commands_dir = base_dir / "commands"
-        if commands_dir.exists():
-            for cmd in commands_dir.glob("*.md"):
-                results.append(count_command_tokens(cmd))
+        for cmd in filter(in_scope, inventory.commands):
+            results.append(count_command_tokens(cmd, estimator))
 
     if ext_type is None or ext_type == "plugins":
-        plugins_dir = base_dir / "plugins"
-        if plugins_dir.exists():
-            for item in plugins_dir.iterdir():
-                if item.is_dir() and (item / ".claude-plugin").exists():
-                    results.append(count_plugin_tokens(item))
+        for item in filter(in_scope, inventory.plugins):
+            results.append(count_plugin_tokens(item, inventory, estimator))
 
     return results
 
 
-def print_results(results: List[TokenCount], top_n: Optional[int] = None, verbose: bool = False):
+def project_tokens(project: Project, estimator: str = DEFAULT_ESTIMATOR) -> ProjectRollup:
+    """Per-type counts and token total for one workspace project."""
+    rollup = ProjectRollup(str(project.root))
+    if project.claude_dir is not None:
+        for result in find_and_count_all(project.claude_dir, estimator=estimator):
+            section = f"{result.extension_type}s"
+            rollup.counts[section] = rollup.counts.get(section, 0) + 1
+            rollup.tokens += result.total_tokens
+    return rollup
+
+
+@dataclass
+class BudgetDiff:
+    """Token change of one extension against the stored baseline."""
+    path: str
+    extension_type: str
+    before: Optional[int]  # None if the extension is new
+    after: int
+    sections: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # Changed: (before, after)
+    failure: str = ""
+
+    @property
+    def delta(self) -> int:
+        return self.after - (self.before or 0)
+
+    @property
+    def grown_sections(self) -> List[Tuple[str, int, int]]:
+        """(section, before, after) for sections that grew, largest growth first."""
+        grown = [(name, old, new) for name, (old, new) in self.sections.items() if new > old]
+        return sorted(grown, key=lambda s: (s[1] - s[2], s[0]))
+
+
+def baseline_key(path: str, base_dir: Path) -> str:
+    """Path relative to base_dir, so a baseline is portable between checkouts."""
+    try:
+        return str(Path(path).resolve().relative_to(base_dir.resolve()))
+    except ValueError:
+        return path
+
+
+def baseline_sections(result: TokenCount) -> Dict[str, int]:
+    """Section counts for the baseline, with frontmatter as its own section."""
+    sections = {}
+    if result.frontmatter_tokens:
+        sections["_frontmatter"] = result.frontmatter_tokens
+    sections.update(result.sections)
+    return sections
+
+
+def build_baseline(results: List[TokenCount], base_dir: Path, estimator: str) -> dict:
+    return {
+        "version": BASELINE_VERSION,
+        "estimator": estimator,
+        "extensions": {
+            baseline_key(r.path, base_dir): {
+                "type": r.extension_type,
+                "tokens": r.total_tokens,
+                "sections": baseline_sections(r),
+            }
+            for r in results
+        },
+    }
+
+
+def load_baseline(path: Path) -> dict:
+    """Read a baseline file, raising ValueError if it is missing or malformed."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Baseline not found: {path} (create it with --update-baseline)")
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read baseline {path}: {e}")
+    if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline format in {path}")
+    return data
+
+
+def save_baseline(baseline: dict, path: Path) -> None:
+    """Write the baseline atomically: readers see the old file or the new one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def budget_failure(diff: BudgetDiff) -> str:
+    """Why diff breaks its type's budget, or "" if it does not."""
+    budget = TOKEN_BUDGETS.get(diff.extension_type)
+    if diff.before is not None and budget is not None and diff.delta > budget:
+        return f"grew {diff.delta:+,} tokens (budget +{budget:,})"
+
+    max_tokens = TOKEN_RANGES.get(diff.extension_type, (0, None))[1]
+    if max_tokens is not None and diff.after > max_tokens >= (diff.before or 0):
+        return f"{diff.after:,} tokens exceeds the {max_tokens:,} maximum"
+    return ""
+
+
+def compare_baseline(
+    results: List[TokenCount],
+    baseline: dict,
+    base_dir: Path,
+    scoped: bool = False,
+) -> Tuple[List[BudgetDiff], List[str]]:
+    """Changed extensions, and baseline entries no longer present.
+
+    With scoped (--changed-since) results, missing entries were not counted
+    rather than removed, so none are reported.
+    """
+    stored = baseline.get("extensions", {})
+    diffs = []
+    seen = set()
+
+    for result in results:
+        key = baseline_key(result.path, base_dir)
+        seen.add(key)
+        entry = stored.get(key)
+        before = entry.get("tokens") if entry else None
+        old_sections = entry.get("sections", {}) if entry else {}
+        new_sections = baseline_sections(result)
+
+        diff = BudgetDiff(key, result.extension_type, before, result.total_tokens)
+        for name in new_sections.keys() | old_sections.keys():
+            old, new = old_sections.get(name, 0), new_sections.get(name, 0)
+            if old != new:
+                diff.sections[name] = (old, new)
+        if before == diff.after and not diff.sections:
+            continue
+        diff.failure = budget_failure(diff)
+        diffs.append(diff)
+
+    removed = [] if scoped else sorted(stored.keys() - seen)
+    diffs.sort(key=lambda d: (not d.failure, -d.delta, d.path))
+    return diffs, removed
+
+
+def print_baseline_diff(diffs: List[BudgetDiff], removed: List[str], baseline_path: Path) -> None:
+    failing = [d for d in diffs if d.failure]
+    print(f"Token budget check against {baseline_path}")
+
+    for diff in diffs:
+        status = "FAIL" if diff.failure else "ok"
+        if diff.before is None:
+            change = f"new, {diff.after:,} tokens"
+        else:
+            change = f"{diff.before:,} -> {diff.after:,} ({diff.delta:+,})"
+        print(f"\n[{status}] {diff.extension_type}: {diff.path}  {change}")
+        if diff.failure:
+            print(f"  -> {diff.failure}")
+        for name, old, new in diff.grown_sections:
+            label = "new section" if old == 0 else f"{old:,} -> {new:,}"
+            print(f"    {name}: {label} ({new - old:+,})")
+
+    for key in removed:
+        print(f"\n[removed] {key}")
+
+    print(f"\n{'='*50}")
+    if failing:
+        print(f"FAILED: {len(failing)} of {len(diffs)} changed extensions over budget")
+    else:
+        print(f"OK: {len(diffs)} changed extensions within budget")
+
+
+def diff_to_dict(diff: BudgetDiff) -> dict:
+    return {
+        "path": diff.path,
+        "type": diff.extension_type,
+        "before": diff.before,
+        "after": diff.after,
+        "delta": diff.delta,
+        "grown_sections": {name: new - old for name, old, new in diff.grown_sections},
+        "failure": diff.failure,
+    }
+
+
+@dataclass
+class EstimatorScore:
+    """Accuracy and cost of one estimator on the held-out sample."""
+    estimator: str
+    seconds: float
+    mean_error: float   # Mean absolute error per file, as a fraction of exact tokens
+    p95_error: float
+    total_error: float  # Signed error of the summed estimate
+
+
+@dataclass
+class Calibration:
+    """Fitted ratios and how they were obtained."""
+    ratios: Dict[str, float]
+    chars: Dict[str, int]
+    tokens: Dict[str, int]
+    fit_files: int
+    heldout_files: int
+    reference: str = "bpe"  # Tokenizer the ratios and errors are measured against
+    reference_sha256: str = ""
+    seed: int = 0
+    scores: List[EstimatorScore] = field(default_factory=list)
+
+
+def load_reference(path: Path) -> Callable[[str], int]:
+    """Token counter for a Hugging Face tokenizer.json; ValueError if unusable."""
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        raise ValueError("--reference needs the tokenizers package (pip install tokenizers)")
+    try:
+        reference = Tokenizer.from_file(str(path))
+    except Exception as e:
+        raise ValueError(f"Cannot load reference tokenizer {path}: {e}")
+    return lambda text: len(reference.encode(text, add_special_tokens=False).ids)
+
+
+def calibration_files(base_dir: Path) -> List[Path]:
+    inventory = get_inventory(base_dir)
+    files = inventory.files_under(base_dir, ".md") + inventory.files_under(base_dir, ".json")
+    # The ratios file changes with every calibration; keep it out of its own sample
+    return sorted(f for f in files if f.resolve() != RATIOS_PATH.resolve())
+
+
+def fit_ratios(
+    texts: List[str],
+    count: Optional[Callable[[str], int]] = None,
+) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, int]]:
+    """Chars-per-token ratio for each content class, from exact counts.
+
+    count is the reference tokenizer (default: the bundled BPE). A class with
+    fewer than MIN_CLASS_CHARS characters in the sample keeps its current
+    ratio.
+    """
+    count = count or get_tokenizer().count
+    chars = dict.fromkeys(CONTENT_CLASSES, 0)
+    tokens = dict.fromkeys(CONTENT_CLASSES, 0)
+    for text in texts:
+        for content_class, segment in content_segments(text):
+            chars[content_class] += len(segment)
+            tokens[content_class] += count(segment)
+    current = load_ratios()
+    ratios = {
+        c: round(chars[c] / tokens[c], 4) if chars[c] >= MIN_CLASS_CHARS and tokens[c] else current[c]
+        for c in CONTENT_CLASSES
+    }
+    return ratios, chars, tokens
+
+
+def score_estimators(
+    texts: List[str],
+    ratios: Dict[str, float],
+    count: Optional[Callable[[str], int]] = None,
+) -> List[EstimatorScore]:
+    """Time each estimator on texts and measure its error against count (default: BPE)."""
+    tokenizer = get_tokenizer()
+    estimators = [
+        ("bpe", tokenizer.count),
+        ("calibrated", lambda t: calibrated_estimate(t, ratios)),
+        ("chars", chars_estimate),
+    ]
+    for text in texts:
+        tokenizer.count(text)  # Warm the BPE cache so its timing is comparable
+    exact = [(count or tokenizer.count)(t) for t in texts]
+
+    scores = []
+    for name, estimate in estimators:
+        started = time.perf_counter()
+        estimates = [estimate(t) for t in texts]
+        seconds = time.perf_counter() - started
+
+        errors = sorted(abs(e - x) / x for e, x in zip(estimates, exact) if x)
+        total_exact = sum(exact)
+        scores.append(EstimatorScore(
+            estimator=name,
+            seconds=seconds,
+            mean_error=sum(errors) / len(errors) if errors else 0.0,
+            p95_error=errors[min(len(errors) - 1, int(len(errors) * 0.95))] if errors else 0.0,
+            total_error=(sum(estimates) - total_exact) / total_exact if total_exact else 0.0,
+        ))
+    return scores
+
+
+def calibrate(base_dir: Path, sample: int = 2000, holdout: float = 0.2, seed: int = 0,
+              reference: Optional[Path] = None) -> Calibration:
+    """Fit ratios on a random sample of files and score them on a held-out part of it.
+
+    reference is a tokenizer.json to measure against; raises ValueError if it
+    cannot be loaded.
+    """
+    count = load_reference(reference) if reference else None
+    files = calibration_files(base_dir)
+    rng = random.Random(seed)
+    if len(files) > sample:
+        files = rng.sample(files, sample)
+    else:
+        rng.shuffle(files)
+
+    texts = []
+    for path in files:
+        try:
+            text = path.read_text(errors="replace")
+        except OSError:
+            continue
+        if text.strip():
+            texts.append(text)
+
+    held = max(1, int(len(texts) * holdout)) if len(texts) > 1 else 0
+    fit_texts, heldout_texts = texts[held:], texts[:held]
+    ratios, chars, tokens = fit_ratios(fit_texts, count)
+    calibration = Calibration(ratios, chars, tokens, len(fit_texts), len(heldout_texts),
+                              reference.name if reference else "bpe",
+                              hashlib.sha256(reference.read_bytes()).hexdigest() if reference else "",
+                              seed)
+    if heldout_texts:
+        calibration.scores = score_estimators(heldout_texts, ratios, count)
+    return calibration
+
+
+def save_calibration(calibration: Calibration, source: str, path: Path = RATIOS_PATH) -> None:
+    """Write the ratios with where they came from (a directory, or a pinned corpus)."""
+    data = {
+        "version": RATIOS_VERSION,
+        "ratios": calibration.ratios,
+        "fitted": {
+            "source": source,
+            "reference": calibration.reference,
+            "reference_sha256": calibration.reference_sha256 or None,
+            "seed": calibration.seed,
+            "files": calibration.fit_files,
+            "chars": calibration.chars,
+            "tokens": calibration.tokens,
+        },
+        "heldout": {
+            "files": calibration.heldout_files,
+            "scores": {
+                s.estimator: {
+                    "mean_error": round(s.mean_error, 4),
+                    "p95_error": round(s.p95_error, 4),
+                    "total_error": round(s.total_error, 4),
+                }
+                for s in calibration.scores
+            },
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def print_calibration(calibration: Calibration) -> None:
+    print(f"Fitted against {calibration.reference} on {calibration.fit_files} files, "
+          f"scored on {calibration.heldout_files} held-out files")
+    print(f"\n  {'Class':<12} {'Chars':>10} {'Tokens':>9} {'Chars/token':>12}")
+    for c in CONTENT_CLASSES:
+        print(f"  {c:<12} {calibration.chars[c]:>10,} {calibration.tokens[c]:>9,} "
+              f"{calibration.ratios[c]:>12.2f}")
+
+    if not calibration.scores:
+        return
+    baseline = calibration.scores[0].seconds
+    print(f"\n  {'Estimator':<12} {'Mean |err|':>10} {'p95 |err|':>10} {'Total err':>10} "
+          f"{'ms':>9} {'vs bpe':>8}")
+    for s in calibration.scores:
+        speedup = baseline / s.seconds if s.seconds else float("inf")
+        print(f"  {s.estimator:<12} {s.mean_error:>10.1%} {s.p95_error:>10.1%} "
+              f"{s.total_error:>+10.1%} {s.seconds * 1000:>9.1f} {speedup:>7.0f}x")
+
+
+def print_results(results: List[TokenCount], top_n: Optional[int] = None, verbose: bool = False,
+                  estimator: str = DEFAULT_ESTIMATOR):
     """Print token count results."""
     if top_n:
         results = sorted(results, key=lambda r: r.total_tokens, reverse=True)[:top_n]
 
     total_all = 0
+    # With BPE counts, show the chars/4 estimate next to them
+    compare = estimator != "chars"
 
     for result in results:
         print(f"\n{result.extension_type.upper()}: {result.path}")
-        print(f"  Total: {result.total_tokens:,} tokens ({result.total_chars:,} chars)")
+        if compare:
+            print(f"  Total: {result.total_tokens:,} tokens, chars/4: {result.chars_tokens:,} "
+                  f"({result.total_chars:,} chars)")
+        else:
+            print(f"  Total: {result.total_tokens:,} tokens ({result.total_chars:,} chars)")
 
         if result.frontmatter_tokens:
             print(f"  Frontmatter: {result.frontmatter_tokens:,} tokens")
@@ -289,7 +744,11 @@ def print_results(results: List[TokenCount], top_n: Optional[int] = None, verbos
         total_all += result.total_tokens
 
     print(f"\n{'='*50}")
-    print(f"Total: {len(results)} extensions, {total_all:,} tokens")
+    if compare:
+        chars_all = sum(r.chars_tokens for r in results)
+        print(f"Total: {len(results)} extensions, {total_all:,} tokens (chars/4: {chars_all:,})")
+    else:
+        print(f"Total: {len(results)} extensions, {total_all:,} tokens")
 
 
 def main():
@@ -301,42 +760,166 @@ def main():
     parser.add_argument("--top", type=int, help="Show top N by token count")
     parser.add_argument("--verbose", "-v", action="store_true", help="Show section breakdown")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--changed-since", metavar="REV",
+                        help="Only count extensions with files changed since git REV")
+    parser.add_argument("--estimator", choices=ESTIMATORS, default=DEFAULT_ESTIMATOR,
+                        help="Token estimator: the offline BPE tokenizer, per-class calibrated "
+                             f"ratios, or chars/4 (default: {DEFAULT_ESTIMATOR})")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Fit per-content-class ratios on path (or ~/.claude with --all)")
+    parser.add_argument("--sample", type=int, default=2000,
+                        help="Files sampled for --calibrate (default: 2000)")
+    parser.add_argument("--holdout", type=float, default=0.2,
+                        help="Fraction of the sample held out for scoring (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed for --calibrate")
+    parser.add_argument("--reference", metavar="TOKENIZER_JSON",
+                        help="Hugging Face tokenizer.json to calibrate against (default: bundled BPE)")
+    parser.add_argument("--corpus", action="store_true",
+                        help="Calibrate on the pinned 'calibrate' corpus in data/token-corpus.json")
+    parser.add_argument("--workspace", metavar="DIR",
+                        help="Count every project .claude directory under DIR, one row per project")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS,
+                        help=f"Projects counted concurrently with --workspace (default: {DEFAULT_JOBS})")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Compare against stored per-file and per-section counts; "
+                             "fail if a type's budget is exceeded")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write the current counts to the --baseline file")
 
     args = parser.parse_args()
 
+    if args.update_baseline and not args.baseline:
+        print("Error: --update-baseline requires --baseline FILE", file=sys.stderr)
+        sys.exit(1)
+
     results = []
+    estimator = args.estimator
+
+    if args.calibrate:
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not args.corpus and not base_dir.is_dir():
+            print(f"Error: --calibrate needs --all, --corpus or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(1)
+        if get_tokenizer() is None:
+            sys.exit(1)
+        reference = Path(args.reference) if args.reference else None
+        try:
+            if args.corpus:
+                with tempfile.TemporaryDirectory() as fetched:
+                    fetch_corpus("calibrate", Path(fetched))
+                    calibration = calibrate(Path(fetched), args.sample, args.holdout, args.seed, reference)
+                source = f"{CORPUS_PATH.relative_to(TOOLKIT_ROOT)}#calibrate"
+            else:
+                calibration = calibrate(base_dir.resolve(), args.sample, args.holdout, args.seed, reference)
+                source = str(base_dir.resolve())
+        except (TokenizerError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not calibration.fit_files:
+            print(f"Error: No .md or .json files to calibrate on in {base_dir}", file=sys.stderr)
+            sys.exit(1)
+        save_calibration(calibration, source)
+        if args.json:
+            print(RATIOS_PATH.read_text(), end="")
+        else:
+            print_calibration(calibration)
+            print(f"\nSaved ratios to {RATIOS_PATH}")
+        return
+
+    if args.workspace:
+        workspace = workspace_from_args(args.workspace, exit_code=1)
+        rollups = rollup_projects(find_projects(workspace, args.jobs),
+                                  partial(project_tokens, estimator=estimator), args.jobs)
+        if args.top:
+            rollups = sorted(rollups, key=lambda r: r.tokens, reverse=True)[:args.top]
+        if args.json:
+            print(json.dumps([rollup_to_dict(r) for r in rollups], indent=2))
+        else:
+            print_rollup(workspace, rollups, show_validation=False)
+        return
 
-    if args.all:
-        results = find_and_count_all(CLAUDE_DIR, args.type)
+    if args.changed_since:
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not base_dir.is_dir():
+            print(f"Error: --changed-since needs --all or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(1)
+        scope = scope_from_args(base_dir, args.changed_since, exit_code=1)
+        results = find_and_count_all(base_dir, args.type, scope, estimator)
+    elif args.all:
+        base_dir = CLAUDE_DIR
+        results = find_and_count_all(CLAUDE_DIR, args.type, estimator=estimator)
     elif args.path:
         path = Path(args.path)
         if not path.exists():
             print(f"Error: Path not found: {path}", file=sys.stderr)
             sys.exit(1)
 
+        base_dir = path.parent if path.is_file() else path
         if path.is_file():
             if path.name == "SKILL.md":
-                results = [count_skill_tokens(path)]
+                results = [count_skill_tokens(path, estimator=estimator)]
             elif path.suffix == ".md":
                 parent = path.parent.name
                 if parent == "agents" or "agents" in str(path):
-                    results = [count_agent_tokens(path)]
+                    results = [count_agent_tokens(path, estimator)]
                 elif parent == "commands" or "commands" in str(path):
-                    results = [count_command_tokens(path)]
+                    results = [count_command_tokens(path, estimator)]
                 else:
-                    results = [count_skill_tokens(path)]
+                    results = [count_skill_tokens(path, estimator=estimator)]
         else:
-            results = find_and_count_all(path, args.type)
+            results = find_and_count_all(path, args.type, estimator=estimator)
     else:
         parser.print_help()
         sys.exit(1)
 
+    if args.baseline:
+        baseline_path = Path(args.baseline)
+        if args.update_baseline:
+            baseline = build_baseline(results, base_dir, estimator)
+            if args.changed_since:
+                # Only changed extensions were counted; keep the stored rest
+                try:
+                    stored = load_baseline(baseline_path)
+                except ValueError:
+                    stored = {}
+                if stored.get("estimator") == estimator:
+                    baseline["extensions"] = {**stored["extensions"], **baseline["extensions"]}
+            save_baseline(baseline, baseline_path)
+            print(f"Saved baseline for {len(results)} extensions to {baseline_path}")
+            return
+
+        try:
+            baseline = load_baseline(baseline_path)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        if baseline.get("estimator") != estimator:
+            print(f"Error: Baseline was counted with --estimator {baseline.get('estimator')}, "
+                  f"not {estimator}", file=sys.stderr)
+            sys.exit(1)
+
+        diffs, removed = compare_baseline(results, baseline, base_dir, scoped=bool(args.changed_since))
+        if args.json:
+            print(json.dumps({
+                "baseline": str(baseline_path),
+                "estimator": estimator,
+                "changed": [diff_to_dict(d) for d in diffs],
+                "removed": removed,
+            }, indent=2))
+        else:
+            print_baseline_diff(diffs, removed, baseline_path)
+        if any(d.failure for d in diffs):
+            sys.exit(1)
+        return
+
     if args.json:
         output = [
             {
                 "path": r.path,
                 "type": r.extension_type,
                 "total_tokens": r.total_tokens,
+                "estimator": estimator,
+                "chars_tokens": r.chars_tokens,
                 "total_chars": r.total_chars,
                 "frontmatter_tokens": r.frontmatter_tokens,
                 "body_tokens": r.body_tokens,
@@ -348,7 +931,7 @@ def main():
         ]
         print(json.dumps(output, indent=2))
     else:
-        print_results(results, args.top, args.verbose)
+        print_results(results, args.top, args.verbose, estimator)
 
 
 if __name__ == "__main__":
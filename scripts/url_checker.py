@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Check external http(s) URLs concurrently, with a TTL response cache.
+
+URLs are deduplicated (ignoring #fragments) and grouped by host. Each host
+gets up to PER_HOST_LIMIT workers, each holding one keep-alive connection
+and checking its share of the host's URLs in turn; all workers share one
+thread pool of --jobs threads. A URL is checked with HEAD, falling back to
+GET when the server rejects HEAD, and redirects are followed.
+
+Results are stored in data/cache/url-cache.json. Within the TTL a cached
+result is reused without a request; failures use a shorter TTL so
+transient errors are retried sooner.
+
+lint_references.py --check-urls uses this for links in extensions.
+
+Usage:
+    python url_checker.py https://code.claude.com/docs/en/skills ...
+    python url_checker.py --ttl 0 <url>     # Ignore cached results
+    python url_checker.py --json <url>
+
+Exit codes:
+    0 - All URLs reachable
+    1 - Broken URLs found
+    2 - Usage error
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+SCRIPT_DIR = Path(__file__).parent
+TOOLKIT_ROOT = SCRIPT_DIR.parent
+
+CACHE_PATH = TOOLKIT_ROOT / "data" / "cache" / "url-cache.json"
+CACHE_VERSION = 1
+
+DEFAULT_JOBS = 16
+PER_HOST_LIMIT = 4
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_TTL = 24 * 3600       # Seconds a successful check is trusted
+FAILURE_TTL = 3600            # Seconds before a failed check is retried
+MAX_REDIRECTS = 5
+# GET bodies up to this size are drained to keep the connection alive;
+# larger ones close it instead
+MAX_DRAIN_BYTES = 256 * 1024
+
+USER_AGENT = "claude-extension-toolkit/1.0"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Servers answer HEAD with these when they only implement GET
+HEAD_REJECTED = {400, 403, 404, 405, 501}
+
+
+@dataclass
+class UrlStatus:
+    """Outcome of checking one URL."""
+    url: str
+    ok: bool
+    status: Optional[int] = None  # Final HTTP status, None on connection errors
+    error: str = ""
+    final_url: str = ""
+    checked_at: float = 0.0
+    cached: bool = False
+
+
+class UrlCache:
+    """URL results persisted between runs, each valid for its TTL."""
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL, failure_ttl: float = FAILURE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = min(failure_ttl, ttl)
+        self.entries: Dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, path: Path = CACHE_PATH, ttl: float = DEFAULT_TTL) -> "UrlCache":
+        cache = cls(path, ttl)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return cache
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            cache.entries = data.get("entries", {})
+        return cache
+
+    def get(self, url: str, now: Optional[float] = None) -> Optional[UrlStatus]:
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        age = (now or time.time()) - entry.get("checked_at", 0)
+        if age > (self.ttl if entry.get("ok") else self.failure_ttl):
+            return None
+        return UrlStatus(url, entry["ok"], entry.get("status"), entry.get("error", ""),
+                         entry.get("final_url", ""), entry["checked_at"], cached=True)
+
+    def put(self, result: UrlStatus) -> None:
+        self.entries[result.url] = {
+            "ok": result.ok,
+            "status": result.status,
+            "error": result.error,
+            "final_url": result.final_url,
+            "checked_at": result.checked_at,
+        }
+
+    def save(self) -> None:
+        """Write the cache atomically, dropping entries older than the TTL."""
+        now = time.time()
+        entries = {url: e for url, e in self.entries.items()
+                   if now - e.get("checked_at", 0) <= max(self.ttl, DEFAULT_TTL)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Cannot write URL cache: {e}", file=sys.stderr)
+
+
+def host_key(url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc
+
+
+class HostConnection:
+    """One keep-alive connection to a host, reopened when the server closes it."""
+
+    def __init__(self, scheme: str, netloc: str, timeout: float = DEFAULT_TIMEOUT):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.requests = 0
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def request(self, method: str, url: str) -> Tuple[int, Optional[str]]:
+        """Send one request; return (status, Location header)."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {"User-Agent": USER_AGENT, "Accept": "*/*"}
+
+        # A kept-alive connection may have been closed by the server since
+        # its last response; retry once on a fresh one
+        for attempt in range(2):
+            if self.conn is None:
+                cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+                self.conn = cls(self.netloc, timeout=self.timeout)
+            try:
+                self.conn.request(method, path, headers=headers)
+                response = self.conn.getresponse()
+                self.requests += 1
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self.close()
+                if attempt:
+                    raise
+                continue
+            except (OSError, http.client.HTTPException):
+                self.close()
+                raise
+
+            if method == "GET":
+                body = response.read(MAX_DRAIN_BYTES + 1)
+                if len(body) > MAX_DRAIN_BYTES:
+                    self.close()
+            else:
+                response.read()
+            if response.will_close:
+                self.close()
+            return response.status, response.getheader("Location")
+        raise http.client.HTTPException("connection failed")
+
+
+def check_url(url: str, conn: HostConnection, timeout: float = DEFAULT_TIMEOUT) -> UrlStatus:
+    """Check url on conn (its host), following redirects on other hosts as needed."""
+    current = url
+    method = "HEAD"
+    others: Dict[Tuple[str, str], HostConnection] = {}
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            key = host_key(current)
+            if key == (conn.scheme, conn.netloc):
+                target = conn
+            else:
+                target = others.setdefault(key, HostConnection(*key, timeout=timeout))
+            try:
+                status, location = target.request(method, current)
+            except (OSError, http.client.HTTPException) as e:
+                if method == "HEAD":
+                    # Some servers drop HEAD requests outright
+                    method = "GET"
+                    status, location = target.request(method, current)
+                else:
+                    raise e
+
+            if status in REDIRECT_STATUSES and location:
+                current = urljoin(current, location)
+                continue
+            if method == "HEAD" and status in HEAD_REJECTED:
+                method = "GET"
+                status, location = target.request(method, current)
+                if status in REDIRECT_STATUSES and location:
+                    current = urljoin(current, location)
+                    continue
+            ok = status < 400
+            return UrlStatus(url, ok, status, "" if ok else f"HTTP {status}", current, time.time())
+        return UrlStatus(url, False, None, f"More than {MAX_REDIRECTS} redirects", current, time.time())
+    except (OSError, http.client.HTTPException) as e:
+        conn.close()
+        return UrlStatus(url, False, None, str(e) or type(e).__name__, current, time.time())
+    finally:
+        for other in others.values():
+            other.close()
+
+
+def check_urls(
+    urls: Iterable[str],
+    cache: Optional[UrlCache] = None,
+    jobs: int = DEFAULT_JOBS,
+    per_host: int = PER_HOST_LIMIT,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Dict[str, UrlStatus]:
+    """Status of each distinct URL (fragments ignored), keyed by the URL as given."""
+    urls = list(dict.fromkeys(urls))
+    results: Dict[str, UrlStatus] = {}
+    by_host: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+
+    for url in dict.fromkeys(urldefrag(u)[0] for u in urls):
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None:
+            results[url] = cached
+        else:
+            by_host[host_key(url)].append(url)
+
+    lock = threading.Lock()
+
+    def host_worker(key: Tuple[str, str], share: List[str]) -> None:
+        conn = HostConnection(*key, timeout=timeout)
+        try:
+            for url in share:
+                result = check_url(url, conn, timeout)
+                with lock:
+                    results[url] = result
+        finally:
+            conn.close()
+
+    # Split each host's URLs across at most per_host workers, round-robin
+    tasks = []
+    for key, host_urls in by_host.items():
+        workers = max(1, min(per_host, len(host_urls)))
+        tasks.extend((key, host_urls[i::workers]) for i in range(workers))
+
+    if tasks:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            for future in [pool.submit(host_worker, key, share) for key, share in tasks]:
+                future.result()
+
+    if cache is not None:
+        for host_urls in by_host.values():
+            for url in host_urls:
+                cache.put(results[url])
+
+    return {url: results[urldefrag(url)[0]] for url in urls}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check external URLs")
+    parser.add_argument("urls", nargs="+", help="URLs to check")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS,
+                        help=f"Concurrent connections overall (default: {DEFAULT_JOBS})")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_LIMIT,
+                        help=f"Concurrent connections per host (default: {PER_HOST_LIMIT})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds per request (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL,
+                        help=f"Seconds to trust cached results; 0 rechecks (default: {DEFAULT_TTL})")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    bad = [u for u in args.urls if urlsplit(u).scheme not in ("http", "https")]
+    if bad:
+        print(f"Error: Not an http(s) URL: {bad[0]}", file=sys.stderr)
+        sys.exit(2)
+
+    cache = UrlCache.load(CACHE_PATH, args.ttl)
+    results = check_urls(args.urls, cache, args.jobs, args.per_host, args.timeout)
+    cache.save()
+
+    if args.json:
+        print(json.dumps([
+            {
+                "url": r.url,
+                "ok": r.ok,
+                "status": r.status,
+                "error": r.error,
+                "final_url": r.final_url,
+                "cached": r.cached,
+            }
+            for r in results.values()
+        ], indent=2))
+    else:
+        for url, r in results.items():
+            status = "ok" if r.ok else "BROKEN"
+            detail = r.status if r.ok else r.error
+            cached = " (cached)" if r.cached else ""
+            print(f"  [{status}] {url}  {detail}{cached}")
+    sys.exit(0 if all(r.ok for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,15 @@ Usage:
     python validate_extension.py --all            # Validate all extensions
     python validate_extension.py --type skills    # Validate specific type
     python validate_extension.py --schema         # Validate against version manifest
+    python validate_extension.py --all --no-cache # Revalidate every file
+    python validate_extension.py --all --jobs 8   # Validate in 8 worker processes
+    python validate_extension.py --all --watch    # Revalidate files as they change
+    python validate_extension.py . --changed-since origin/main  # Only changed extensions
+    python validate_extension.py --workspace ~/src --jobs 8     # Per-project failures
+
+Results for unchanged files are reused from data/cache/validation-cache.json.
+A file is revalidated when its mtime or size changes, or when the schemas in
+version-manifest.json change.
 
 Exit codes:
     0 - All validations passed
@@ -15,16 +24,33 @@ Exit codes:
 """
 
 import argparse
+import hashlib
 import json
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import frontmatter_parser
+from git_scope import ChangedScope, scope_from_args
+from inventory import Inventory, get_inventory
+from watch import DEFAULT_INTERVAL, Findings, watch
+from workspace import Project, ProjectRollup, find_projects, print_rollup, rollup_to_dict, workspace_from_args
 
 SCRIPT_DIR = Path(__file__).parent
 TOOLKIT_ROOT = SCRIPT_DIR.parent
 CLAUDE_DIR = Path.home() / ".claude"
 MANIFEST_PATH = TOOLKIT_ROOT / "data" / "version-manifest.json"
+CACHE_PATH = TOOLKIT_ROOT / "data" / "cache" / "validation-cache.json"
+
+# Bump when validation rules change so stale cached results are discarded
+CACHE_VERSION = 2
+
+# Below this many files a worker pool costs more than it saves
+PARALLEL_MIN_FILES = 32
 
 
 def load_schemas() -> Dict:
@@ -103,58 +129,102 @@ class ValidationResult:
         return len(self.errors) == 0
 
 
-def parse_frontmatter(content: str) -> Tuple[Optional[dict], str]:
-    """Parse YAML frontmatter from markdown content."""
-    if not content.startswith("---"):
-        return None, content
+@dataclass
+class ValidationCache:
+    """On-disk cache of validation results keyed by file stat data."""
+    path: Path
+    schema_hash: str
+    entries: Dict[str, dict] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def get(self, ext_path: Path, ext_type: str) -> Optional[ValidationResult]:
+        """Return the cached result if the extension is unchanged, else None."""
+        entry = self.entries.get(f"{ext_type}:{ext_path}")
+        if entry is not None and entry["fingerprint"] == stat_fingerprint(ext_path, ext_type):
+            self.hits += 1
+            return ValidationResult(
+                str(ext_path), entry["type"], list(entry["errors"]), list(entry["warnings"])
+            )
+        self.misses += 1
+        return None
+
+    def put(self, ext_path: Path, ext_type: str, result: ValidationResult) -> None:
+        self.entries[f"{ext_type}:{ext_path}"] = {
+            "fingerprint": stat_fingerprint(ext_path, ext_type),
+            "type": result.extension_type,
+            "errors": result.errors,
+            "warnings": result.warnings,
+        }
+
+    def save(self) -> None:
+        """Write the cache atomically, dropping entries for deleted files."""
+        entries = {
+            key: entry for key, entry in self.entries.items()
+            if os.path.exists(key.split(":", 1)[1])
+        }
+        data = {"version": CACHE_VERSION, "schema_hash": self.schema_hash, "entries": entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Cannot write validation cache: {e}", file=sys.stderr)
+
+
+def schema_hash() -> str:
+    """Hash the loaded schemas so manifest updates invalidate the cache."""
+    payload = json.dumps({"version": CACHE_VERSION, "schemas": _SCHEMAS}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_cache(path: Path = CACHE_PATH) -> ValidationCache:
+    """Load the validation cache, starting empty if missing, corrupt or stale."""
+    current = schema_hash()
+    cache = ValidationCache(path, current)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return cache
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return None, content
+    if data.get("version") == CACHE_VERSION and data.get("schema_hash") == current:
+        cache.entries = data.get("entries", {})
+    return cache
 
-    frontmatter_text = parts[1].strip()
-    body = parts[2]
 
-    # Simple YAML parsing (key: value)
-    frontmatter = {}
-    current_key = None
-    current_list = None
+def _stat_key(path: Path) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
 
-    for line in frontmatter_text.split("\n"):
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
 
-        # Check for list item
-        if stripped.startswith("- ") and current_key:
-            if current_list is None:
-                current_list = []
-                frontmatter[current_key] = current_list
-            current_list.append(stripped[2:].strip())
-            continue
+def stat_fingerprint(ext_path: Path, ext_type: str) -> List[Optional[List[int]]]:
+    """Stat data for every path a validator looks at for this extension.
+
+    Directory mtimes change when entries are added or removed, which covers
+    the empty references/ and empty component directory checks.
+    """
+    if ext_type == "skills":
+        paths = [ext_path, ext_path.parent / "references"]
+    elif ext_type == "plugins":
+        paths = [ext_path / ".claude-plugin" / "plugin.json"]
+        paths.extend(ext_path / c for c in ["skills", "commands", "agents", "hooks"])
+    else:
+        paths = [ext_path]
+    return [_stat_key(p) for p in paths]
+
 
-        # Check for key: value
-        if ":" in stripped:
-            key, _, value = stripped.partition(":")
-            key = key.strip()
-            value = value.strip()
-            current_key = key
-            current_list = None
-
-            if value:
-                # Handle quoted strings
-                if value.startswith('"') and value.endswith('"'):
-                    value = value[1:-1]
-                elif value.startswith("'") and value.endswith("'"):
-                    value = value[1:-1]
-                # Handle booleans
-                elif value.lower() == "true":
-                    value = True
-                elif value.lower() == "false":
-                    value = False
-                frontmatter[key] = value
-
-    return frontmatter, body
+def parse_frontmatter(content: str) -> Tuple[Optional[dict], str]:
+    """Parse YAML frontmatter from markdown content."""
+    frontmatter = frontmatter_parser.parse_frontmatter(content)
+    if frontmatter is None:
+        return None, content
+    return frontmatter.fields, frontmatter.body(content)
 
 
 def validate_skill(path: Path) -> ValidationResult:
@@ -380,6 +450,69 @@ def validate_hooks_json(path: Path) -> ValidationResult:
     return result
 
 
+def load_hook_events(path: Path) -> Dict[str, list]:
+    """Load the event -> handler-list map from a settings.json or hooks.json.
+
+    Returns an empty dict when the file is unreadable or not a hooks config;
+    validate_hooks_json reports the details.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    if path.name.startswith("settings"):
+        events = data.get("hooks", {})
+    else:
+        events = data.get("hooks", data)
+    return events if isinstance(events, dict) else {}
+
+
+def iter_hook_handlers(events: Dict[str, list]) -> Iterator[Tuple[str, Optional[str], dict]]:
+    """Yield (event, matcher, handler) for every well-formed hook handler.
+
+    Understands the same shapes as validate_hooks_json: matcher groups,
+    handler groups without a matcher, and direct handler definitions.
+    Malformed entries are skipped.
+    """
+    for event, handlers in events.items():
+        if event in ("description",) or not isinstance(handlers, list):
+            continue
+        for handler in handlers:
+            if not isinstance(handler, dict):
+                continue
+            if "hooks" in handler:
+                nested_hooks = handler["hooks"]
+                if not isinstance(nested_hooks, list):
+                    continue
+                matcher = handler.get("matcher")
+                for nested in nested_hooks:
+                    if isinstance(nested, dict):
+                        yield event, matcher, nested
+            else:
+                yield event, None, handler
+
+
+def hook_matches(matcher: Optional[str], value: Optional[str]) -> bool:
+    """True if a matcher group applies to a tool name (or source, trigger, ...).
+
+    A missing, empty or "*" matcher matches everything. Otherwise the matcher
+    is a regex that must match the whole value; an invalid regex falls back to
+    its literal "|"-separated alternatives.
+    """
+    if not matcher or matcher == "*":
+        return True
+    if value is None:
+        return False
+    try:
+        return re.fullmatch(matcher, value) is not None
+    except re.error:
+        return value in matcher.split("|")
+
+
 def _validate_single_hook(handler: dict, event: str, result: ValidationResult) -> None:
     """Validate a single hook handler definition."""
     hook_type = handler.get("type", "command")
@@ -402,62 +535,194 @@ def _validate_single_hook(handler: dict, event: str, result: ValidationResult) -
             result.warnings.append(f"Unknown model '{model}' in '{event}' hook")
 
 
-def find_extensions(base_dir: Path, ext_type: str) -> List[Path]:
+def find_extensions(base_dir: Path, ext_type: str,
+                    inventory: Optional[Inventory] = None) -> List[Path]:
     """Find all extensions of a given type."""
+    if inventory is None:
+        inventory = get_inventory(base_dir)
+
     extensions = []
 
     if ext_type == "skills":
-        for skill_md in base_dir.rglob("SKILL.md"):
-            extensions.append(skill_md)
+        extensions.extend(inventory.skills)
     elif ext_type == "agents":
-        agents_dir = base_dir / "agents"
-        if agents_dir.exists():
-            extensions.extend(agents_dir.glob("*.md"))
+        extensions.extend(inventory.agents)
     elif ext_type == "commands":
-        commands_dir = base_dir / "commands"
-        if commands_dir.exists():
-            extensions.extend(commands_dir.glob("*.md"))
+        extensions.extend(inventory.commands)
     elif ext_type == "plugins":
-        plugins_dir = base_dir / "plugins"
-        if plugins_dir.exists():
-            for item in plugins_dir.iterdir():
-                if item.is_dir() and (item / ".claude-plugin").exists():
-                    extensions.append(item)
+        extensions.extend(inventory.plugins)
     elif ext_type == "hooks":
         # Check settings.json and hooks.json files
-        settings = base_dir / "settings.json"
-        if settings.exists():
-            extensions.append(settings)
-        for hooks_json in base_dir.rglob("hooks.json"):
-            extensions.append(hooks_json)
+        if inventory.settings:
+            extensions.append(inventory.settings)
+        extensions.extend(inventory.hooks_json)
 
     return extensions
 
 
-def validate_all(base_dir: Path, ext_type: Optional[str] = None) -> List[ValidationResult]:
-    """Validate all extensions in a directory."""
-    results = []
+VALIDATORS = {
+    "skills": validate_skill,
+    "agents": validate_agent,
+    "commands": validate_command,
+    "plugins": validate_plugin,
+    "hooks": validate_hooks_json,
+}
+
+# ValidationResult.extension_type -> --type / report section name
+RESULT_SECTIONS = {
+    "skill": "skills",
+    "agent": "agents",
+    "command": "commands",
+    "plugin": "plugins",
+    "hooks": "hooks",
+}
+
 
-    types_to_check = [ext_type] if ext_type else ["skills", "agents", "commands", "plugins", "hooks"]
+def _validate_item(item: Tuple[str, str]) -> ValidationResult:
+    """Run the validator for one (type, path) pair; executed in worker processes."""
+    ext_type, path = item
+    return VALIDATORS[ext_type](Path(path))
 
-    for t in types_to_check:
-        extensions = find_extensions(base_dir, t)
-        for ext in extensions:
-            if t == "skills":
-                results.append(validate_skill(ext))
-            elif t == "agents":
-                results.append(validate_agent(ext))
-            elif t == "commands":
-                results.append(validate_command(ext))
-            elif t == "plugins":
-                results.append(validate_plugin(ext))
-            elif t == "hooks":
-                results.append(validate_hooks_json(ext))
 
-    return results
+def run_validators(items: List[Tuple[str, str]], jobs: int = 1) -> List[ValidationResult]:
+    """Validate items, in a process pool when jobs > 1. Results keep input order."""
+    if jobs <= 1 or len(items) < PARALLEL_MIN_FILES:
+        return [_validate_item(item) for item in items]
 
+    # Several chunks per worker balances uneven file sizes while keeping
+    # pickling overhead per file small
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_validate_item, items, chunksize=chunksize))
+
+
+def validate_roots(
+    base_dirs: List[Path],
+    ext_type: Optional[str] = None,
+    cache: Optional[ValidationCache] = None,
+    jobs: int = 1,
+    scope: Optional[ChangedScope] = None,
+) -> List[List[ValidationResult]]:
+    """Validate every extension under each root, one result list per root.
+
+    Cache misses from all roots are validated in a single batch, so a
+    workspace of many small projects shares one worker pool.
+    """
+    types_to_check = [ext_type] if ext_type else ["skills", "agents", "commands", "plugins", "hooks"]
 
-def print_results(results: List[ValidationResult]) -> int:
+    per_root: List[List[Optional[ValidationResult]]] = []
+    pending: List[Tuple[str, str]] = []
+    pending_slots: List[Tuple[int, int]] = []
+
+    for root_index, base_dir in enumerate(base_dirs):
+        inventory = get_inventory(base_dir)
+        results: List[Optional[ValidationResult]] = []
+        for t in types_to_check:
+            extensions = find_extensions(base_dir, t, inventory)
+            if scope is not None:
+                extensions = [e for e in extensions if scope.includes(e)]
+            for ext in extensions:
+                result = cache.get(ext, t) if cache else None
+                if result is None:
+                    pending.append((t, str(ext)))
+                    pending_slots.append((root_index, len(results)))
+                results.append(result)
+        per_root.append(results)
+
+    for (root_index, slot), item, result in zip(pending_slots, pending, run_validators(pending, jobs)):
+        per_root[root_index][slot] = result
+        if cache:
+            cache.put(Path(item[1]), item[0], result)
+
+    return per_root
+
+
+def validate_all(
+    base_dir: Path,
+    ext_type: Optional[str] = None,
+    cache: Optional[ValidationCache] = None,
+    jobs: int = 1,
+    scope: Optional[ChangedScope] = None,
+) -> List[ValidationResult]:
+    """Validate all extensions in a directory, reusing cached results when given.
+
+    With a scope, only extensions that own a changed file are validated.
+    """
+    return validate_roots([base_dir], ext_type, cache, jobs, scope)[0]
+
+
+def watch_validate(
+    base_dir: Path,
+    ext_type: Optional[str],
+    cache: Optional[ValidationCache],
+    jobs: int = 1,
+    interval: float = DEFAULT_INTERVAL,
+) -> None:
+    """Revalidate on every change; the stat-keyed cache limits work to changed files."""
+    persist = cache is not None
+    if cache is None:
+        cache = ValidationCache(CACHE_PATH, schema_hash())
+
+    def run_full() -> Findings:
+        results = validate_all(base_dir, ext_type, cache, jobs)
+        if persist and cache.misses:
+            cache.save()
+            cache.misses = 0
+        return {
+            r.path: {f"ERROR: {e}" for e in r.errors} | {f"WARN: {w}" for w in r.warnings}
+            for r in results
+        }
+
+    watch(base_dir, run_full, interval=interval)
+
+
+def validate_workspace(
+    workspace: Path,
+    ext_type: Optional[str] = None,
+    cache: Optional[ValidationCache] = None,
+    jobs: int = 1,
+) -> List[Tuple[ProjectRollup, List[ValidationResult]]]:
+    """Validate the .claude directory of every project under workspace."""
+    projects = find_projects(workspace)
+    with_dirs = [p for p in projects if p.claude_dir is not None]
+    per_project = dict(zip(
+        (p.root for p in with_dirs),
+        validate_roots([p.claude_dir for p in with_dirs], ext_type, cache, jobs),
+    ))
+    return [validation_rollup(p, per_project.get(p.root, [])) for p in projects]
+
+
+def validation_rollup(
+    project: Project, results: List[ValidationResult]
+) -> Tuple[ProjectRollup, List[ValidationResult]]:
+    """Summarize one project's validation results."""
+    rollup = ProjectRollup(str(project.root))
+    for r in results:
+        section = RESULT_SECTIONS[r.extension_type]
+        rollup.counts[section] = rollup.counts.get(section, 0) + 1
+    tally_validation(rollup, results)
+    return rollup, results
+
+
+def tally_validation(rollup: ProjectRollup, results: List[ValidationResult]) -> None:
+    """Add error and warning counts from results to a project rollup."""
+    for r in results:
+        rollup.errors += len(r.errors)
+        rollup.warnings += len(r.warnings)
+        rollup.failing += 1 if r.errors else 0
+
+
+def result_to_dict(r: ValidationResult) -> dict:
+    return {
+        "path": r.path,
+        "type": r.extension_type,
+        "valid": r.is_valid,
+        "errors": r.errors,
+        "warnings": r.warnings,
+    }
+
+
+def print_results(results: List[ValidationResult], cache: Optional[ValidationCache] = None) -> int:
     """Print validation results and return exit code."""
     has_errors = False
 
@@ -481,6 +746,8 @@ def print_results(results: List[ValidationResult]) -> int:
 
     print(f"\n{'='*50}")
     print(f"Validated {total} extensions: {valid} valid, {warnings} warnings, {errors} errors")
+    if cache and (cache.hits or cache.misses):
+        print(f"Cache: {cache.hits} hits, {cache.misses} misses")
 
     return 1 if has_errors else 0
 
@@ -492,11 +759,56 @@ def main():
     parser.add_argument("--type", choices=["skills", "agents", "commands", "plugins", "hooks"],
                         help="Validate only specific extension type")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and do not update the validation cache")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes for validation (0 = one per CPU)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and revalidate files as they change")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Seconds between polls in --watch mode")
+    parser.add_argument("--changed-since", metavar="REV",
+                        help="Only validate extensions with files changed since git REV")
+    parser.add_argument("--workspace", metavar="DIR",
+                        help="Validate every project .claude directory under DIR, one row per project")
 
     args = parser.parse_args()
 
-    if args.all:
-        results = validate_all(CLAUDE_DIR, args.type)
+    cache = None if args.no_cache else load_cache()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if args.workspace:
+        workspace = workspace_from_args(args.workspace)
+        rollups = validate_workspace(workspace, args.type, cache, jobs)
+        if cache and cache.misses:
+            cache.save()
+        if args.json:
+            print(json.dumps([
+                dict(rollup_to_dict(r), results=[result_to_dict(v) for v in results
+                                                 if v.errors or v.warnings])
+                for r, results in rollups
+            ], indent=2))
+        else:
+            print_rollup(workspace, [r for r, _ in rollups], show_tokens=False)
+        sys.exit(1 if any(r.errors for r, _ in rollups) else 0)
+
+    if args.watch:
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not base_dir.is_dir():
+            print(f"Error: --watch needs --all or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(2)
+        watch_validate(base_dir, args.type, cache, jobs, args.interval)
+        sys.exit(0)
+
+    if args.changed_since:
+        base_dir = CLAUDE_DIR if args.all else Path(args.path or ".")
+        if not base_dir.is_dir():
+            print(f"Error: --changed-since needs --all or a directory: {base_dir}", file=sys.stderr)
+            sys.exit(2)
+        scope = scope_from_args(base_dir, args.changed_since)
+        results = validate_all(base_dir, args.type, cache, jobs, scope)
+    elif args.all:
+        results = validate_all(CLAUDE_DIR, args.type, cache, jobs)
     elif args.path:
         path = Path(args.path)
         if not path.exists():
@@ -518,26 +830,19 @@ def main():
                 else:
                     results = [validate_skill(path)]
         else:
-            results = validate_all(path, args.type)
+            results = validate_all(path, args.type, cache, jobs)
     else:
         parser.print_help()
         sys.exit(2)
 
+    if cache and cache.misses:
+        cache.save()
+
     if args.json:
-        output = [
-            {
-                "path": r.path,
-                "type": r.extension_type,
-                "valid": r.is_valid,
-                "errors": r.errors,
-                "warnings": r.warnings,
-            }
-            for r in results
-        ]
-        print(json.dumps(output, indent=2))
+        print(json.dumps([result_to_dict(r) for r in results], indent=2))
         sys.exit(0 if all(r.is_valid for r in results) else 1)
     else:
-        sys.exit(print_results(results))
+        sys.exit(print_results(results, cache))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Polling watch loop shared by the validator, linter and pattern detector.
+
+Each poll refreshes the shared inventory and compares (mtime_ns, size) for
+every tracked file with the previous poll. Changed, added and deleted paths
+are handed to the calling script, which re-checks only what they affect and
+returns findings keyed by file. The loop prints a rolling diff of findings
+that appeared (+) or were resolved (-) since the previous report.
+
+Stat polling is used instead of inotify because the toolkit sticks to the
+standard library; with the inventory's directory pruning a poll of ~/.claude
+takes milliseconds.
+
+This module has no CLI; use --watch on validate_extension.py,
+lint_references.py or pattern_detector.py.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from inventory import Inventory, get_inventory
+
+DEFAULT_INTERVAL = 1.0
+
+# Findings keyed by source file path; each finding is a rendered message line
+Findings = Dict[str, Set[str]]
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def take_snapshot(inventory: Inventory) -> Snapshot:
+    """Stat every tracked file in the inventory."""
+    snapshot = {}
+    for files in inventory.by_dir.values():
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def changed_paths(old: Snapshot, new: Snapshot) -> Set[Path]:
+    """Paths added, removed or modified between two snapshots."""
+    changed = {p for p, stat in new.items() if old.get(p) != stat}
+    changed.update(p for p in old if p not in new)
+    return changed
+
+
+def print_diff(old: Findings, new: Findings, changed: Set[Path], base_dir: Path) -> None:
+    """Print findings that appeared or were resolved."""
+    added = []
+    resolved = []
+    for key in sorted(set(old) | set(new)):
+        before = old.get(key, set())
+        after = new.get(key, set())
+        added.extend((key, f) for f in sorted(after - before))
+        resolved.extend((key, f) for f in sorted(before - after))
+
+    stamp = datetime.now().strftime("%H:%M:%S")
+    names = ", ".join(sorted(_relative(p, base_dir) for p in changed)[:3])
+    more = f" (+{len(changed) - 3} more)" if len(changed) > 3 else ""
+    print(f"\n[{stamp}] {len(changed)} changed: {names}{more}")
+
+    if not added and not resolved:
+        print("  no change in findings")
+    for key, finding in added:
+        print(f"  + {_relative(Path(key), base_dir)}: {finding}")
+    for key, finding in resolved:
+        print(f"  - {_relative(Path(key), base_dir)}: {finding}")
+
+    total = sum(len(f) for f in new.values())
+    print(f"  {total} findings open")
+    sys.stdout.flush()
+
+
+def _relative(path: Path, base_dir: Path) -> str:
+    try:
+        return str(path.relative_to(base_dir))
+    except ValueError:
+        return str(path)
+
+
+def watch(
+    base_dir: Path,
+    run_full: Callable[[], Findings],
+    run_changed: Optional[Callable[[Set[Path]], Findings]] = None,
+    interval: float = DEFAULT_INTERVAL,
+) -> None:
+    """Poll base_dir until interrupted, re-checking changed files.
+
+    run_full checks everything and returns all findings. run_changed receives
+    the changed paths and returns findings for every file it re-checked
+    (an empty set clears a file's findings); when omitted, run_full is called
+    on every change and its result replaces the previous findings.
+    """
+    inventory = get_inventory(base_dir, refresh=True)
+    snapshot = take_snapshot(inventory)
+    findings = {k: v for k, v in run_full().items() if v}
+
+    total = sum(len(f) for f in findings.values())
+    print(f"Watching {base_dir} ({len(snapshot)} files, {total} findings open). "
+          f"Press Ctrl-C to stop.")
+    for key in sorted(findings):
+        for finding in sorted(findings[key]):
+            print(f"  {_relative(Path(key), base_dir)}: {finding}")
+    sys.stdout.flush()
+
+    try:
+        while True:
+            time.sleep(interval)
+            inventory = get_inventory(base_dir, refresh=True)
+            new_snapshot = take_snapshot(inventory)
+            changed = changed_paths(snapshot, new_snapshot)
+            snapshot = new_snapshot
+            if not changed:
+                continue
+
+            if run_changed is None:
+                updated = {k: v for k, v in run_full().items() if v}
+            else:
+                updated = dict(findings)
+                updated.update(run_changed(changed))
+                updated = {k: v for k, v in updated.items() if v}
+
+            print_diff(findings, updated, changed, base_dir)
+            findings = updated
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Find project .claude directories across a workspace and roll them up.
+
+Walks a workspace directory (e.g. ~/src) breadth-first with a thread pool,
+listing one directory per task. A directory containing .git is a repository
+boundary: it is reported as a project if it has .claude/ or CLAUDE.md, and
+its contents are not searched further. Hidden directories, symlinked
+directories and vendored trees (node_modules, vendor, virtualenvs, build
+output) are never entered.
+
+The report, validator and token counter use this for their --workspace
+mode, each filling in the per-project columns it computes.
+
+Usage:
+    python workspace.py ~/src           # List discovered projects
+    python workspace.py ~/src --json
+
+Exit codes:
+    0 - Success
+    2 - Usage error
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+CLAUDE_DIR = Path.home() / ".claude"
+
+DEFAULT_JOBS = 16
+
+# Directory names that hold third-party or generated files
+VENDORED_DIRS = {
+    "node_modules", "vendor", "third_party", "third-party", "bower_components",
+    "venv", "env", "site-packages", "__pycache__", "dist", "build", "target",
+    "out", "Pods", "Carthage", "DerivedData",
+}
+
+ROLLUP_COUNTS = ("skills", "agents", "commands", "plugins", "hooks", "claude_md")
+
+
+@dataclass
+class Project:
+    """A directory with project-level Claude Code configuration."""
+    root: Path
+    claude_dir: Optional[Path] = None
+    claude_md: Optional[Path] = None
+    is_repo: bool = False
+
+
+@dataclass
+class ProjectRollup:
+    """Per-project totals for the workspace report."""
+    project: str
+    counts: Dict[str, int] = field(default_factory=dict)
+    tokens: int = 0
+    errors: int = 0
+    warnings: int = 0
+    failing: int = 0  # Extensions with at least one validation error
+
+    @property
+    def extensions(self) -> int:
+        return sum(self.counts.values())
+
+
+def _list_dir(directory: Path) -> Tuple[Optional[Project], List[Path]]:
+    """Classify one directory; return its project (if any) and subdirectories to visit."""
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return None, []
+
+    names = {e.name: e for e in entries}
+    is_repo = ".git" in names
+
+    project = None
+    claude = names.get(".claude")
+    claude_md = names.get("CLAUDE.md")
+    has_claude_dir = claude is not None and claude.is_dir() and Path(claude.path) != CLAUDE_DIR
+    has_claude_md = claude_md is not None and claude_md.is_file()
+    if has_claude_dir or has_claude_md:
+        project = Project(
+            root=directory,
+            claude_dir=Path(claude.path) if has_claude_dir else None,
+            claude_md=Path(claude_md.path) if has_claude_md else None,
+            is_repo=is_repo,
+        )
+
+    if is_repo:
+        # Repository boundary: nested repos and subpackages are not separate projects
+        return project, []
+
+    children = []
+    for entry in entries:
+        if entry.name.startswith(".") or entry.name in VENDORED_DIRS:
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                children.append(Path(entry.path))
+        except OSError:
+            continue
+    return project, children
+
+
+def find_projects(workspace: Path, jobs: int = DEFAULT_JOBS) -> List[Project]:
+    """Every project under workspace, sorted by path."""
+    projects = []
+    frontier = [workspace]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while frontier:
+            next_frontier = []
+            for project, children in pool.map(_list_dir, frontier):
+                if project is not None:
+                    projects.append(project)
+                next_frontier.extend(children)
+            frontier = next_frontier
+    return sorted(projects, key=lambda p: str(p.root))
+
+
+def rollup_projects(
+    projects: List[Project],
+    rollup: Callable[[Project], ProjectRollup],
+    jobs: int = DEFAULT_JOBS,
+) -> List[ProjectRollup]:
+    """Apply rollup to every project in a thread pool, keeping project order."""
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        return list(pool.map(rollup, projects))
+
+
+def print_rollup(
+    workspace: Path,
+    rollups: List[ProjectRollup],
+    show_counts: bool = True,
+    show_tokens: bool = True,
+    show_validation: bool = True,
+) -> None:
+    """Print one row per project and a workspace total."""
+    header = f"{'Project':<44}"
+    if show_counts:
+        header += f" {'Skl':>4} {'Agt':>4} {'Cmd':>4} {'Plg':>4}"
+    if show_tokens:
+        header += f" {'Tokens':>9}"
+    if show_validation:
+        header += f" {'Err':>5} {'Warn':>5}"
+    print(f"Workspace {workspace}: {len(rollups)} projects")
+    print("-" * len(header))
+    print(header)
+    print("-" * len(header))
+
+    for r in rollups:
+        try:
+            name = str(Path(r.project).relative_to(workspace))
+        except ValueError:
+            name = r.project
+        if len(name) > 44:
+            name = "..." + name[-41:]
+        line = f"{name:<44}"
+        if show_counts:
+            line += "".join(f" {r.counts.get(k, 0):>4}" for k in ("skills", "agents", "commands", "plugins"))
+        if show_tokens:
+            line += f" {r.tokens:>9,}"
+        if show_validation:
+            line += f" {r.errors:>5} {r.warnings:>5}"
+        print(line)
+
+    print("-" * len(header))
+    summary = [f"{sum(r.extensions for r in rollups)} extensions"]
+    if show_tokens:
+        summary.append(f"{sum(r.tokens for r in rollups):,} tokens")
+    if show_validation:
+        failing = [r for r in rollups if r.errors]
+        summary.append(f"{sum(r.errors for r in rollups)} errors, "
+                       f"{sum(r.warnings for r in rollups)} warnings "
+                       f"in {len(failing)} projects")
+    print("Total: " + ", ".join(summary))
+
+
+def rollup_to_dict(r: ProjectRollup) -> dict:
+    return {
+        "project": r.project,
+        "counts": {k: r.counts.get(k, 0) for k in ROLLUP_COUNTS},
+        "tokens": r.tokens,
+        "errors": r.errors,
+        "warnings": r.warnings,
+        "failing_extensions": r.failing,
+    }
+
+
+def workspace_from_args(path: str, exit_code: int = 2) -> Path:
+    """Validate a --workspace argument, exiting with exit_code if it is not a directory."""
+    workspace = Path(path).expanduser()
+    if not workspace.is_dir():
+        print(f"Error: Not a directory: {workspace}", file=sys.stderr)
+        sys.exit(exit_code)
+    return workspace
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find project .claude directories in a workspace")
+    parser.add_argument("workspace", help="Directory containing projects (e.g. ~/src)")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS,
+                        help=f"Directory listing threads (default: {DEFAULT_JOBS})")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    workspace = workspace_from_args(args.workspace)
+    projects = find_projects(workspace, args.jobs)
+
+    if args.json:
+        print(json.dumps([
+            {
+                "root": str(p.root),
+                "claude_dir": str(p.claude_dir) if p.claude_dir else None,
+                "claude_md": str(p.claude_md) if p.claude_md else None,
+                "repo": p.is_repo,
+            }
+            for p in projects
+        ], indent=2))
+    else:
+        for p in projects:
+            parts = [name for name, present in ((".claude/", p.claude_dir), ("CLAUDE.md", p.claude_md))
+                     if present]
+            print(f"  {p.root}  ({', '.join(parts)})")
+        print(f"\n{len(projects)} projects")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Tests for scripts/url_checker.py against a local http.server."""
+
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from url_checker import UrlCache, check_urls  # noqa: E402
+
+
+class Handler(BaseHTTPRequestHandler):
+    """/ok answers 200, /get-only rejects HEAD with 405, anything else is 404."""
+
+    protocol_version = "HTTP/1.1"
+    requests: Counter = Counter()
+
+    def respond(self, method: str) -> None:
+        self.requests[method, self.path] += 1
+        if self.path == "/ok" or (self.path == "/get-only" and method == "GET"):
+            status = 200
+        elif self.path == "/get-only":
+            status = 405
+        else:
+            status = 404
+        body = b"hello\n"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if method == "GET":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.respond("HEAD")
+
+    def do_GET(self):
+        self.respond("GET")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class UrlCheckerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.requests.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.tmp.name) / "url-cache.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check(self, *urls, cache=None):
+        return check_urls(urls, cache, jobs=4, timeout=5)
+
+    def test_ok(self):
+        result = self.check(self.base + "/ok")[self.base + "/ok"]
+        self.assertTrue(result.ok)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(Handler.requests["HEAD", "/ok"], 1)
+        self.assertEqual(Handler.requests["GET", "/ok"], 0)
+
+    def test_not_found(self):
+        result = self.check(self.base + "/missing")[self.base + "/missing"]
+        self.assertFalse(result.ok)
+        self.assertEqual(result.status, 404)
+        self.assertEqual(result.error, "HTTP 404")
+
+    def test_connection_refused(self):
+        url = f"http://127.0.0.1:{free_port()}/ok"
+        result = self.check(url)[url]
+        self.assertFalse(result.ok)
+        self.assertIsNone(result.status)
+        self.assertTrue(result.error)
+
+    def test_fragments_share_one_request(self):
+        urls = [self.base + "/ok#intro", self.base + "/ok#usage", self.base + "/ok"]
+        results = self.check(*urls)
+        self.assertEqual(list(results), urls)
+        self.assertTrue(all(r.ok for r in results.values()))
+        self.assertEqual(Handler.requests["HEAD", "/ok"], 1)
+
+    def test_head_rejected_falls_back_to_get(self):
+        result = self.check(self.base + "/get-only")[self.base + "/get-only"]
+        self.assertTrue(result.ok)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(Handler.requests["HEAD", "/get-only"], 1)
+        self.assertEqual(Handler.requests["GET", "/get-only"], 1)
+
+    def test_cache_reused_within_ttl(self):
+        url = self.base + "/ok"
+        cache = UrlCache(self.cache_path, ttl=60)
+        self.assertFalse(self.check(url, cache=cache)[url].cached)
+        cache.save()
+
+        reloaded = UrlCache.load(self.cache_path, ttl=60)
+        result = self.check(url, cache=reloaded)[url]
+        self.assertTrue(result.cached)
+        self.assertTrue(result.ok)
+        self.assertEqual(Handler.requests["HEAD", "/ok"], 1)
+
+    def test_cache_ignored_with_zero_ttl(self):
+        url = self.base + "/ok"
+        cache = UrlCache(self.cache_path, ttl=60)
+        self.check(url, cache=cache)
+        cache.save()
+
+        result = self.check(url, cache=UrlCache.load(self.cache_path, ttl=0))[url]
+        self.assertFalse(result.cached)
+        self.assertEqual(Handler.requests["HEAD", "/ok"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()